@@ -1,7 +1,7 @@
 from plataforma import Plataforma, Streaming
 
 
-streaming = Streaming(Plataforma())
+streaming = Streaming(Plataforma(precargar=True))
 
 if __name__ == "__main__":
     streaming.iniciar() 
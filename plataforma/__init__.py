@@ -1,5 +1,31 @@
-from .grafo_contenido import GrafoContenido
-from .catalogo import NuevoCatalogo
-from .plataforma import Plataforma, Streaming
+"""
+Plataforma de streaming: catálogo, clientes y grafo de recomendaciones.
+
+Los nombres públicos se importan recién al usarlos (`__getattr__` de módulo),
+así que `import plataforma` no carga los repositorios ni sus dependencias.
+"""
+
+import importlib
+
+# nombre público -> submódulo que lo define
+_EXPORTACIONES = {
+    "GrafoContenido": ".grafo_contenido",
+    "NuevoCatalogo": ".catalogo",
+    "Plataforma": ".plataforma",
+    "Streaming": ".plataforma",
+}
 
 __all__ = ["GrafoContenido", "NuevoCatalogo", "Plataforma", "Streaming"]
+
+
+def __getattr__(nombre):
+    modulo = _EXPORTACIONES.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor  # las próximas búsquedas ya no pasan por aquí
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,134 @@
+"""
+Vocabulario compartido para internar valores repetidos de los TDA.
+
+Miles de títulos y clientes repiten los mismos textos (etiquetas, directores,
+actores, productoras, tipos de servicio...). Sin internar, cada TDA hidratado
+desde el JSON guarda su propia copia de cada uno. Con `internar`, todas las
+apariciones de un mismo valor apuntan a UNA instancia compartida.
+"""
+
+from collections.abc import Mapping
+
+
+class Vocabulario:
+    """
+    Tabla de valores canónicos: `internar(v)` devuelve siempre el mismo objeto
+    para valores iguales del mismo tipo (1 y 1.0 no se mezclan).
+    """
+
+    def __init__(self):
+        # tipo -> {valor: instancia canónica}
+        self._tablas: dict[type, dict] = {}
+        # (clave, tipo del valor, valor) -> par (clave, valor) canónico
+        self._pares: dict[tuple, tuple] = {}
+
+    def __len__(self):
+        return sum(len(tabla) for tabla in self._tablas.values()) + len(self._pares)
+
+    def internar(self, valor):
+        """Devuelve la instancia compartida de `valor` (textos y números)."""
+        if not isinstance(valor, (str, int, float)) or isinstance(valor, bool) or valor != valor:
+            # None, booleanos, NaN y valores mutables se devuelven tal cual.
+            return valor
+        tabla = self._tablas.get(type(valor))
+        if tabla is None:
+            tabla = self._tablas.setdefault(type(valor), {})
+        return tabla.setdefault(valor, valor)
+
+    def internar_par(self, clave, valor) -> tuple:
+        """Devuelve la tupla compartida `(clave, valor)` (ambos internados)."""
+        clave, valor = self.internar(clave), self.internar(valor)
+        try:
+            return self._pares.setdefault((clave, type(valor), valor), (clave, valor))
+        except TypeError:
+            # Valor no hasheable (lista, dict...): el par no se comparte.
+            return (clave, valor)
+
+    def limpiar(self):
+        """Olvida todos los valores (los TDA ya creados no se ven afectados)."""
+        self._tablas.clear()
+        self._pares.clear()
+
+
+# Vocabulario único para todos los TDA de la plataforma.
+VOCABULARIO = Vocabulario()
+
+
+def internar(valor):
+    """Atajo a `VOCABULARIO.internar`."""
+    return VOCABULARIO.internar(valor)
+
+
+def internar_tupla(valores, unicos: bool = False) -> tuple:
+    """Tupla con los valores internados (sin repetidos si `unicos`, en orden de aparición)."""
+    if valores is None:
+        return ()
+    tupla = tuple(internar(v) for v in valores)
+    if unicos:
+        tupla = tuple(dict.fromkeys(tupla))
+    return tupla
+
+
+def internar_dict(datos: dict | None) -> dict | None:
+    """Copia de un diccionario con claves y valores internados."""
+    if datos is None:
+        return None
+    return {internar(clave): internar(valor) for clave, valor in datos.items()}
+
+
+class MapaCompacto(Mapping):
+    """
+    Diccionario inmutable y chico (p. ej. las etiquetas de un contenido) guardado
+    como UNA tupla de pares internados: los pares `(etiqueta, nivel)` se comparten
+    entre todos los TDA, así que cada instancia solo paga su tupla.
+
+    Se usa igual que un dict de solo lectura (`get`, `items`, `keys`, `in`,
+    `dict(mapa)`); las búsquedas son lineales, pensadas para pocas claves.
+    """
+
+    __slots__ = ("_pares",)
+
+    def __init__(self, datos=()):
+        if isinstance(datos, Mapping):
+            datos = datos.items()
+        pares = {}
+        for clave, valor in datos:
+            # Como en un dict, una clave repetida se queda con el último valor.
+            pares[clave] = VOCABULARIO.internar_par(clave, valor)
+        self._pares = tuple(pares.values())
+
+    def __getitem__(self, clave):
+        for k, valor in self._pares:
+            if k == clave:
+                return valor
+        raise KeyError(clave)
+
+    def __contains__(self, clave):
+        for k, _ in self._pares:
+            if k == clave:
+                return True
+        return False
+
+    def __iter__(self):
+        for clave, _ in self._pares:
+            yield clave
+
+    def __len__(self):
+        return len(self._pares)
+
+    def __repr__(self):
+        return repr(dict(self._pares))
+
+    def __reduce__(self):
+        return (MapaCompacto, (self._pares,))
+
+    def items(self):
+        # Los pares ya están armados: no hace falta buscar clave por clave.
+        return self._pares
+
+
+def internar_mapa(datos) -> MapaCompacto | None:
+    """`MapaCompacto` con los pares de `datos` internados (None si `datos` es None)."""
+    if datos is None:
+        return None
+    return MapaCompacto(datos)
@@ -0,0 +1,109 @@
+"""
+Reporte de arranque en frío: cuánto tarda cada fase hasta tener el catálogo y
+los clientes en memoria.
+
+- importacion: módulos del paquete (los que ya estaban importados cuentan ~0).
+- construccion: `Plataforma()` (los repositorios se abren en su primer uso).
+- carga: abrir el motor de cada base y leer sus datos (`precargar`); con
+  `--paralelo` todas a la vez (ver `carga_paralela`), indexadas incluidas.
+- hidratacion: convertir todos los registros de cada base a TDA (`iter_todos`).
+
+Ej:
+    python -m plataforma.arranque
+    python -m plataforma.arranque --sin-hidratar
+    python -m plataforma.arranque --paralelo procesos
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from functools import partial
+
+
+# Módulos del paquete, en el orden en que los necesita la aplicación.
+MODULOS = (
+    "plataforma.persistencia",
+    "plataforma.contenidos.db_contenidos",
+    "plataforma.clientes",
+    "plataforma.grafo_contenido",
+    "plataforma.catalogo",
+    "plataforma.plataforma",
+)
+
+
+def medir_arranque(hidratar: bool = True, paralelo: str | None = None) -> list[tuple[str, str, float]]:
+    """
+    Devuelve las mediciones `(fase, detalle, segundos)` de un arranque completo.
+    Con `paralelo` ("hilos"/"procesos") la carga se mide como una sola fase de reloj.
+    """
+    mediciones = []
+
+    def medir(fase: str, detalle: str, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mediciones.append((fase, detalle, time.perf_counter() - inicio))
+        return resultado
+
+    for modulo in MODULOS:
+        detalle = f"{modulo} (ya importado)" if modulo in sys.modules else modulo
+        medir("importacion", detalle, partial(importlib.import_module, modulo))
+
+    from .plataforma import Plataforma
+
+    plataforma = medir("construccion", "Plataforma()", Plataforma)
+    bases = {**plataforma.obtener_catalogo(), "clientes": plataforma.clientes.db}
+
+    if paralelo:
+        informe = plataforma.cargar_en_paralelo(paralelo)
+        informe.imprimir()
+        mediciones.append(("carga", f"{len(bases)} bases en paralelo ({paralelo})", informe.segundos))
+    else:
+        for nombre, gestor in bases.items():
+            medir("carga", nombre, partial(gestor.precargar, en_segundo_plano=False))
+
+    if hidratar:
+        for nombre, gestor in bases.items():
+            inicio = time.perf_counter()
+            cantidad = sum(1 for _ in gestor.iter_todos())
+            mediciones.append(("hidratacion", f"{nombre} ({cantidad})", time.perf_counter() - inicio))
+
+    return mediciones
+
+
+def imprimir_reporte(mediciones: list[tuple[str, str, float]]):
+    """Muestra las mediciones agrupadas por fase, con subtotales y total."""
+    total = 0.0
+    fase_actual = None
+    subtotal = 0.0
+    print("\n⏱️  ARRANQUE EN FRÍO")
+    print("=" * 60)
+    for fase, detalle, segundos in mediciones + [(None, "", 0.0)]:
+        if fase != fase_actual:
+            if fase_actual is not None:
+                print(f"  {'subtotal':<44}{subtotal * 1000:>10.1f} ms")
+            if fase is None:
+                break
+            print(f"{fase.upper()}")
+            fase_actual, subtotal = fase, 0.0
+        print(f"  {detalle:<44}{segundos * 1000:>10.1f} ms")
+        subtotal += segundos
+        total += segundos
+    print("=" * 60)
+    print(f"{'TOTAL':<46}{total * 1000:>10.1f} ms")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog="python -m plataforma.arranque")
+    parser.add_argument(
+        "--sin-hidratar", action="store_true", help="no mide la conversión de registros a TDA"
+    )
+    parser.add_argument(
+        "--paralelo", choices=("hilos", "procesos"), help="carga e indexa todas las bases a la vez"
+    )
+    args = parser.parse_args(argumentos)
+    imprimir_reporte(medir_arranque(hidratar=not args.sin_hidratar, paralelo=args.paralelo))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Benchmark de los recorridos del grafo (`dfs_autoplay` y `bfs_ver_similar`)
+sobre grafos sintéticos grandes, comparando la versión actual (deque + sets)
+con la original basada en listas (`pop(0)` y `in` lineales, O(V²)).
+
+La versión actual se mide recorriendo toda la componente (`k=None`) y con el
+corte temprano por defecto (`k=7`), cuyo costo no depende del tamaño.
+
+La versión con listas solo se mide hasta `--max-listas` nodos: con 100k nodos
+tarda del orden de una hora por recorrido. Para tamaños mayores se estima
+(marcada con "≥") con un ajuste segundos = a · nodos^b por mínimos cuadrados
+en escala log-log sobre mediciones en `--max-listas`/4, /2 y `--max-listas`
+nodos. Es una cota inferior: con listas grandes los `in` lineales dejan de
+entrar en la caché y el costo crece más rápido (con 100k nodos y grado 8 se
+midieron 60 min el DFS y 52 min el BFS: dos y tres veces lo estimado).
+
+Con `--compacto` también compara la memoria y el recorrido completo de las
+adyacencias en dicts de tuplas contra el formato CSR (`GrafoContenido.compactar`).
+
+Ej:
+    python -m plataforma.bench_recorridos
+    python -m plataforma.bench_recorridos --nodos 1000 5000 100000 --grado 8
+    python -m plataforma.bench_recorridos --nodos 100000 --max-listas 0 --compacto
+"""
+
+import argparse
+import gc
+import math
+import random
+import time
+import tracemalloc
+from statistics import fmean
+
+from .grafo_contenido import GrafoContenido
+
+
+def generar_grafo(nodos: int, grado: int = 8, semilla: int = 0) -> GrafoContenido:
+    """
+    Grafo sintético conexo de `nodos` vértices: una cadena (para que todo sea
+    alcanzable) más `grado` aristas al azar por vértice, con scores al azar,
+    en los grafos de similitud y de maratón.
+    """
+    azar = random.Random(semilla)
+    grafo = GrafoContenido()
+    ids = [f"N{i:06d}" for i in range(nodos)]
+    for adyacencia in (grafo.adyacencia_similitud, grafo.adyacencia_maraton):
+        for nodo_id in ids:
+            adyacencia[nodo_id] = []
+        for i, nodo_id in enumerate(ids):
+            vecinos = {i + 1} if i + 1 < nodos else set()
+            vecinos.update(azar.randrange(nodos) for _ in range(grado))
+            vecinos.discard(i)
+            for j in vecinos:
+                score = round(azar.uniform(4, 20), 1)
+                adyacencia[nodo_id].append((ids[j], score))
+                adyacencia[ids[j]].append((nodo_id, score))
+    grafo.ordenar_vecinos()
+    return grafo
+
+
+# --- Versión original (listas), como referencia ---
+
+def _dfs_listas(adyacencia, start_id):
+    visitados = []
+    pila = [start_id]
+    while pila:
+        nodo_id = pila.pop()
+        if nodo_id not in visitados:
+            visitados.append(nodo_id)
+            vecinos = sorted(adyacencia.get(nodo_id, []), key=lambda v: v[1], reverse=True)
+            for vecino_id, _ in reversed(vecinos):
+                if vecino_id not in visitados:
+                    pila.append(vecino_id)
+    return visitados[:7]
+
+
+def _bfs_listas(adyacencia, start_id):
+    visitados = []
+    cola = [start_id]
+    while cola:
+        nodo_id = cola.pop(0)
+        if nodo_id not in visitados:
+            visitados.append(nodo_id)
+            vecinos = sorted(adyacencia.get(nodo_id, []), key=lambda v: v[1], reverse=True)
+            for vecino_id, _ in vecinos:
+                if vecino_id not in visitados and vecino_id not in cola:
+                    cola.append(vecino_id)
+    return visitados[:7]
+
+
+# Repeticiones de cada recorrido completo en la comparación dict vs CSR (se
+# informa el mejor tiempo: una sola corrida varía demasiado para comparar).
+_REPETICIONES_COMPACTO = 3
+
+# Divisores de `--max-listas` con que se calibra la estimación de la versión con listas.
+_CALIBRACION = (4, 2, 1)
+
+
+def _medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def _medir_mejor(funcion, *args, repeticiones: int = _REPETICIONES_COMPACTO):
+    """Como `_medir`, pero con el menor tiempo de `repeticiones` corridas."""
+    mediciones = [_medir(funcion, *args) for _ in range(repeticiones)]
+    return mediciones[0][0], min(segundos for _, segundos in mediciones)
+
+
+def _casos(grafo: GrafoContenido) -> tuple:
+    """(recorrido, versión actual, versión con listas, adyacencia que recorre)."""
+    return (
+        ("dfs_autoplay", grafo.dfs_autoplay, _dfs_listas, grafo.adyacencia_similitud),
+        ("bfs_ver_similar", grafo.bfs_ver_similar, _bfs_listas, grafo.adyacencia_maraton),
+    )
+
+
+def medir_recorridos(nodos: int, grado: int = 8, con_listas: bool = True) -> list[tuple]:
+    """
+    Devuelve `(recorrido, nodos, segundos_listas | None, segundos_completo, segundos_k)`
+    para el DFS y el BFS desde el primer vértice. Si se mide la versión con
+    listas, verifica que todas devuelvan el mismo recorrido.
+    """
+    grafo = generar_grafo(nodos, grado)
+    inicio_id = "N000000"
+    mediciones = []
+    for nombre, actual, con_lista, adyacencia in _casos(grafo):
+        completo, segundos = _medir(actual, inicio_id, None)
+        resultado, segundos_k = _medir(actual, inicio_id)
+        if completo[:len(resultado)] != resultado:
+            raise AssertionError(f"{nombre}: el corte temprano cambió el recorrido")
+        segundos_listas = None
+        if con_listas:
+            referencia, segundos_listas = _medir(con_lista, adyacencia, inicio_id)
+            if referencia != resultado:
+                raise AssertionError(f"{nombre}: el recorrido cambió ({resultado} != {referencia})")
+        mediciones.append((nombre, nodos, segundos_listas, segundos, segundos_k))
+    return mediciones
+
+
+def medir_listas(nodos: int, grado: int = 8) -> dict[str, float]:
+    """Segundos de la versión con listas, por recorrido, desde el primer vértice."""
+    grafo = generar_grafo(nodos, grado)
+    return {
+        nombre: _medir(con_lista, adyacencia, "N000000")[1]
+        for nombre, _, con_lista, adyacencia in _casos(grafo)
+    }
+
+
+def ajustar_potencia(puntos: list[tuple[int, float]]) -> tuple[float, float]:
+    """
+    Ajuste por mínimos cuadrados, en escala log-log, de segundos = a · nodos^b
+    a los puntos `(nodos, segundos)`. Devuelve `(a, b)`.
+    """
+    xs = [math.log(nodos) for nodos, _ in puntos]
+    ys = [math.log(segundos) for _, segundos in puntos]
+    media_x, media_y = fmean(xs), fmean(ys)
+    b = sum((x - media_x) * (y - media_y) for x, y in zip(xs, ys)) / sum(
+        (x - media_x) ** 2 for x in xs
+    )
+    return math.exp(media_y - b * media_x), b
+
+
+def estimar_listas(mediciones: list[tuple], max_listas: int, grado: int = 8) -> dict[str, tuple]:
+    """
+    Completa las mediciones sin versión con listas con una estimación
+    (`segundos_listas` pasa a ser `(segundos, "estimado")`) y devuelve
+    `{recorrido: (a, b, tamaños usados)}` de cada ajuste.
+    """
+    tamanios = sorted({max_listas // divisor for divisor in _CALIBRACION if max_listas // divisor > 1})
+    if len(tamanios) < 2 or all(m[2] is not None for m in mediciones):
+        return {}
+    # Se reutilizan las mediciones que ya se hicieron en esos tamaños.
+    medidos = {(nombre, nodos): segundos for nombre, nodos, segundos, *_ in mediciones}
+    nombres = dict.fromkeys(nombre for nombre, *_ in mediciones)
+    puntos = {nombre: [] for nombre in nombres}
+    for nodos in tamanios:
+        segundos = {nombre: medidos.get((nombre, nodos)) for nombre in nombres}
+        if None in segundos.values():
+            segundos = medir_listas(nodos, grado)
+        for nombre in nombres:
+            puntos[nombre].append((nodos, segundos[nombre]))
+
+    ajustes = {nombre: (*ajustar_potencia(p), tamanios) for nombre, p in puntos.items()}
+    for i, (nombre, nodos, segundos_listas, *resto) in enumerate(mediciones):
+        if segundos_listas is None:
+            a, b, _ = ajustes[nombre]
+            mediciones[i] = (nombre, nodos, (a * nodos**b, "estimado"), *resto)
+    return ajustes
+
+
+def _memoria_grafo(nodos: int, grado: int, compacto: bool):
+    """Grafo sintético y los bytes que ocupan sus adyacencias (medidos con tracemalloc)."""
+    gc.collect()
+    tracemalloc.start()
+    grafo = generar_grafo(nodos, grado)
+    if compacto:
+        grafo.compactar()
+    gc.collect()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return grafo, memoria
+
+
+def medir_compacto(nodos: int, grado: int = 8) -> list[tuple]:
+    """
+    Devuelve `(formato, nodos, bytes, segundos_dfs, segundos_bfs)` del grafo en
+    dicts y en CSR (recorridos completos, mejor de `_REPETICIONES_COMPACTO`
+    corridas), verificando que recorran igual.
+    """
+    mediciones, recorridos = [], []
+    for formato, compacto in (("dict", False), ("csr", True)):
+        grafo, memoria = _memoria_grafo(nodos, grado, compacto)
+        dfs, segundos_dfs = _medir_mejor(grafo.dfs_autoplay, "N000000", None)
+        bfs, segundos_bfs = _medir_mejor(grafo.bfs_ver_similar, "N000000", None)
+        recorridos.append((dfs, bfs))
+        mediciones.append((formato, nodos, memoria, segundos_dfs, segundos_bfs))
+        del grafo
+    if recorridos[0] != recorridos[1]:
+        raise AssertionError("el grafo compacto recorre distinto")
+    return mediciones
+
+
+def imprimir_reporte_compacto(mediciones: list[tuple]):
+    print("\n📦 ADYACENCIAS: DICTS DE TUPLAS VS CSR")
+    print("=" * 72)
+    print(f"  {'formato':<10}{'nodos':>9}{'memoria':>14}{'dfs completo':>16}{'bfs completo':>16}")
+    for formato, nodos, memoria, segundos_dfs, segundos_bfs in mediciones:
+        print(
+            f"  {formato:<10}{nodos:>9}{memoria / 2**20:>10.1f} MiB"
+            f"{segundos_dfs * 1000:>13.1f} ms{segundos_bfs * 1000:>13.1f} ms"
+        )
+    print("=" * 72)
+
+
+def _duracion(segundos: float) -> str:
+    if segundos < 10:
+        return f"{segundos * 1000:.1f} ms"
+    if segundos < 600:
+        return f"{segundos:.1f} s"
+    return f"{segundos / 60:.1f} min"
+
+
+def imprimir_reporte(mediciones: list[tuple], ajustes: dict | None = None):
+    print("\n🚀 RECORRIDOS DEL GRAFO")
+    print("=" * 86)
+    print(f"  {'recorrido':<18}{'nodos':>9}{'listas':>14}{'deque + set':>14}{'aceleración':>14}{'k=7':>14}")
+    for nombre, nodos, segundos_listas, segundos, segundos_k in mediciones:
+        if segundos_listas is None:
+            antes, aceleracion = "omitido", "-"
+        else:
+            prefijo = ""
+            if isinstance(segundos_listas, tuple):
+                segundos_listas, prefijo = segundos_listas[0], "≥"
+            antes = prefijo + _duracion(segundos_listas)
+            aceleracion = f"{prefijo}x{segundos_listas / segundos:.0f}" if segundos else "-"
+        print(
+            f"  {nombre:<18}{nodos:>9}{antes:>14}{segundos * 1000:>11.1f} ms{aceleracion:>14}"
+            f"{segundos_k * 1000:>11.2f} ms"
+        )
+    print("=" * 86)
+    for nombre, (a, b, tamanios) in (ajustes or {}).items():
+        usados = "/".join(str(n) for n in tamanios)
+        print(f"  ≥ {nombre}: listas ≈ {a:.3g} · nodos^{b:.2f} s (ajuste con {usados} nodos, cota inferior)")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog="python -m plataforma.bench_recorridos")
+    parser.add_argument("--nodos", type=int, nargs="+", default=[1000, 5000, 100000])
+    parser.add_argument("--grado", type=int, default=8, help="aristas al azar por vértice")
+    parser.add_argument(
+        "--max-listas", type=int, default=5000,
+        help="tamaño máximo en que se mide la versión con listas (es cuadrática)",
+    )
+    parser.add_argument(
+        "--compacto", action="store_true", help="compara también dicts de tuplas contra CSR"
+    )
+    args = parser.parse_args(argumentos)
+
+    mediciones = []
+    for nodos in args.nodos:
+        mediciones += medir_recorridos(nodos, args.grado, con_listas=nodos <= args.max_listas)
+    ajustes = estimar_listas(mediciones, args.max_listas, args.grado)
+    imprimir_reporte(mediciones, ajustes)
+
+    if args.compacto:
+        imprimir_reporte_compacto([m for nodos in args.nodos for m in medir_compacto(nodos, args.grado)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Carga en paralelo de los repositorios al arrancar (opcional).
+
+Por defecto cada base se abre y se lee en su primer uso. Quien prefiera pagar
+todo al arrancar (p. ej. un worker que va a atender consultas de inmediato)
+puede leer, parsear e indexar todas las bases a la vez:
+
+- "hilos": cada repositorio se precarga en un hilo. Alcanza cuando el tiempo
+  se va en E/S o en motores que liberan el GIL (SQLite, mmap).
+- "procesos": los almacenes JSON se cargan e indexan en procesos aparte (el
+  parseo y los índices no compiten por el GIL) y el resultado se instala en
+  este proceso; los demás motores se precargan en hilos.
+
+Así el arranque tarda lo que la base más lenta y no la suma de todas. Un error
+en una base no frena a las demás: queda registrado en su `ResultadoCarga`.
+
+Ej:
+    informe = cargar_en_paralelo(
+        {"peliculas": catalogo.db_peliculas, "clientes": clientes.db}, modo="procesos"
+    )
+    informe.imprimir()
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+
+MODO_HILOS = "hilos"
+MODO_PROCESOS = "procesos"
+
+
+class ResultadoCarga:
+    """
+    Cómo terminó la carga de un repositorio.
+
+    Attributes:
+        nombre (str): nombre de la base (p. ej. "peliculas").
+        repositorio: el repositorio (listo para usar si `ok`).
+        segundos (float): duración de su carga (sin contar la espera en la cola).
+        registros (int | None): cantidad de registros cargados.
+        error (Exception | None): excepción si la carga falló.
+        modo (str): "hilos" o "procesos" (cómo se cargó en realidad).
+    """
+
+    def __init__(self, nombre, repositorio, segundos, registros=None, error=None, modo=MODO_HILOS):
+        self.nombre = nombre
+        self.repositorio = repositorio
+        self.segundos = segundos
+        self.registros = registros
+        self.error = error
+        self.modo = modo
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        estado = f"{self.registros} registros" if self.ok else f"error: {self.error!r}"
+        return f"ResultadoCarga({self.nombre!r}, {self.segundos * 1000:.1f} ms, {estado}, {self.modo})"
+
+
+class InformeCarga:
+    """Resultados por base y tiempo total (de reloj) de una carga en paralelo."""
+
+    def __init__(self, resultados: dict[str, ResultadoCarga], segundos: float):
+        self.resultados = resultados
+        self.segundos = segundos
+
+    @property
+    def repositorios(self) -> dict:
+        """Repositorios que quedaron cargados, por nombre."""
+        return {nombre: r.repositorio for nombre, r in self.resultados.items() if r.ok}
+
+    @property
+    def errores(self) -> dict[str, Exception]:
+        """Excepciones de las bases que no se pudieron cargar, por nombre."""
+        return {nombre: r.error for nombre, r in self.resultados.items() if not r.ok}
+
+    def imprimir(self):
+        """Muestra el tiempo de cada base y el total."""
+        print("\n📦 CARGA EN PARALELO")
+        print("=" * 60)
+        for resultado in self.resultados.values():
+            detalle = f"{resultado.registros} registros" if resultado.ok else f"❌ {resultado.error}"
+            print(f"  {resultado.nombre:<14}{resultado.segundos * 1000:>10.1f} ms  [{resultado.modo}] {detalle}")
+        secuencial = sum(r.segundos for r in self.resultados.values())
+        print("=" * 60)
+        print(f"  {'total':<14}{self.segundos * 1000:>10.1f} ms  (en serie: {secuencial * 1000:.1f} ms)")
+
+
+def _precargar_medido(repositorio, indexar: bool) -> float:
+    inicio = time.perf_counter()
+    repositorio.precargar(en_segundo_plano=False, indexar=indexar)
+    return time.perf_counter() - inicio
+
+
+def _ejecutar_medido(tarea):
+    """Corre una `tarea_precarga` (en el proceso trabajador) y mide cuánto tardó."""
+    inicio = time.perf_counter()
+    estado = tarea()
+    return estado, time.perf_counter() - inicio
+
+
+def contexto_procesos():
+    """
+    Contexto de multiprocessing para los pools de procesos del paquete: "fork"
+    donde existe, porque evita volver a importar el programa principal en cada
+    trabajador (con "spawn" se re-ejecutaría el nivel de módulo de scripts como
+    app.py); si no, el contexto por defecto.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def cargar_en_paralelo(
+    repositorios: dict,
+    modo: str = MODO_HILOS,
+    max_trabajadores: int | None = None,
+    indexar: bool = True,
+) -> InformeCarga:
+    """
+    Lee, parsea y (con `indexar`) arma los índices de varios repositorios a la vez.
+
+    Args:
+        repositorios (dict): nombre -> repositorio (`DBContenidos` o `DBClientes`).
+        modo (str): "hilos" o "procesos" (ver el docstring del módulo).
+        max_trabajadores (int, opcional): hilos/procesos simultáneos (por defecto, uno por base).
+        indexar (bool): si es True también arma los índices de cada almacén.
+
+    Returns:
+        InformeCarga: resultado, duración y error (si lo hubo) de cada base.
+    """
+    if modo not in (MODO_HILOS, MODO_PROCESOS):
+        raise ValueError(f"Modo de carga no soportado: {modo}")
+    if max_trabajadores is not None and max_trabajadores < 1:
+        raise ValueError("Se necesita al menos un trabajador.")
+
+    inicio = time.perf_counter()
+    trabajadores = max_trabajadores or max(len(repositorios), 1)
+    resultados: dict[str, ResultadoCarga] = {}
+
+    # Bases que se pueden cargar en otro proceso (JSON todavía sin leer).
+    tareas = {}
+    if modo == MODO_PROCESOS:
+        for nombre, repositorio in repositorios.items():
+            try:
+                tarea = repositorio.tarea_precarga(indexar)
+            except Exception as e:
+                resultados[nombre] = ResultadoCarga(nombre, repositorio, 0.0, error=e, modo=modo)
+                continue
+            if tarea is not None:
+                tareas[nombre] = tarea
+
+    pool_procesos = (
+        ProcessPoolExecutor(min(trabajadores, len(tareas)), mp_context=contexto_procesos())
+        if tareas else nullcontext()
+    )
+    with pool_procesos as procesos, ThreadPoolExecutor(trabajadores) as hilos:
+        # Primero los procesos: se crean antes de que haya otros hilos trabajando.
+        futuros = {
+            procesos.submit(_ejecutar_medido, tarea): (nombre, MODO_PROCESOS)
+            for nombre, tarea in tareas.items()
+        }
+        for nombre, repositorio in repositorios.items():
+            if nombre not in resultados and nombre not in tareas:
+                futuros[hilos.submit(_precargar_medido, repositorio, indexar)] = (nombre, MODO_HILOS)
+
+        for futuro in as_completed(futuros):
+            nombre, usado = futuros[futuro]
+            repositorio = repositorios[nombre]
+            try:
+                if usado == MODO_PROCESOS:
+                    estado, segundos = futuro.result()
+                    adopcion = time.perf_counter()
+                    repositorio.adoptar_precarga(estado)
+                    segundos += time.perf_counter() - adopcion
+                else:
+                    segundos = futuro.result()
+                resultados[nombre] = ResultadoCarga(nombre, repositorio, segundos, len(repositorio), modo=usado)
+            except Exception as e:
+                resultados[nombre] = ResultadoCarga(
+                    nombre, repositorio, time.perf_counter() - inicio, error=e, modo=usado
+                )
+
+    return InformeCarga(
+        {nombre: resultados[nombre] for nombre in repositorios}, time.perf_counter() - inicio
+    )
@@ -1,16 +1,44 @@
+import heapq
+import threading
+from contextlib import ExitStack, contextmanager
+from functools import partial
 from .contenidos.contenido_base import ContenidoBase
 from .contenidos.db_contenidos import DBContenidos 
+from .grafo_contenido import GrafoContenido
+from .persistencia import MODO_COMPLETO, MOTOR_JSON, Consulta, paginar
 
 class NuevoCatalogo:
     """
     Fachada que centraliza el acceso y la gestión de todos los tipos de contenido 
     utilizando las clases DBContenidos como capa de persistencia.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        motor: str = MOTOR_JSON,
+        modo_escritura: str = MODO_COMPLETO,
+        k_similares: int | None = None,
+        k_maraton: int | None = None,
+        grafo_compacto: bool = False,
+        trabajadores_grafo: int | None = None,
+    ):
+        """
+        Args:
+            motor (str): motor de almacenamiento de los gestores: "json", "sqlite"
+                o "binario" (solo lectura).
+            modo_escritura (str): "completo" o "wal" (ver `DBContenidos`).
+            k_similares / k_maraton (int, opcional): vecinos que guarda cada nodo
+                en los grafos de recomendación (ver `GrafoContenido.generar_similitud`);
+                sin límite por defecto.
+            grafo_compacto (bool): si es True, los grafos guardan sus aristas en
+                arrays CSR (ver `GrafoContenido.compactar`), ~10 veces menos memoria.
+            trabajadores_grafo (int, opcional): procesos con que se puntúan los
+                pares al construir cada grafo (ver `GrafoContenido.generar_similitud`);
+                en serie por defecto.
+        """
         # 💡 Inicializamos las instancias de los gestores DB (Controladores)
-        self.db_peliculas = DBContenidos("peliculas")
-        self.db_series = DBContenidos("series")
-        self.db_documentales = DBContenidos("documentales")
+        self.db_peliculas = DBContenidos("peliculas", modo_escritura=modo_escritura, motor=motor)
+        self.db_series = DBContenidos("series", modo_escritura=modo_escritura, motor=motor)
+        self.db_documentales = DBContenidos("documentales", modo_escritura=modo_escritura, motor=motor)
         
         # 💡 Mantenemos un mapa para acceso rápido
         self._gestores = {
@@ -19,6 +47,20 @@ class NuevoCatalogo:
             "documentales": self.db_documentales,
         }
 
+        # 💡 Caché de grafos de recomendación por tipo: {tipo: (version, grafo)}.
+        # Se construye una sola vez y se reutiliza entre reproducciones y sesiones;
+        # solo se reconstruye cuando cambia la versión del DBContenidos del tipo.
+        self._grafos: dict[str, tuple[int, GrafoContenido]] = {}
+        self._lock_grafos = threading.Lock()
+        self.k_similares = k_similares
+        self.k_maraton = k_maraton
+        self.grafo_compacto = grafo_compacto
+        self.trabajadores_grafo = trabajadores_grafo
+
+        # 💡 Cada alta/baja se aplica al grafo cacheado de forma incremental.
+        for tipo, gestor in self._gestores.items():
+            gestor.suscribir(partial(self._actualizar_grafo, tipo))
+
     # --- Métodos de Acceso al Gestor (Encapsulación) ---
 
     def _obtener_gestor(self, tipo: str) -> DBContenidos:
@@ -29,12 +71,34 @@ class NuevoCatalogo:
         return gestor
 
 
+    def precargar(self, *tipos: str, en_segundo_plano: bool = True) -> list:
+        """
+        Abre y carga los gestores indicados (todos si no se indica ninguno) antes
+        de que se usen. Los gestores se abren perezosamente, así que construir el
+        catálogo es inmediato; esto adelanta la carga, por defecto en hilos
+        aparte (devuelve los hilos, para quien quiera esperarlos con `join`).
+        """
+        gestores = [self._obtener_gestor(t) for t in tipos] or list(self._gestores.values())
+        hilos = [gestor.precargar(en_segundo_plano=en_segundo_plano) for gestor in gestores]
+        return [hilo for hilo in hilos if hilo is not None]
+
+
     def obtener_contenido_tipo(self, tipo: str):
-        """Devuelve una lista de objetos TDA (no diccionarios) para un tipo."""
+        """Devuelve una vista perezosa de objetos TDA (no diccionarios) para un tipo."""
         # 💡 Pedimos al gestor que cargue y convierta la data.
         return self._obtener_gestor(tipo).obtener_todos()
 
 
+    def iter_todos(self, tipo: str | None = None):
+        """
+        Genera los TDA de un tipo (o de todos, si no se indica) de a uno,
+        con memoria constante. Útil para procesos por lotes sobre catálogos grandes.
+        """
+        gestores = [self._obtener_gestor(tipo)] if tipo else self._gestores.values()
+        for gestor in gestores:
+            yield from gestor.iter_todos()
+
+
     def agregar_contenido_tipo(self, tipo: str, contenido: ContenidoBase):
         """Añade/Actualiza contenido, delegando la persistencia al gestor."""
         # 💡 Delegamos la serialización y guardado al gestor.
@@ -46,11 +110,102 @@ class NuevoCatalogo:
         # 💡 Delegamos la eliminación al gestor.
         return self._obtener_gestor(tipo).eliminar_contenido(contenido_id)
         
+    # --- Grafo de Recomendaciones ---
+
+    def obtener_grafo(self, tipo: str) -> GrafoContenido:
+        """
+        Devuelve el grafo de recomendaciones del tipo, construyéndolo solo si
+        no existe o si el catálogo cambió desde la última construcción.
+        """
+        gestor = self._obtener_gestor(tipo)
+        tipo = gestor.tipo
+
+        with self._lock_grafos:
+            cache = self._grafos.get(tipo)
+            if cache is not None and cache[0] == gestor.version:
+                return cache[1]
+
+            version = gestor.version
+            grafo = self._construir_grafo(gestor)
+            self._grafos[tipo] = (version, grafo)
+            return grafo
+
+    def _actualizar_grafo(self, tipo: str, evento: str, contenido_id: str, contenido=None):
+        """
+        Observador de los gestores: aplica un alta/baja al grafo cacheado sin
+        reconstruirlo. Si el grafo no estaba al día (o no existe) no hace nada
+        y la próxima `obtener_grafo` lo reconstruirá.
+        """
+        gestor = self._gestores[tipo]
+        with self._lock_grafos:
+            cache = self._grafos.get(tipo)
+            # Solo es válido si el grafo estaba en la versión anterior a este cambio.
+            if cache is None or cache[0] != gestor.version - 1:
+                return
+
+            grafo = cache[1]
+            if evento == "agregar":
+                grafo.actualizar_vertice(contenido)
+            elif evento == "eliminar":
+                grafo.eliminar_vertice(contenido_id)
+            self._grafos[tipo] = (gestor.version, grafo)
+
+    def invalidar_grafo(self, tipo: str | None = None):
+        """Descarta el grafo cacheado de un tipo (o de todos si no se indica)."""
+        with self._lock_grafos:
+            if tipo is None:
+                self._grafos.clear()
+            else:
+                self._grafos.pop(tipo.lower(), None)
+
+    def _construir_grafo(self, gestor: DBContenidos) -> GrafoContenido:
+        """Construye el grafo completo (vértices, similitud y orden) de un gestor."""
+        grafo = GrafoContenido()
+        grafo.construir_desde_contenidos(gestor.obtener_todos(), tipo=gestor.tipo)
+        grafo.generar_similitud(
+            tipo=gestor.tipo,
+            k_similares=self.k_similares,
+            k_maraton=self.k_maraton,
+            trabajadores=self.trabajadores_grafo,
+        )
+        grafo.generar_orden()
+        if self.grafo_compacto:
+            grafo.compactar()
+        return grafo
+
+    # --- Operaciones en Lote y Transacciones ---
+
+    def agregar_muchos(self, tipo: str, contenidos: list[ContenidoBase]):
+        """Añade/Actualiza varios contenidos de un tipo con una sola escritura."""
+        self._obtener_gestor(tipo).agregar_muchos(contenidos)
+
+    def eliminar_muchos(self, tipo: str, contenido_ids: list[str]) -> int:
+        """Elimina varios contenidos de un tipo con una sola escritura."""
+        return self._obtener_gestor(tipo).eliminar_muchos(contenido_ids)
+
+    @contextmanager
+    def transaccion(self, *tipos: str):
+        """
+        Abre una transacción sobre los gestores indicados (todos si no se indica
+        ninguno). Los cambios se confirman juntos al salir del bloque o se
+        deshacen si ocurre una excepción.
+
+        Ej:
+            with catalogo.transaccion("peliculas"):
+                catalogo.agregar_contenido_tipo("peliculas", p1)
+                catalogo.agregar_contenido_tipo("peliculas", p2)
+        """
+        gestores = [self._obtener_gestor(t) for t in tipos] or list(self._gestores.values())
+        with ExitStack() as pila:
+            for gestor in gestores:
+                pila.enter_context(gestor.transaccion())
+            yield self
+
     # --- Métodos de Búsqueda ---
 
     def buscar_por_id(self, tipo: str, contenido_id: str):
         """Busca un solo contenido por ID, usando la eficiencia del diccionario."""
-        # 💡 Usamos el método eficiente de DBContenidos (acceso O(1)).
+        # 💡 Usamos el índice por ID de DBContenidos (acceso O(1), sin hidratar el resto).
         return self._obtener_gestor(tipo).obtener_por_id(contenido_id)
 
     # El método buscar_y_ver de antes iteraba ineficientemente:
@@ -59,41 +214,101 @@ class NuevoCatalogo:
 
     def buscar(self, titulo=None, etiquetas=None, palabras_claves=None, id_contenido=None) -> list[ContenidoBase]:
         """
-        Busca en todos los contenidos cargados aplicando los filtros.
+        Busca en todos los contenidos aplicando los filtros:
+        - id_contenido / titulo: subcadena, sin distinguir mayúsculas ni acentos
+          (acotada con un índice de trigramas).
+        - etiquetas / palabras_claves: alcanza con tener alguna.
         """
         resultados = []
-        
-        # 💡 Ahora iteramos sobre todos los gestores y les pedimos la data (si es necesario)
-        # NOTA: Para no sobrecargar la memoria, es mejor pedir la data solo cuando se busca.
-        
-        # 1. Obtenemos todos los TDA de todos los tipos:
-        todos_los_contenidos = []
+
+        # 💡 Cada gestor resuelve los filtros en su motor (consultas indexadas en SQLite)
+        # y solo hidrata los contenidos que coinciden.
         for gestor in self._gestores.values():
-            todos_los_contenidos.extend(gestor.obtener_todos())
-        
-        # 2. Aplicamos la lógica de filtrado sobre los TDA:
-        for c in todos_los_contenidos:
-            match = True
-            
-            # Busqueda por ID (si se proporciona)
-            if id_contenido and id_contenido.lower() not in c.id.lower():
-                match = False
-                
-            # Busqueda por título
-            if titulo and titulo.lower() not in c.titulo.lower():
-                match = False
-                
-            # Busqueda por etiquetas
-            # Usamos any() para buscar una intersección de claves.
-            if etiquetas and not any(e in c.etiquetas for e in etiquetas):
-                match = False
-                
-            # Busqueda por palabras clave
-            # Usamos isdisjoint() para ver si NO tienen elementos comunes
-            if palabras_claves and set(palabras_claves).isdisjoint(c.palabras_claves):
-                match = False
-                
-            if match:
-                resultados.append(c)
-                
-        return resultados
\ No newline at end of file
+            resultados.extend(
+                gestor.buscar(
+                    titulo=titulo,
+                    etiquetas=etiquetas,
+                    palabras_claves=palabras_claves,
+                    id_contenido=id_contenido,
+                )
+            )
+
+        return resultados
+
+
+    def buscar_relevantes(
+        self,
+        texto: str | None,
+        etiquetas=None,
+        k: int = 10,
+        tipo: str | None = None,
+    ) -> list[ContenidoBase]:
+        """
+        Búsqueda por relevancia: los `k` contenidos (de un tipo o de todos) que
+        mejor responden a `texto`, del más al menos relevante.
+
+        - texto: puntaje BM25 sobre el título y las palabras clave, sin
+          distinguir mayúsculas ni acentos (el título pesa más).
+        - etiquetas: el puntaje se multiplica por (1 + suma de los niveles del
+          contenido en esas etiquetas); sin texto, se ordena solo por ellos.
+
+        Ej (cuadro de búsqueda, diez resultados):
+            catalogo.buscar_relevantes("señor de los anillos", etiquetas=["Magia"])
+        """
+        if k < 0:
+            raise ValueError("k no puede ser negativo.")
+        gestores = [self._obtener_gestor(tipo)] if tipo else list(self._gestores.values())
+
+        # 💡 Las estadísticas (idf, largo medio) se suman entre tipos: así los
+        # puntajes de películas, documentales y series son comparables.
+        estadisticas = None
+        if len(gestores) > 1:
+            estadisticas = sum(
+                (gestor.estadisticas_bm25(texto) for gestor in gestores[1:]),
+                gestores[0].estadisticas_bm25(texto),
+            )
+
+        # 🚀 Cada gestor devuelve solo sus k mejores (montículo acotado); se mezclan
+        # y se hidratan únicamente los k finales.
+        candidatos = (
+            (puntaje, -posicion, -orden, gestor, contenido_id)
+            for posicion, gestor in enumerate(gestores)
+            for puntaje, orden, contenido_id in gestor.rankear(texto, etiquetas, k, estadisticas)
+        )
+        mejores = heapq.nlargest(k, candidatos, key=lambda c: c[:3])
+        return [gestor.obtener_por_id(contenido_id) for *_, gestor, contenido_id in mejores]
+
+
+    def consultar(
+        self,
+        consulta: Consulta,
+        tipo: str | None = None,
+        limite: int | None = None,
+        desplazamiento: int = 0,
+    ) -> list[ContenidoBase]:
+        """
+        Contenidos de un tipo (o de todos) que cumplen una `Consulta` por rasgos:
+        etiquetas (con umbral de nivel), palabras clave, director, actor y año,
+        combinados con Y / O / NO (`&`, `|`, `~`). Los resultados van en orden de
+        tipo y de alta; `limite`/`desplazamiento` paginan el total.
+
+        Ej (pantalla "explorar por género", segunda página):
+            from plataforma.persistencia import Etiqueta, Anio
+            catalogo.consultar(Etiqueta("Magia", minimo=0.8) & ~Anio(1900, 1999),
+                               limite=20, desplazamiento=20)
+        """
+        # 💡 Primero solo ids (postings / SQL), después se hidrata la página.
+        gestores = [self._obtener_gestor(tipo)] if tipo else list(self._gestores.values())
+        paginas = [(gestor, gestor.consultar_ids(consulta)) for gestor in gestores]
+        seleccion = paginar(
+            [(gestor, contenido_id) for gestor, ids in paginas for contenido_id in ids],
+            limite,
+            desplazamiento,
+        )
+        return [gestor.obtener_por_id(contenido_id) for gestor, contenido_id in seleccion]
+
+
+    def contar(self, consulta: Consulta, tipo: str | None = None) -> int:
+        """Cantidad de contenidos (de un tipo o de todos) que cumplen una `Consulta`."""
+        gestores = [self._obtener_gestor(tipo)] if tipo else list(self._gestores.values())
+        return sum(len(gestor.consultar_ids(consulta)) for gestor in gestores)
@@ -1,3 +1,6 @@
+from .._vocabulario import internar_dict
+
+
 class Preferencias:
     """
     Clase TDA que representa  de las preferencias de un cliente.
@@ -8,6 +11,8 @@ class Preferencias:
         nivel_preferencia (float, opcional): Nivel de preferencia entre 0 (bajo) y 1 (alto).
     """
 
+    __slots__ = ("preferencias",)
+
     # 💡 Se inicializa directamente con los datos Puros.
     def __init__(self, preferencias_data: dict):
         self.preferencias = preferencias_data
@@ -17,10 +22,11 @@ class Preferencias:
     def from_dict(cls, data: dict):
         """Crea una instancia desde un diccionario crudo."""
         # Aseguramos la estructura base si viene vacío
+        # Los nombres (géneros, actores, directores) se internan en el vocabulario compartido.
         data = {
-            "genero": data.get("genero", {}),
-            "actor": data.get("actor", {}),
-            "director": data.get("director", {})
+            "genero": internar_dict(data.get("genero", {})),
+            "actor": internar_dict(data.get("actor", {})),
+            "director": internar_dict(data.get("director", {}))
         }
         return cls(data)
 
@@ -1,8 +1,9 @@
 from ._preferencia import Preferencias
+from .._vocabulario import internar
 from datetime import datetime
 
 
-def perfil_cliente(cliente: Cliente) -> str:
+def perfil_cliente(cliente: "Cliente") -> str:
     """
     Genera una representación bonita y legible de los datos de un cliente.
     """
@@ -80,6 +81,17 @@ class Cliente:
         fecha de baja.
     """
 
+    __slots__ = (
+        "id",
+        "nro_cliente",
+        "nombre",
+        "apellido",
+        "tipo_servicio",
+        "fecha_alta",
+        "fecha_baja",
+        "preferencias",
+    )
+
     def __init__(
         self,
         nro_cliente,
@@ -93,9 +105,9 @@ class Cliente:
     ):
         self.id = id if id is not None else nro_cliente 
         self.nro_cliente = nro_cliente
-        self.nombre = nombre
-        self.apellido = apellido
-        self.tipo_servicio = tipo_servicio
+        self.nombre = internar(nombre)
+        self.apellido = internar(apellido)
+        self.tipo_servicio = internar(tipo_servicio)
         self.fecha_alta = datetime.strptime(fecha_alta, "%Y-%m-%d")
         self.fecha_baja = (
             datetime.strptime(fecha_baja, "%Y-%m-%d") if fecha_baja else None
@@ -111,14 +123,14 @@ class Cliente:
 
     def actualizar_tipo_servicio(self, nuevo_tipo: str):
         """Actualiza el tipo de servicio del cliente."""
-        self.tipo_servicio = nuevo_tipo
+        self.tipo_servicio = internar(nuevo_tipo)
 
     def actualizar_perfil(self, nombre: str = None, apellido: str = None):
         """Actualiza el nombre y/o apellido del cliente."""
         if nombre:
-            self.nombre = nombre
+            self.nombre = internar(nombre)
         if apellido:
-            self.apellido = apellido
+            self.apellido = internar(apellido)
 
     def obtener_preferencias(self):
         """Retorna las preferencias del cliente."""
@@ -1,28 +1,90 @@
+import threading
 from .cliente import Cliente
 from .db_clientes import DBClientes
 
-db = DBClientes() 
+# 💡 Repository compartido, creado recién en el primer uso: importar el módulo
+# no abre ni lee la base de clientes.
+_db: DBClientes | None = None
+_lock_db = threading.Lock()
+
+
+def obtener_db() -> DBClientes:
+    """Devuelve el Repository de clientes compartido, creándolo la primera vez."""
+    global _db
+    if _db is None:
+        with _lock_db:
+            if _db is None:
+                _db = DBClientes()
+    return _db
+
+
+def __getattr__(nombre):
+    # Compatibilidad: `clientes.db` sigue existiendo, pero se crea al pedirlo.
+    if nombre == "db":
+        return obtener_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
 
 class Clientes:
     def __init__(self):
         # 💡 Ya no se carga todo en memoria en el init (es ineficiente). 
         # Ahora se usa el Repository para obtener los objetos SOLO cuando se necesitan.
         pass # self.clientes = db.obtener_todos() <-- ¡Mal!
+
+    @property
+    def db(self) -> DBClientes:
+        return obtener_db()
+
+    def precargar(self, en_segundo_plano: bool = True):
+        """Abre y carga la base de clientes (por defecto en un hilo aparte; ver `DBClientes.precargar`)."""
+        return self.db.precargar(en_segundo_plano=en_segundo_plano)
     
     def obtener_clientes(self) -> list[Cliente]:
         """Obtiene TODOS los clientes (TDA) del Repository (DB)."""
-        return db.obtener_todos() # Llama al método del Repository que devuelve TDA Cliente
+        return self.db.obtener_todos() # Llama al método del Repository que devuelve TDA Cliente
+
+    def iter_todos(self):
+        """Recorre TODOS los clientes (TDA) de a uno, sin cargarlos todos en memoria."""
+        return self.db.iter_todos()
 
     def agregar_cliente(self, cliente: Cliente):
         """Recibe el TDA Cliente y se lo pasa al Repository para que lo guarde."""
-        db.agregar_cliente(cliente) # El Repository sabe cómo convertir Cliente a Dict y guardar
+        self.db.agregar_cliente(cliente) # El Repository sabe cómo convertir Cliente a Dict y guardar
+
+    def agregar_muchos(self, clientes: list[Cliente]):
+        """Pasa varios TDA Cliente al Repository para guardarlos con una sola escritura."""
+        self.db.agregar_muchos(clientes)
+
+    def eliminar_muchos(self, nros_cliente: list[str]) -> int:
+        """Elimina varios clientes por número con una sola escritura."""
+        return self.db.eliminar_muchos(nros_cliente)
+
+    def transaccion(self):
+        """Context manager: agrupa altas/bajas y las confirma (o deshace) juntas."""
+        return self.db.transaccion()
 
     def obtener_cliente(self, nro_cliente: str=None, nombre_cliente:str=None) -> Cliente | None:
         """Pide al Repository el TDA Cliente por ID."""
         if nro_cliente:
-            return db.obtener_por_id(nro_cliente) # Llama al método del Repository que devuelve TDA Cliente
+            return self.db.obtener_por_id(nro_cliente) # Llama al método del Repository que devuelve TDA Cliente
         if nombre_cliente:
-            return db.obtener_por_nombre(nombre_cliente)
+            return self.db.obtener_por_nombre(nombre_cliente)
+
+    def obtener_por_tipo_servicio(self, tipo_servicio: str) -> list[Cliente]:
+        """Segmento de clientes por tipo de servicio (consulta indexada)."""
+        return self.db.obtener_por_tipo_servicio(tipo_servicio)
+
+    def obtener_por_fecha_alta(self, desde=None, hasta=None) -> list[Cliente]:
+        """Clientes dados de alta en un rango de fechas (consulta indexada)."""
+        return self.db.obtener_por_fecha_alta(desde, hasta)
+
+    def obtener_por_fecha_baja(self, desde=None, hasta=None) -> list[Cliente]:
+        """Clientes dados de baja en un rango de fechas (reportes de bajas)."""
+        return self.db.obtener_por_fecha_baja(desde, hasta)
+
+    def obtener_activos(self, fecha=None) -> list[Cliente]:
+        """Clientes activos hoy (sin baja) o en una fecha dada."""
+        return self.db.obtener_activos(fecha)
 
     def __str__(self):
         return f"Clientes: {self.clientes}"
@@ -1,57 +1,116 @@
 # DBCLIENTES.PY
-import json
 import os
+import threading
+from contextlib import contextmanager
 from .cliente import Cliente  # Importa el TDA
 from ._preferencia import Preferencias  # Importa el TDA
+from ..persistencia import (
+    AlmacenBase,
+    AlmacenJSON,
+    AlmacenSQLiteClientes,
+    MODO_COMPLETO,
+    MODO_WAL,
+    MOTOR_JSON,
+    MOTOR_SQLITE,
+)
 
 DB_FILE = "db/clientes.json"
 
 
 class DBClientes:
-    # ... (Métodos internos _cargar_archivo y _guardar_archivo permanecen iguales,
-    # pero ahora manejan diccionarios de datos crudos)
-    def __init__(self):
-        self.clientes = self._cargar_archivo()
+    # Los registros crudos (diccionarios) viven en un motor de almacenamiento
+    # intercambiable (`AlmacenBase`): JSON en memoria (por defecto) o SQLite.
 
-    def _cargar_archivo(self) -> dict:
-        """Carga el diccionario de clientes desde el archivo JSON."""
+    # Índices del almacén que se arman al precargar con `indexar=True`
+    # (nombre, tipo de servicio y fechas).
+    INDICES = ("clientes",)
 
-        # Si el archivo no existe o está vacío, devuelve un diccionario vacío
-        if not os.path.exists(DB_FILE) or os.path.getsize(DB_FILE) == 0:
-            return {}
-        try:
-            with open(DB_FILE, "r", encoding="utf-8") as f:
+    def __init__(
+        self,
+        modo_escritura: str = MODO_COMPLETO,
+        motor: str = MOTOR_JSON,
+        ruta: str | None = None,
+        almacen: AlmacenBase | None = None,
+    ):
+        """
+        Args:
+            modo_escritura (str): "completo" reescribe el JSON en cada alta;
+                "wal" anexa cada alta a `db/clientes.json.log` y compacta en segundo plano
+                (con SQLite activa su `journal_mode=WAL`).
+            motor (str): "json" (archivo cargado en memoria) o "sqlite"
+                (consultas indexadas por nro_cliente y nombre).
+            ruta (str, opcional): archivo de datos. Por defecto `db/clientes.json`
+                o `db/clientes.sqlite3` según el motor.
+            almacen (AlmacenBase, opcional): motor ya construido (ignora `motor` y `ruta`).
+        """
+        if modo_escritura not in (MODO_COMPLETO, MODO_WAL):
+            raise ValueError(f"Modo de escritura no soportado: {modo_escritura}")
+        self.modo_escritura = modo_escritura
+        if almacen is None:
+            # Se valida ya; el motor se abre recién en el primer uso.
+            if motor not in (MOTOR_JSON, MOTOR_SQLITE):
+                raise ValueError(f"Motor de almacenamiento no soportado: {motor}")
+        self._motor, self._ruta = motor, ruta
+        # 💡 Motor de almacenamiento: se abre en el primer uso (ver `_almacen`).
+        self._almacen_abierto = almacen
+        self._lock_almacen = threading.Lock()
+        # Operaciones de la transacción abierta (None = sin transacción).
+        self._pendientes = None
 
-                data = json.load(f)
-                # Devuelve el valor de la clave 'clientes', que ahora es un diccionario
-                return data.get("clientes", {})
+    @property
+    def _almacen(self) -> AlmacenBase:
+        """Motor de almacenamiento, abierto en el primer uso: construir el repositorio no toca el disco."""
+        if self._almacen_abierto is None:
+            with self._lock_almacen:
+                if self._almacen_abierto is None:
+                    self._almacen_abierto = self._crear_almacen(self._motor, self._ruta, self.modo_escritura)
+        return self._almacen_abierto
 
-        except json.JSONDecodeError as e:
-            # Si el JSON está mal formado, el problema no es mío
-            print(
-                f"Error fatal: El archivo '{DB_FILE}' no tiene un formato JSON válido: {e}"
-            )
+    def precargar(self, en_segundo_plano: bool = True, indexar: bool = False) -> threading.Thread | None:
+        """
+        Abre el motor y carga sus datos antes de que se necesiten (p. ej. mientras
+        se muestra el menú); con `indexar` arma además sus índices. En segundo
+        plano devuelve el hilo (daemon) que la hace.
+        """
+        if not en_segundo_plano:
+            self._almacen.precargar(self.INDICES if indexar else ())
+            return None
+        hilo = threading.Thread(target=self.precargar, args=(False, indexar), daemon=True)
+        hilo.start()
+        return hilo
 
-            return {}
+    def tarea_precarga(self, indexar: bool = True):
+        """
+        Precarga serializable para correr en otro proceso (ver `AlmacenBase.tarea_precarga`);
+        su resultado se instala con `adoptar_precarga`. None si el motor no la admite.
+        """
+        return self._almacen.tarea_precarga(self.INDICES if indexar else ())
 
-    def _guardar_archivo(self):
-        """Guarda el diccionario actual de clientes en el archivo JSON."""
-        # Se guarda el diccionario completo con la clave 'clientes'
-        data = {"clientes": self.clientes}
-        try:
-            with open(DB_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error al escribir en el archivo '{DB_FILE}': {e}")
+    def adoptar_precarga(self, estado) -> bool:
+        """Instala el estado que devolvió la `tarea_precarga` en otro proceso."""
+        return self._almacen.adoptar_estado(estado)
+
+    def __len__(self) -> int:
+        """Cantidad de registros (abre el motor si hace falta)."""
+        return len(self._almacen)
+
+    def _crear_almacen(self, motor: str, ruta: str | None, modo_escritura: str) -> AlmacenBase:
+        """Construye el motor de almacenamiento pedido."""
+        if motor == MOTOR_JSON:
+            return AlmacenJSON(ruta or DB_FILE, "clientes", modo_escritura)
+        if motor == MOTOR_SQLITE:
+            ruta = ruta or os.path.splitext(DB_FILE)[0] + ".sqlite3"
+            return AlmacenSQLiteClientes(ruta, modo_escritura)
+        raise ValueError(f"Motor de almacenamiento no soportado: {motor}")
 
     def obtener_todos(self) -> list:
         """Devuelve la lista de clientes (los valores del diccionario)."""
         # Aunque internamente es un dict, devolver los VALUES es útil para iterar
-        return list(self.clientes.values())
+        return list(self._almacen.registros())
 
     def obtener_por_id(self, cliente_id: str) -> Cliente | None:
         """Busca el diccionario de datos y LO CONVIERTE en un objeto Cliente."""
-        cliente_data = self.clientes.get(cliente_id)
+        cliente_data = self._almacen.obtener(cliente_id)
         if cliente_data is None:
             return None
 
@@ -60,24 +119,63 @@ class DBClientes:
         return self._diccionario_a_cliente(cliente_data)
     
     def obtener_por_nombre(self, nombre_cliente: str) -> Cliente | None:
-        """Busca el diccionario de datos y LO CONVIERTE en un objeto Cliente."""
-        cliente_data: dict[str, dict] = self.clientes
-        cliente = {}
-
-        if cliente_data is None:
+        """
+        Devuelve el único Cliente con ese nombre (sin distinguir mayúsculas), o
+        None si no hay ninguno. Si hay homónimos lanza ValueError: no se elige
+        uno al azar (ver `buscar_por_nombre`).
+        """
+        # 💡 Índice secundario por nombre plegado: no se recorre a los demás clientes.
+        ids = self._almacen.clientes_por_nombre(nombre_cliente)
+        if not ids:
             return None
+        if len(ids) > 1:
+            raise ValueError(
+                f"Hay {len(ids)} clientes con el nombre '{nombre_cliente}': usá el número de cliente."
+            )
+        return self.obtener_por_id(ids[0])
 
-        for datos_cliente in cliente_data.values():
-            if datos_cliente["nombre"].lower() == nombre_cliente.lower():
-                cliente.update(datos_cliente)
+    def buscar_por_nombre(self, nombre_cliente: str) -> list[Cliente]:
+        """Todos los clientes con ese nombre (sin distinguir mayúsculas), en orden de alta."""
+        return self._hidratar_ids(self._almacen.clientes_por_nombre(nombre_cliente))
 
-        # 💡 Aquí es donde CONVERTIMOS el diccionario crudo a un TDA.
-        # Ahora el TDA Cliente necesita una nueva forma de inicializarse.
-        return self._diccionario_a_cliente(cliente)
+    def obtener_por_tipo_servicio(self, tipo_servicio: str) -> list[Cliente]:
+        """Clientes con ese tipo de servicio (p. ej. "Premium"), en orden de alta."""
+        return self._hidratar_ids(self._almacen.clientes_por_tipo_servicio(tipo_servicio))
+
+    def obtener_por_fecha_alta(self, desde=None, hasta=None) -> list[Cliente]:
+        """
+        Clientes dados de alta entre `desde` y `hasta` (incluidos; texto "AAAA-MM-DD",
+        `date` o `datetime`; cualquiera puede omitirse), por fecha de alta.
+        """
+        return self._hidratar_ids(self._almacen.clientes_por_fecha("fecha_alta", desde, hasta))
+
+    def obtener_por_fecha_baja(self, desde=None, hasta=None) -> list[Cliente]:
+        """Clientes dados de baja entre `desde` y `hasta` (incluidos), por fecha de baja."""
+        return self._hidratar_ids(self._almacen.clientes_por_fecha("fecha_baja", desde, hasta))
+
+    def obtener_activos(self, fecha=None) -> list[Cliente]:
+        """
+        Clientes activos en `fecha` (dados de alta y sin baja hasta ese día), por
+        fecha de alta. Sin fecha: los que no tienen baja, en orden de alta.
+        """
+        return self._hidratar_ids(self._almacen.clientes_activos(fecha))
+
+    def contar_activos(self, fecha=None) -> int:
+        """Cantidad de clientes activos en `fecha` (sin hidratar ninguno)."""
+        return len(self._almacen.clientes_activos(fecha))
+
+    def _hidratar_ids(self, ids) -> list[Cliente]:
+        """Convierte a TDA los clientes de una lista de ids (ya resuelta por los índices)."""
+        return [self._diccionario_a_cliente(self._almacen.obtener(cliente_id)) for cliente_id in ids]
 
     def obtener_todos(self) -> list[Cliente]:
         """Devuelve una lista de objetos Cliente (TDA)."""
-        return [self._diccionario_a_cliente(data) for data in self.clientes.values()]
+        return [self._diccionario_a_cliente(data) for data in self._almacen.registros()]
+
+    def iter_todos(self):
+        """Genera los objetos Cliente (TDA) de a uno, con memoria constante (lectura en streaming)."""
+        for data in self._almacen.iter_registros():
+            yield self._diccionario_a_cliente(data)
 
     # Nuevo método para construir el objeto Cliente desde los datos crudos
     def _diccionario_a_cliente(self, data: dict) -> Cliente:
@@ -108,8 +206,74 @@ class DBClientes:
         if not cliente_id:
             raise ValueError("El objeto Cliente debe tener un 'id' válido.")
 
-        self.clientes[cliente_id] = cliente_data
-        self._guardar_archivo()
+        self._almacen.guardar(cliente_data)
+        self._confirmar({"op": "guardar", "id": cliente_id, "registro": cliente_data})
+
+    def eliminar_cliente(self, cliente_id: str) -> bool:
+        """Elimina un cliente por su ID. Devuelve True si se eliminó, False si no existía."""
+        if not self._almacen.eliminar(cliente_id):
+            return False
+        self._confirmar({"op": "eliminar", "id": cliente_id})
+        return True
+
+    # --- Operaciones en Lote y Transacciones ---
+
+    def agregar_muchos(self, clientes):
+        """Añade varios Cliente (TDA) guardando el archivo UNA sola vez."""
+        with self.transaccion():
+            for cliente in clientes:
+                self.agregar_cliente(cliente)
+
+    def eliminar_muchos(self, cliente_ids) -> int:
+        """Elimina varios clientes por ID guardando una sola vez. Devuelve cuántos se eliminaron."""
+        eliminados = 0
+        with self.transaccion():
+            for cliente_id in cliente_ids:
+                if self.eliminar_cliente(cliente_id):
+                    eliminados += 1
+        return eliminados
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa altas/bajas: se aplican en memoria y se persisten una sola vez al
+        salir del bloque `with`. Si el bloque lanza una excepción se deshacen
+        todos los cambios. Las transacciones anidadas se integran a la exterior.
+        """
+        if self._pendientes is not None:
+            yield self
+            return
+
+        self._almacen.iniciar_transaccion()
+        self._pendientes = []
+        try:
+            yield self
+        except BaseException:
+            self._pendientes = None
+            self._almacen.deshacer_transaccion()
+            raise
+
+        pendientes, self._pendientes = self._pendientes, None
+        self._almacen.persistir(pendientes)
+
+    def _confirmar(self, operacion: dict):
+        """Persiste un cambio ya aplicado, o lo difiere si hay una transacción abierta."""
+        if self._pendientes is not None:
+            self._pendientes.append(operacion)
+            return
+        self._almacen.persistir([operacion])
+
+    def compactar(self, en_segundo_plano: bool = True):
+        """Vuelca los cambios pendientes del log al archivo principal (modo "wal")."""
+        # Con una transacción abierta el estado aún no está confirmado.
+        if self._pendientes is not None or self._almacen_abierto is None:
+            return
+        self._almacen.compactar(en_segundo_plano=en_segundo_plano)
+
+    def cerrar(self):
+        """Espera compactaciones pendientes y libera el almacén (si llegó a abrirse)."""
+        if self._almacen_abierto is not None:
+            self._almacen_abierto.cerrar()
 
     def _cliente_a_diccionario(self, cliente: Cliente) -> dict:
         """Convierte un objeto Cliente (TDA) de vuelta a diccionario para guardar."""
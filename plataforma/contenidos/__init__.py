@@ -1,14 +1,19 @@
-from .pelicula import Pelicula
-from .documental import Documental
-from .serie import Serie
-from ._helpers import (
-    Pila,
-    Cola,
-    obtener_pesos_aristas,
-    eliminar_contenido,
-    guardar_contenido,
-    obtener_contenido,
-)
+import importlib
+
+# 💡 Importación diferida: cada nombre se importa de su submódulo en el primer
+# uso, así importar el paquete no arrastra los helpers ni la persistencia.
+_EXPORTACIONES = {
+    "Pelicula": ".pelicula",
+    "Documental": ".documental",
+    "Serie": ".serie",
+    "Pila": "._helpers",
+    "Cola": "._helpers",
+    "obtener_pesos_aristas": "._helpers",
+    "eliminar_contenido": "._helpers",
+    "guardar_contenido": "._helpers",
+    "obtener_contenido": "._helpers",
+    "iterar_contenido": "._helpers",
+}
 
 
 __all__ = [
@@ -21,4 +26,18 @@ __all__ = [
     "eliminar_contenido",
     "guardar_contenido",
     "obtener_contenido",
+    "iterar_contenido",
 ]
+
+
+def __getattr__(nombre):
+    modulo = _EXPORTACIONES.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
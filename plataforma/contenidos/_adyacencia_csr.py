@@ -0,0 +1,208 @@
+"""
+Listas de adyacencia ponderadas en formato CSR (compressed sparse row).
+
+En vez de un dict id -> [(vecino_id, score), ...] (una tupla de Python por
+arista y sentido, ~76 bytes), cada grafo guarda:
+
+- `destinos`: array de int32 con la posición del vecino de cada arista.
+- `pesos`: array de float32 con su score.
+- `filas`: array de int64 con la fila de cada vértice, (inicio, largo) de su
+  tramo en ambos arrays empaquetados en un solo entero (-1 = sin fila).
+
+Las posiciones salen de un `IndiceVertices` (id <-> posición) compartido por
+los grafos de similitud y maratón, así que cada arista ocupa 8 bytes y las de
+un mismo vértice quedan contiguas en memoria (mejor localidad al recorrer).
+Por vértice solo quedan su entrada en el índice y 8 bytes de fila por grafo.
+
+Medido con `python -m plataforma.bench_recorridos --compacto` (grado 8, ~18
+entradas por vértice y grafo): con 100k vértices las adyacencias pasan de
+289 a 42 MiB (x6.9; ~29 MiB son los 8 bytes por arista, el resto el índice
+y los ids). Los recorridos completos cuestan parecido: con 100k vértices
+algo menos que con dicts; con 5k, algo más (cada paso arma la lista de ids
+desde los arrays en vez de leer una lista ya armada).
+
+Los scores se guardan en float32: se leen redondeados a `DECIMALES_PESO`
+decimales, así que pueden diferir de los del grafo en dicts a partir del
+quinto decimal (el orden de cada fila es el mismo).
+
+`AdyacenciaCSR` se comporta como el dict original (`get`, `[]`, `pop`,
+`items`...): leer una fila devuelve la lista de tuplas de siempre. Reemplazar
+una fila escribe la nueva al final de los arrays y recién entonces la publica,
+de modo que un recorrido en curso nunca ve una fila a medias. Las filas viejas
+quedan como basura hasta que se reorganiza (automáticamente, al superar la
+mitad de los arrays).
+"""
+
+from array import array
+from collections.abc import MutableMapping
+
+
+# Los scores se guardan en float32 (~7 cifras significativas): al leerlos se
+# redondean a esta cantidad de decimales para devolver los valores originales.
+DECIMALES_PESO = 4
+
+# Por debajo de esta cantidad de celdas no vale la pena reorganizar.
+_MIN_BASURA = 4096
+
+# Cada fila es `inicio << _BITS_LARGO | largo`: se lee y se escribe de una vez,
+# así un lector nunca combina el inicio nuevo con el largo viejo.
+_BITS_LARGO = 32
+_MASCARA_LARGO = (1 << _BITS_LARGO) - 1
+_SIN_FILA = -1
+
+
+def _tramo(fila: int) -> tuple[int, int]:
+    inicio = fila >> _BITS_LARGO
+    return inicio, inicio + (fila & _MASCARA_LARGO)
+
+
+class IndiceVertices:
+    """
+    Mapeo id <-> posición de los vértices, compartido por las adyacencias CSR
+    de un grafo. Solo crece: las posiciones de vértices eliminados no se
+    reutilizan (`GrafoContenido.compactar` arma un índice nuevo y sin huecos).
+    """
+
+    def __init__(self, ids=()):
+        self.ids: list[str] = []
+        self.posiciones: dict[str, int] = {}
+        for vertice_id in ids:
+            self.posicion(vertice_id)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def posicion(self, vertice_id) -> int:
+        """Posición del vértice, asignándole una nueva si no la tenía."""
+        posicion = self.posiciones.get(vertice_id)
+        if posicion is None:
+            posicion = len(self.ids)
+            self.posiciones[vertice_id] = posicion
+            self.ids.append(vertice_id)
+        return posicion
+
+
+class AdyacenciaCSR(MutableMapping):
+    """
+    Adyacencia id -> [(vecino_id, score)] respaldada por arrays contiguos.
+
+    Args:
+        vertices (IndiceVertices): índice de posiciones (compartido entre grafos).
+        filas (mapping, opcional): adyacencia inicial id -> lista de (vecino_id, score).
+    """
+
+    def __init__(self, vertices: IndiceVertices, filas=None):
+        self.vertices = vertices
+        # (filas, destinos, pesos) se reemplaza entero al reorganizar, así un
+        # lector siempre toma los tres de la misma versión.
+        self._estado = (array("q"), array("i"), array("f"))
+        self._cantidad = 0
+        self._basura = 0
+        for vertice_id, vecinos in (filas or {}).items():
+            self[vertice_id] = vecinos
+
+    # --- Interfaz de dict ---
+
+    def _fila(self, vertice_id, filas=None) -> int:
+        """Fila empaquetada del vértice (o `_SIN_FILA`)."""
+        filas = self._estado[0] if filas is None else filas
+        posicion = self.vertices.posiciones.get(vertice_id)
+        if posicion is None or posicion >= len(filas):
+            return _SIN_FILA
+        return filas[posicion]
+
+    def __getitem__(self, vertice_id) -> list[tuple[str, float]]:
+        filas, destinos, pesos = self._estado
+        fila = self._fila(vertice_id, filas)
+        if fila == _SIN_FILA:
+            raise KeyError(vertice_id)
+        inicio, fin = _tramo(fila)
+        ids = self.vertices.ids
+        return [
+            (ids[destino], round(peso, DECIMALES_PESO))
+            for destino, peso in zip(destinos[inicio:fin], pesos[inicio:fin])
+        ]
+
+    def __contains__(self, vertice_id):
+        return self._fila(vertice_id) != _SIN_FILA
+
+    def __setitem__(self, vertice_id, vecinos):
+        filas, destinos, pesos = self._estado
+        posicion = self.vertices.posicion(vertice_id)
+        if posicion >= len(filas):
+            filas.extend([_SIN_FILA] * (posicion + 1 - len(filas)))
+
+        # Primero los datos al final de los arrays; después se publica la fila.
+        inicio = len(destinos)
+        destinos.extend(self.vertices.posicion(vecino_id) for vecino_id, _ in vecinos)
+        pesos.extend(score for _, score in vecinos)
+        anterior = filas[posicion]
+        filas[posicion] = inicio << _BITS_LARGO | (len(destinos) - inicio)
+
+        if anterior == _SIN_FILA:
+            self._cantidad += 1
+        else:
+            self._descartar(anterior)
+
+    def __delitem__(self, vertice_id):
+        fila = self._fila(vertice_id)
+        if fila == _SIN_FILA:
+            raise KeyError(vertice_id)
+        self._estado[0][self.vertices.posiciones[vertice_id]] = _SIN_FILA
+        self._cantidad -= 1
+        self._descartar(fila)
+
+    def __iter__(self):
+        ids = self.vertices.ids
+        for posicion, fila in enumerate(self._estado[0]):
+            if fila != _SIN_FILA:
+                yield ids[posicion]
+
+    def __len__(self):
+        return self._cantidad
+
+    # --- Recorridos y estadísticas ---
+
+    def ids_vecinos(self, vertice_id) -> list[str]:
+        """Ids de los vecinos, en el orden de la fila (sin armar tuplas)."""
+        # Es lo que llama cada paso de los recorridos: `_fila` y `_tramo` van en línea.
+        filas, destinos, _ = self._estado
+        posicion = self.vertices.posiciones.get(vertice_id)
+        if posicion is None or posicion >= len(filas):
+            return []
+        fila = filas[posicion]
+        if fila == _SIN_FILA:
+            return []
+        inicio = fila >> _BITS_LARGO
+        ids = self.vertices.ids
+        return [ids[destino] for destino in destinos[inicio:inicio + (fila & _MASCARA_LARGO)]]
+
+    def cantidad_aristas(self) -> int:
+        """Entradas (vecino, score) vigentes, sin contar la basura."""
+        return len(self._estado[1]) - self._basura
+
+    def nbytes(self) -> int:
+        """Memoria de los arrays de filas, destinos y pesos (sin el índice de vértices)."""
+        return sum(datos.itemsize * len(datos) for datos in self._estado)
+
+    # --- Mantenimiento ---
+
+    def _descartar(self, fila: int):
+        self._basura += fila & _MASCARA_LARGO
+        if self._basura > _MIN_BASURA and self._basura * 2 > len(self._estado[1]):
+            self.reorganizar()
+
+    def reorganizar(self):
+        """Reescribe los arrays solo con las filas vigentes, contiguas y en orden de vértice."""
+        filas, destinos, pesos = self._estado
+        nuevas, nuevos_destinos, nuevos_pesos = array("q"), array("i"), array("f")
+        for fila in filas:
+            if fila == _SIN_FILA:
+                nuevas.append(_SIN_FILA)
+                continue
+            inicio, fin = _tramo(fila)
+            nuevas.append(len(nuevos_destinos) << _BITS_LARGO | (fin - inicio))
+            nuevos_destinos.extend(destinos[inicio:fin])
+            nuevos_pesos.extend(pesos[inicio:fin])
+        self._estado = (nuevas, nuevos_destinos, nuevos_pesos)
+        self._basura = 0
@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+
+
+class CacheLRU:
+    """
+    Caché de tamaño acotado con política LRU (se descarta el menos usado).
+    Lleva contadores de aciertos, fallos y desalojos.
+
+    Args:
+        capacidad (int): cantidad máxima de elementos. `None` = sin límite.
+    """
+
+    def __init__(self, capacidad: int | None = 10_000):
+        if capacidad is not None and capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1.")
+        self.capacidad = capacidad
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, clave):
+        return clave in self._items
+
+    def obtener(self, clave, por_defecto=None):
+        """Devuelve el valor cacheado (marcándolo como usado) o `por_defecto`."""
+        with self._lock:
+            try:
+                valor = self._items[clave]
+            except KeyError:
+                self.fallos += 1
+                return por_defecto
+            self._items.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave, valor):
+        """Guarda un valor y desaloja los menos usados si se supera la capacidad."""
+        with self._lock:
+            self._items[clave] = valor
+            self._items.move_to_end(clave)
+            if self.capacidad is not None:
+                while len(self._items) > self.capacidad:
+                    self._items.popitem(last=False)
+                    self.desalojos += 1
+
+    def descartar(self, clave):
+        """Quita una clave de la caché (si estaba)."""
+        with self._lock:
+            self._items.pop(clave, None)
+
+    def limpiar(self):
+        """Vacía la caché (los contadores se conservan)."""
+        with self._lock:
+            self._items.clear()
+
+    def estadisticas(self) -> dict:
+        """Resumen de uso: tamaño, capacidad, aciertos, fallos, desalojos y tasa de aciertos."""
+        consultas = self.aciertos + self.fallos
+        return {
+            "tamanio": len(self._items),
+            "capacidad": self.capacidad,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def __repr__(self):
+        return f"CacheLRU({self.estadisticas()})"
+
+
+class VistaContenidos(Sequence):
+    """
+    Vista perezosa, tipo secuencia, sobre los registros crudos de un catálogo.
+    Cada TDA se construye recién cuando se accede a él (índice o iteración),
+    usando la función `hidratar` (que pasa por la caché LRU del gestor).
+
+    Es una vista "viva": refleja los registros actuales del gestor.
+
+    Args:
+        registros (Sequence[dict]): registros crudos (p. ej. la lista del JSON).
+        hidratar (callable): función registro -> TDA.
+    """
+
+    def __init__(self, registros, hidratar):
+        self._registros = registros
+        self._hidratar = hidratar
+
+    def __len__(self):
+        return len(self._registros)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._hidratar(data) for data in self._registros[indice]]
+        return self._hidratar(self._registros[indice])
+
+    def __iter__(self):
+        for data in self._registros:
+            yield self._hidratar(data)
+
+    def ids(self) -> list[str]:
+        """IDs de los contenidos, sin hidratar ningún TDA."""
+        if hasattr(self._registros, "ids"):
+            # El almacén los resuelve sin decodificar los registros.
+            return self._registros.ids()
+        return [data.get("id") for data in self._registros]
+
+    def __repr__(self):
+        return f"VistaContenidos({len(self)} contenidos)"
@@ -0,0 +1,203 @@
+"""
+Generación de pares candidatos para `GrafoContenido.generar_similitud`.
+
+Un par solo puede llegar al umbral si comparte etiquetas, palabras clave,
+director o un vínculo de secuela. Con índices invertidos (rasgo -> ids) se
+enumeran únicamente esos pares, y con una cota superior por rasgo se descartan
+además los rasgos "débiles" de cada contenido:
+
+- Cota de un rasgo `f` del contenido `x` (máximo entre similares y maratón):
+    etiqueta t  -> peso_max(nivel de t) * x.etiquetas[t]   (porque min(x, y) <= x)
+    palabra     -> peso_max de palabra clave
+    director    -> peso_max de director
+- Ordenando los rasgos de `x` por cota ascendente, los más livianos cuya suma
+  no alcanza el umbral forman la "cola" de `x`: un par (x, y) que solo comparta
+  rasgos de la cola nunca llega al umbral. Por lo tanto todo par válido comparte
+  al menos un rasgo del "prefijo" de `x` (el resto), y basta recorrer los
+  postings de esos rasgos.
+
+Los pares resultantes se puntúan luego con `obtener_pesos_aristas`.
+"""
+
+from ._helpers import (
+    _MULTIPLICADORES_NIVEL,
+    _PESO_DIRECTOR,
+    _PESO_PALABRA_CLAVE,
+    _multiplicador_etiqueta,
+    _niveles_etiquetas,
+)
+
+
+# Margen para no descartar pares por errores de redondeo en la cota.
+_TOLERANCIA = 1e-9
+
+
+class IndiceCandidatos:
+    """
+    Índices invertidos etiqueta/palabra clave/director/secuela -> ids de contenido.
+
+    Args:
+        tipo (str, opcional): tipo de contenido (define los niveles de etiquetas).
+        umbral (float): puntaje mínimo de las aristas que se van a generar.
+    """
+
+    def __init__(self, tipo=None, umbral=4):
+        self.tipo = tipo
+        self.umbral = umbral
+        self._niveles = _niveles_etiquetas(tipo)
+        # Peso máximo de cada rasgo entre "similares" y "maraton", tomado de
+        # los mismos pesos que usan los scorers: la cota solo vale si coinciden.
+        self._peso_max_palabra_clave = max(_PESO_PALABRA_CLAVE.values())
+        self._peso_max_director = max(_PESO_DIRECTOR.values())
+
+        # rasgo -> set de ids que lo tienen
+        self._postings: dict[tuple, set[str]] = {}
+        # id -> rasgos del prefijo (los que pueden generar candidatos)
+        self._prefijos: dict[str, tuple] = {}
+        # id -> todos sus rasgos (para poder quitarlo de los postings)
+        self._rasgos: dict[str, tuple] = {}
+        # id de secuela -> ids que la referencian, e id -> sus secuelas
+        self._secuelas_inversas: dict[str, set[str]] = {}
+        self._secuelas: dict[str, tuple] = {}
+
+    def __len__(self):
+        return len(self._rasgos)
+
+    def __contains__(self, contenido_id):
+        return contenido_id in self._rasgos
+
+    # --- Rasgos y cotas ---
+
+    def _peso_max_etiqueta(self, tag) -> float:
+        return max(
+            _multiplicador_etiqueta(tag, algoritmo, self._niveles)
+            for algoritmo in _MULTIPLICADORES_NIVEL
+        )
+
+    def _rasgos_con_cota(self, contenido) -> list[tuple[float, tuple]]:
+        """Lista de (cota, rasgo) de un contenido."""
+        rasgos = [
+            (self._peso_max_etiqueta(tag) * valor, ("etiqueta", tag))
+            for tag, valor in contenido.etiquetas.items()
+        ]
+        rasgos.extend(
+            (self._peso_max_palabra_clave, ("clave", palabra))
+            for palabra in set(contenido.palabras_claves)
+        )
+        if hasattr(contenido, "director"):
+            rasgos.append((self._peso_max_director, ("director", contenido.director)))
+        return rasgos
+
+    def _prefijo(self, rasgos_con_cota) -> tuple:
+        """Rasgos fuera de la "cola" liviana que por sí sola no alcanza el umbral."""
+        ordenados = sorted(rasgos_con_cota, key=lambda r: r[0])
+        acumulado = 0.0
+        for k, (cota, _) in enumerate(ordenados):
+            acumulado += max(cota, 0.0)
+            if acumulado + _TOLERANCIA >= self.umbral:
+                return tuple(rasgo for _, rasgo in ordenados[k:])
+        return ()
+
+    # --- Mantenimiento ---
+
+    def agregar(self, contenido):
+        """Indexa (o reindexa) un contenido."""
+        if contenido.id in self._rasgos:
+            self.eliminar(contenido.id)
+
+        rasgos_con_cota = self._rasgos_con_cota(contenido)
+        rasgos = tuple(rasgo for _, rasgo in rasgos_con_cota)
+        for rasgo in rasgos:
+            self._postings.setdefault(rasgo, set()).add(contenido.id)
+        self._rasgos[contenido.id] = rasgos
+        self._prefijos[contenido.id] = self._prefijo(rasgos_con_cota)
+
+        secuelas = tuple(contenido.ids_secuelas or ())
+        for sec in secuelas:
+            self._secuelas_inversas.setdefault(sec, set()).add(contenido.id)
+        self._secuelas[contenido.id] = secuelas
+
+    def eliminar(self, contenido_id) -> bool:
+        """Quita un contenido de todos los índices. Devuelve False si no estaba."""
+        rasgos = self._rasgos.pop(contenido_id, None)
+        if rasgos is None:
+            return False
+
+        for rasgo in rasgos:
+            ids = self._postings.get(rasgo)
+            if ids is not None:
+                ids.discard(contenido_id)
+                if not ids:
+                    del self._postings[rasgo]
+        del self._prefijos[contenido_id]
+
+        for sec in self._secuelas.pop(contenido_id, ()):
+            ids = self._secuelas_inversas.get(sec)
+            if ids is not None:
+                ids.discard(contenido_id)
+                if not ids:
+                    del self._secuelas_inversas[sec]
+        return True
+
+    # --- Consultas ---
+
+    def candidatos(self, contenido) -> set[str]:
+        """
+        Ids indexados que pueden formar con `contenido` una arista >= umbral
+        (el propio contenido queda excluido). Sirve también para contenidos
+        que todavía no fueron indexados.
+        """
+        if contenido.id in self._prefijos:
+            prefijo = self._prefijos[contenido.id]
+            secuelas = self._secuelas[contenido.id]
+        else:
+            prefijo = self._prefijo(self._rasgos_con_cota(contenido))
+            secuelas = tuple(contenido.ids_secuelas or ())
+
+        resultado = set()
+        for rasgo in prefijo:
+            resultado.update(self._postings.get(rasgo, ()))
+
+        # Secuelas en ambos sentidos
+        resultado.update(sec for sec in secuelas if sec in self._rasgos)
+        resultado.update(self._secuelas_inversas.get(contenido.id, ()))
+
+        resultado.discard(contenido.id)
+        return resultado
+
+    def referencian(self, contenido_id) -> set[str]:
+        """Ids indexados que tienen a `contenido_id` entre sus secuelas."""
+        return set(self._secuelas_inversas.get(contenido_id, ()))
+
+    def costo_estimado(self) -> int:
+        """Cota de pares a recorrer por `pares` (suma de postings de los prefijos)."""
+        return sum(
+            len(self._postings.get(rasgo, ()))
+            for prefijo in self._prefijos.values()
+            for rasgo in prefijo
+        )
+
+    def pares(self, ids: list[str], desde: int = 0, hasta: int | None = None) -> list[tuple[int, int]]:
+        """
+        Pares candidatos (i, j), con i < j posiciones en `ids`, ordenados como
+        el doble bucle de `generar_similitud`. Con `desde`/`hasta` solo los de
+        las filas i en [desde, hasta) (para repartir el trabajo por tramos).
+        """
+        posicion = {contenido_id: k for k, contenido_id in enumerate(ids)}
+        pares = set()
+        hasta = len(ids) if hasta is None else hasta
+        for i in range(desde, hasta):
+            contenido_id = ids[i]
+            vecinos = set()
+            for rasgo in self._prefijos.get(contenido_id, ()):
+                vecinos.update(self._postings.get(rasgo, ()))
+            vecinos.update(self._secuelas.get(contenido_id, ()))
+            vecinos.update(self._secuelas_inversas.get(contenido_id, ()))
+
+            for vecino in vecinos:
+                j = posicion.get(vecino)
+                # Todo par válido comparte un rasgo del prefijo de su extremo
+                # menor, así que basta con generarlo desde ese lado.
+                if j is not None and j > i:
+                    pares.add((i, j))
+        return sorted(pares)
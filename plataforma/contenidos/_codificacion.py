@@ -0,0 +1,93 @@
+"""
+Codificación de rasgos (etiquetas y palabras clave) a enteros para los scorers.
+
+`_calcular_pesos_similares` y `_calcular_pesos_maraton` comparan pares de
+contenidos: con textos, cada par arma sets y hashea todas sus etiquetas y
+palabras clave. Aquí cada texto recibe UNA vez un id entero y cada contenido
+guarda su codificación:
+
+- palabras clave -> bitset (un `int` de Python con el bit `id` encendido):
+  las coincidencias de un par son `(bits_a & bits_b).bit_count()`.
+- etiquetas -> ids ordenados (con sus valores en el mismo orden): las
+  etiquetas comunes salen de una intersección por mezcla (merge) de dos listas.
+
+La codificación se calcula en el primer puntaje de cada contenido y queda en
+el TDA (slot `_codificacion`); si luego se reemplazan sus etiquetas o palabras
+clave, se recalcula sola.
+"""
+
+
+class CodificadorRasgos:
+    """Asigna ids enteros (0, 1, 2, ...) a etiquetas y palabras clave, en orden de aparición."""
+
+    def __init__(self):
+        self.etiquetas: dict[str, int] = {}
+        self.palabras_claves: dict[str, int] = {}
+
+    def id_etiqueta(self, tag: str) -> int:
+        return self.etiquetas.setdefault(tag, len(self.etiquetas))
+
+    def id_palabra_clave(self, palabra: str) -> int:
+        return self.palabras_claves.setdefault(palabra, len(self.palabras_claves))
+
+    def codificar(self, etiquetas, palabras_claves) -> tuple:
+        """
+        Devuelve `(etiquetas, palabras_claves, bits, ids_etiquetas, valores_etiquetas)`.
+        Los dos primeros son las colecciones codificadas (para detectar si cambiaron).
+        """
+        bits = 0
+        for palabra in palabras_claves or ():
+            bits |= 1 << self.id_palabra_clave(palabra)
+
+        pares = sorted(
+            (self.id_etiqueta(tag), valor) for tag, valor in (etiquetas or {}).items()
+        )
+        ids = tuple(tag_id for tag_id, _ in pares)
+        valores = tuple(valor for _, valor in pares)
+        return (etiquetas, palabras_claves, bits, ids, valores)
+
+
+# Codificador único: los ids son comparables entre todos los contenidos.
+CODIFICADOR = CodificadorRasgos()
+
+
+def codificacion(contenido) -> tuple:
+    """
+    Codificación `(…, bits, ids_etiquetas, valores_etiquetas)` de un contenido,
+    guardada en el TDA para los próximos puntajes.
+    """
+    cod = getattr(contenido, "_codificacion", None)
+    if (
+        cod is not None
+        and cod[0] is contenido.etiquetas
+        and cod[1] is contenido.palabras_claves
+    ):
+        return cod
+
+    cod = CODIFICADOR.codificar(contenido.etiquetas, contenido.palabras_claves)
+    try:
+        contenido._codificacion = cod
+    except AttributeError:
+        # Objetos que no son TDA de la plataforma: se codifica en cada llamada.
+        pass
+    return cod
+
+
+def sumar_etiquetas_comunes(peso, ids_a, valores_a, ids_b, valores_b, multiplicadores) -> float:
+    """
+    Suma a `peso` el aporte `min(valor_a, valor_b) * multiplicador` de cada
+    etiqueta común, recorriendo a la vez las dos listas de ids ordenadas.
+    """
+    i, j = 0, 0
+    n_a, n_b = len(ids_a), len(ids_b)
+    while i < n_a and j < n_b:
+        tag_a, tag_b = ids_a[i], ids_b[j]
+        if tag_a == tag_b:
+            peso += min(valores_a[i], valores_b[j]) * multiplicadores[tag_a]
+            i += 1
+            j += 1
+        elif tag_a < tag_b:
+            i += 1
+        else:
+            j += 1
+    return peso
@@ -1,54 +1,67 @@
 import json
+from collections import deque
+from ..persistencia import iterar_registros_json
+from ._codificacion import CODIFICADOR, codificacion, sumar_etiquetas_comunes
 
 
-class Pila:
+class _Contenedor:
+    """
+    Base de `Pila` y `Cola`: un `deque` (apilar/encolar y sacar en O(1)) más un
+    contador de apariciones, para que `in` sea O(1) en vez de recorrer los
+    elementos. Se cuentan las apariciones porque un mismo elemento puede estar
+    más de una vez (p. ej. el DFS apila un vecino por cada camino que lo alcanza).
+    """
+
     def __init__(self):
-        self._items = []
+        self._items = deque()
+        self._cantidades = {}
 
     def esta_vacia(self):
         return not self._items
 
-    def apilar(self, item):
+    def _agregar(self, item):
         self._items.append(item)
+        self._cantidades[item] = self._cantidades.get(item, 0) + 1
 
-    def desapilar(self):
-        if not self.esta_vacia():
-            return self._items.pop()
-        raise IndexError("pop from empty stack")
+    def _descontar(self, item):
+        restantes = self._cantidades[item] - 1
+        if restantes:
+            self._cantidades[item] = restantes
+        else:
+            del self._cantidades[item]
+        return item
+
+    # Implementación necesaria para verificar si un elemento ya está en la pila/cola
+    def __contains__(self, item):
+        return item in self._cantidades
+
+    def __len__(self):
+        return len(self._items)
 
     def __iter__(self):
-        return iter(self.items)
+        return iter(self._items)
 
-    # Implementación necesaria para verificar si un elemento ya está en la pila
-    def __contains__(self, item):
-        return item in self._items
 
+class Pila(_Contenedor):
+    def apilar(self, item):
+        self._agregar(item)
 
-class Cola:
-    def __init__(self):
-        # Usamos una lista para simplicidad, pero para grandes volúmenes
-        # (que no es tu caso), se debería usar collections.deque
-        self._items = []
+    def desapilar(self):
+        if not self.esta_vacia():
+            return self._descontar(self._items.pop())
+        raise IndexError("pop from empty stack")
 
-    def esta_vacia(self):
-        return not self._items
 
+class Cola(_Contenedor):
     def encolar(self, item):
-        self._items.append(item)
+        self._agregar(item)
 
     def desencolar(self):
         if not self.esta_vacia():
-            # Desencolar es el primer elemento (índice 0)
-            return self._items.pop(0)
+            # Desencolar es el primer elemento (O(1) en un deque)
+            return self._descontar(self._items.popleft())
         raise IndexError("dequeue from empty queue")
 
-    # Implementación necesaria para verificar si un elemento ya está en la cola
-    def __contains__(self, item):
-        return item in self._items
-
-    def __iter__(self):
-        return iter(self.items)
-
 
 def _obtener_etiquetas_predefinidas(tipo):
     """
@@ -91,6 +104,62 @@ def _obtener_etiquetas_predefinidas(tipo):
     return etiquetas_peso_alto, etiquetas_peso_medio, etiquetas_peso_bajo
 
 
+# Multiplicador de cada nivel de etiqueta por algoritmo, en el orden en que se
+# evalúan los niveles (una etiqueta toma el primero que la contiene).
+_MULTIPLICADORES_NIVEL = {
+    # Similares (BFS): 🚀 ORO el género principal, PLATA, 🐌 BRONCE el formato.
+    "similares": (("alto", 5.0), ("medio", 2.5), ("bajo", 0.5)),
+    # Maratón (DFS): 🚀 ORO la coherencia de estilo/tono, PLATA, 🐌 BRONCE el género.
+    "maraton": (("bajo", 5.0), ("medio", 2.5), ("alto", 0.5)),
+}
+_MULTIPLICADOR_OTRAS = 1.0
+
+# Peso de cada coincidencia de director y de palabra clave, por algoritmo, y
+# de un vínculo de secuela (reemplaza a todo lo demás).
+_PESO_DIRECTOR = {"similares": 2.0, "maraton": 0.5}
+_PESO_PALABRA_CLAVE = {"similares": 2.0, "maraton": 5.0}
+_PESO_SECUELA = 100.0
+
+# Decimales de los scores. Todos los motores (escalar, vectorizado, paralelo)
+# redondean igual, así el grafo no depende del motor ni del orden en que se
+# sumaron los flotantes.
+DECIMALES = 9
+
+# (tipo, algoritmo) -> lista id de etiqueta -> multiplicador
+_multiplicadores = {}
+
+
+def _niveles_etiquetas(tipo) -> dict[str, set[str]]:
+    """Etiquetas predefinidas de un tipo de contenido, por nivel ("alto", "medio", "bajo")."""
+    alto, medio, bajo = _obtener_etiquetas_predefinidas(tipo=tipo)
+    return {"alto": alto, "medio": medio, "bajo": bajo}
+
+
+def _multiplicador_etiqueta(tag, algoritmo, niveles) -> float:
+    """
+    Multiplicador de una etiqueta en un algoritmo: el del primer nivel que la
+    contiene, en el orden de `_MULTIPLICADORES_NIVEL` (fuente única de los
+    pesos de etiquetas para todos los motores y para la cota de candidatos).
+    """
+    return next(
+        (mult for nivel, mult in _MULTIPLICADORES_NIVEL[algoritmo] if tag in niveles[nivel]),
+        _MULTIPLICADOR_OTRAS,
+    )
+
+
+def _multiplicadores_etiquetas(tipo, algoritmo) -> list[float]:
+    """
+    Multiplicador de cada etiqueta (indexado por su id en `CODIFICADOR`) para
+    un tipo de contenido y un algoritmo. Se extiende al aparecer etiquetas nuevas.
+    """
+    lista = _multiplicadores.setdefault((tipo, algoritmo), [])
+    if len(lista) < len(CODIFICADOR.etiquetas):
+        niveles = _niveles_etiquetas(tipo)
+        for tag in list(CODIFICADOR.etiquetas)[len(lista):]:
+            lista.append(_multiplicador_etiqueta(tag, algoritmo, niveles))
+    return lista
+
+
 def _calcular_pesos_maraton(a, b, tipo=None):
     """
     Calcula el peso de similitud para rutas de 'Maratón Temático' (DFS).
@@ -100,38 +169,25 @@ def _calcular_pesos_maraton(a, b, tipo=None):
     
     # 1. SECUELAS (Máxima prioridad)
     if b.id in a.ids_secuelas or a.id in b.ids_secuelas:
-        return 100.0
+        return _PESO_SECUELA
 
     # 2. DIRECTOR (Menos importante para la inmersión temática)
     if hasattr(a, "director") and a.director == b.director:
-        peso += 0.5 # Valor nominal
+        peso += _PESO_DIRECTOR["maraton"] # Valor nominal
 
     # --- ETIQUETAS PREDEFINIDAS ---
-    ETIQUETAS_ALTO_PESO, ETIQUETAS_MEDIO_PESO, ETIQUETAS_BAJO_PESO = _obtener_etiquetas_predefinidas(tipo=tipo)
-    etiquetas_comunes = set(a.etiquetas.keys()) & set(b.etiquetas.keys())
-
-    for tag in etiquetas_comunes:
-        valor_base = min(a.etiquetas.get(tag, 0), b.etiquetas.get(tag, 0))
-
-        if tag in ETIQUETAS_BAJO_PESO:
-            # 🚀 Nivel ORO Maratón: Coherencia de Estilo/Tono es crucial para el DFS.
-            peso += valor_base * 5.0
-        
-        elif tag in ETIQUETAS_MEDIO_PESO:
-            # Nivel PLATA.
-            peso += valor_base * 2.5
-            
-        elif tag in ETIQUETAS_ALTO_PESO:
-            # 🐌 Nivel BRONCE: Reducimos el peso de Género principal para explorar.
-            peso += valor_base * 0.5
-        
-        else:
-            peso += valor_base * 1.0
+    # (niveles ORO/PLATA/BRONCE por etiqueta: ver `_MULTIPLICADORES_NIVEL`)
+    cod_a, cod_b = codificacion(a), codificacion(b)
+    peso = sumar_etiquetas_comunes(
+        peso, cod_a[3], cod_a[4], cod_b[3], cod_b[4],
+        _multiplicadores_etiquetas(tipo, "maraton"),
+    )
 
     # 3. PALABRAS CLAVE (CRÍTICO para la profundidad temática)
-    comunes_keywords = set(a.palabras_claves) & set(b.palabras_claves)
+    # (bitsets: las palabras comunes son los bits encendidos en ambos)
+    comunes_keywords = (cod_a[2] & cod_b[2]).bit_count()
     # 🚀 Aumentamos el peso: Asegura que el DFS siga una línea narrativa o subtema fuerte.
-    peso += 5.0 * len(comunes_keywords) 
+    peso += _PESO_PALABRA_CLAVE["maraton"] * comunes_keywords
 
     return peso
 
@@ -144,37 +200,23 @@ def _calcular_pesos_similares(a, b, tipo=None):
     
     # 1. SECUELAS (Máxima prioridad)
     if b.id in a.ids_secuelas or a.id in b.ids_secuelas:
-        return 100.0
+        return _PESO_SECUELA
 
     # 2. DIRECTOR (El toque personal - importante para afinidad general)
     if hasattr(a, "director") and a.director == b.director:
-        peso += 2.0 # Subimos un poco el peso del director
+        peso += _PESO_DIRECTOR["similares"] # Subimos un poco el peso del director
 
     # --- ETIQUETAS PREDEFINIDAS ---
-    ETIQUETAS_ALTO_PESO, ETIQUETAS_MEDIO_PESO, ETIQUETAS_BAJO_PESO = _obtener_etiquetas_predefinidas(tipo=tipo)
-    etiquetas_comunes = set(a.etiquetas.keys()) & set(b.etiquetas.keys())
-
-    for tag in etiquetas_comunes:
-        valor_base = min(a.etiquetas.get(tag, 0), b.etiquetas.get(tag, 0))
-
-        if tag in ETIQUETAS_ALTO_PESO:
-            # 🚀 Nivel ORO: Lo más importante para el BFS de afinidad.
-            peso += valor_base * 5.0
-
-        elif tag in ETIQUETAS_MEDIO_PESO:
-            # Nivel PLATA.
-            peso += valor_base * 2.5
-
-        elif tag in ETIQUETAS_BAJO_PESO:
-            # 🐌 Nivel BRONCE: Poca importancia en la similitud inmediata.
-            peso += valor_base * 0.5
-        
-        else:
-            peso += valor_base * 1.0
+    # (niveles ORO/PLATA/BRONCE por etiqueta: ver `_MULTIPLICADORES_NIVEL`)
+    cod_a, cod_b = codificacion(a), codificacion(b)
+    peso = sumar_etiquetas_comunes(
+        peso, cod_a[3], cod_a[4], cod_b[3], cod_b[4],
+        _multiplicadores_etiquetas(tipo, "similares"),
+    )
 
     # 3. PALABRAS CLAVE (Refuerzo, pero no dominante)
-    comunes_keywords = set(a.palabras_claves) & set(b.palabras_claves)
-    peso += 2.0 * len(comunes_keywords) 
+    comunes_keywords = (cod_a[2] & cod_b[2]).bit_count()
+    peso += _PESO_PALABRA_CLAVE["similares"] * comunes_keywords
 
     return peso
 
@@ -204,7 +246,8 @@ def obtener_pesos_aristas(a, b, tipo=None, algoritmo=None):
     Returns
     -------
     float
-        Peso de la arista (valor de similitud) entre los contenidos, normalmente entre 0.0 y 1.0.
+        Peso de la arista (valor de similitud) entre los contenidos, redondeado
+        a `DECIMALES` decimales.
     """
     peso = 0
 
@@ -212,7 +255,7 @@ def obtener_pesos_aristas(a, b, tipo=None, algoritmo=None):
         peso = _calcular_pesos_similares(a, b, tipo)
     if algoritmo == "maraton":
         peso = _calcular_pesos_maraton(a, b, tipo)
-    return peso
+    return round(peso, DECIMALES)
 
 
 def _obtener_path(tipo: str):
@@ -238,14 +281,18 @@ def obtener_contenido(tipo):
 
     """
 
-    path = _obtener_path(tipo)
+    # Catálogo global (leído registro a registro, sin armar el documento entero)
+    return list(iterar_contenido(tipo))
+
 
-    # Catálogo global
-    with open(path, encoding="utf8") as f:
-        data = json.load(f)
-        catalogo_pelis = data[tipo]
+def iterar_contenido(tipo):
+    """Genera los contenidos (diccionarios) de un tipo de a uno, leyendo el JSON en streaming.
 
-    return catalogo_pelis
+    Args:
+        tipo (str): "películas", "documentales" o "series"
+    """
+    path = _obtener_path(tipo)
+    yield from iterar_registros_json(path, tipo)
 
 
 def guardar_contenido(tipo, contenido, path):
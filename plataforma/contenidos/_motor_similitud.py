@@ -0,0 +1,310 @@
+"""
+Motor vectorizado (NumPy) para calcular los pesos de similitud de todo un catálogo.
+
+Reemplaza el doble bucle de `GrafoContenido.generar_similitud`, que llama a
+`obtener_pesos_aristas` dos veces por par, por operaciones por bloques de filas:
+
+- Etiquetas: índice invertido etiqueta -> contenidos, con el valor de cada
+  contenido en la etiqueta. Cada etiqueta compartida aporta
+  `min(a, b) · multiplicador` (por algoritmo), sumado con `np.bincount`.
+- Palabras clave y director: conteo de coincidencias con índices invertidos.
+- Secuelas: se sobrescriben con 100.0 al final, igual que los scorers escalares.
+
+En todos los casos solo se recorren las coincidencias reales (`np.bincount`
+sobre los postings): la memoria es proporcional a los rasgos del catálogo y al
+bloque de resultados, nunca a n × (etiquetas distintas).
+
+Los resultados coinciden con `obtener_pesos_aristas`: la suma en punto flotante
+puede ir en otro orden, pero ambos redondean los puntajes a `DECIMALES`
+decimales antes de aplicar el umbral.
+"""
+
+import importlib.util
+from ._helpers import (
+    DECIMALES,
+    _PESO_DIRECTOR,
+    _PESO_PALABRA_CLAVE,
+    _PESO_SECUELA,
+    _multiplicador_etiqueta,
+    _niveles_etiquetas,
+)
+
+
+# NumPy es opcional (sin él se usa el cálculo por pares) y se importa recién al
+# crear el primer `MotorSimilitud`: importarlo cuesta más que todo el paquete y
+# la mayoría de los procesos nunca construye un grafo denso.
+NUMPY_DISPONIBLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+
+def _importar_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+# Los pesos (etiquetas, director, palabras clave, secuelas) se leen de
+# `_helpers` al calcular, los mismos que usan los scorers escalares.
+ALGORITMOS = ("similares", "maraton")
+
+# Tamaño máximo (en celdas) de cada bloque de resultados parciales.
+_CELDAS_POR_BLOQUE = 4_000_000
+# Máximo de coincidencias (rasgo compartido por un par) que se expanden por
+# bloque: cada una ocupa varios arrays temporales de 8 bytes.
+_COINCIDENCIAS_POR_BLOQUE = 1_000_000
+
+
+def _indice_invertido(listas, n, vocabulario=None):
+    """
+    Convierte `listas[i] = [claves del contenido i]` en dos CSR:
+    contenido -> claves y clave -> contenidos (ordenados por índice).
+    Si se pasa `vocabulario` (dict), queda con el id de cada clave.
+    """
+    vocabulario = {} if vocabulario is None else vocabulario
+    filas, cols = [], []
+    for i, claves in enumerate(listas):
+        for clave in claves:
+            filas.append(i)
+            cols.append(vocabulario.setdefault(clave, len(vocabulario)))
+
+    filas = np.asarray(filas, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+
+    # contenido -> claves (ya viene ordenado por fila)
+    ptr_items = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(ptr_items, filas + 1, 1)
+    ptr_items = np.cumsum(ptr_items)
+
+    # clave -> contenidos (orden estable: índices crecientes)
+    orden = np.argsort(cols, kind="stable")
+    items_por_clave = filas[orden]
+    ptr_claves = np.zeros(len(vocabulario) + 1, dtype=np.int64)
+    np.add.at(ptr_claves, cols + 1, 1)
+    ptr_claves = np.cumsum(ptr_claves)
+
+    return ptr_items, cols, ptr_claves, items_por_clave
+
+
+def _costo_por_item(indice):
+    """Coincidencias que expande cada contenido: la suma de los postings de sus claves."""
+    ptr_items, claves, ptr_claves, _ = indice
+    n = len(ptr_items) - 1
+    filas = np.repeat(np.arange(n), np.diff(ptr_items))
+    return np.bincount(filas, weights=np.diff(ptr_claves)[claves], minlength=n)
+
+
+def _expandir(inicios, largos):
+    """Concatena los rangos [inicio, inicio + largo) sin bucles de Python."""
+    total = int(largos.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    desplazamientos = np.cumsum(largos) - largos
+    return np.repeat(inicios - desplazamientos, largos) + np.arange(total)
+
+
+class MotorSimilitud:
+    """
+    Codifica una lista de contenidos y calcula, por bloques, las aristas de
+    "similares" y "maraton" que superan el umbral.
+
+    Args:
+        contenidos (list[ContenidoBase]): contenidos en el orden de los vértices.
+        tipo (str): 'peliculas', 'documentales' o 'series' (define los niveles de etiquetas).
+    """
+
+    def __init__(self, contenidos, tipo=None):
+        if not NUMPY_DISPONIBLE:
+            raise ImportError("MotorSimilitud requiere NumPy instalado.")
+        _importar_numpy()
+
+        self.contenidos = list(contenidos)
+        self.tipo = tipo
+        self.n = len(self.contenidos)
+        self._codificar()
+
+    # --- Codificación ---
+
+    def _codificar(self):
+        n = self.n
+        niveles = _niveles_etiquetas(self.tipo)
+
+        # 1. Etiquetas -> contenidos, con el valor de cada contenido en ambos
+        # órdenes del índice (el de cada contenido y el de cada etiqueta).
+        etiquetas = [c.etiquetas for c in self.contenidos]
+        vocabulario = {}
+        self._etiquetas = _indice_invertido(etiquetas, n, vocabulario)
+        valores = np.fromiter(
+            (valor for tags in etiquetas for valor in tags.values()), dtype=np.float64
+        )
+        orden = np.argsort(self._etiquetas[1], kind="stable")
+        self._valores_etiquetas = (valores, valores[orden])
+        # Multiplicador de cada etiqueta por algoritmo: (2, etiquetas), en el orden de `ALGORITMOS`
+        self._pesos_etiquetas = np.array(
+            [[_multiplicador_etiqueta(tag, alg, niveles) for tag in vocabulario] for alg in ALGORITMOS],
+            dtype=np.float64,
+        ).reshape(len(ALGORITMOS), len(vocabulario))
+
+        # 2. Palabras clave (conjuntos, como en los scorers)
+        self._claves = _indice_invertido(
+            [set(c.palabras_claves) for c in self.contenidos], n
+        )
+
+        # 3. Director: solo cuenta si el contenido tiene el atributo
+        self._directores = _indice_invertido(
+            [(c.director,) if hasattr(c, "director") else () for c in self.contenidos],
+            n,
+        )
+
+        # 4. Secuelas: pares (i, j) con i < j, ordenados por i
+        posicion = {c.id: i for i, c in enumerate(self.contenidos)}
+        pares = set()
+        for i, c in enumerate(self.contenidos):
+            for sec in c.ids_secuelas or ():
+                j = posicion.get(sec)
+                if j is not None and j != i:
+                    pares.add((min(i, j), max(i, j)))
+        pares = sorted(pares)
+        self._secuelas = (
+            np.array([i for i, _ in pares], dtype=np.int64),
+            np.array([j for _, j in pares], dtype=np.int64),
+        )
+
+    # --- Cálculo ---
+
+    def _coincidencias(self, indice, inicio, fin, pesos=None, valores=None):
+        """
+        Matriz (fin-inicio, n-inicio) con la cantidad de claves compartidas.
+        Con `pesos` (k, claves) y `valores` (los de `_valores_etiquetas`), en
+        cambio, suma `peso · min(valor_a, valor_b)` de cada clave compartida y
+        devuelve k matrices: (k, fin-inicio, n-inicio).
+        """
+        ptr_items, claves, ptr_claves, items_por_clave = indice
+        alto_bloque, ancho = fin - inicio, self.n - inicio
+
+        a, b = ptr_items[inicio], ptr_items[fin]
+        if a == b:
+            if pesos is None:
+                return np.zeros((alto_bloque, ancho), dtype=np.int64)
+            return np.zeros((len(pesos), alto_bloque, ancho), dtype=np.float64)
+
+        claves_bloque = claves[a:b]
+        filas_bloque = np.repeat(
+            np.arange(alto_bloque), np.diff(ptr_items[inicio:fin + 1])
+        )
+        inicios = ptr_claves[claves_bloque]
+        largos = ptr_claves[claves_bloque + 1] - inicios
+
+        expandidos = _expandir(inicios, largos)
+        vecinos = items_por_clave[expandidos]
+        filas = np.repeat(filas_bloque, largos)
+        mascara = vecinos >= inicio
+        posiciones = filas[mascara] * ancho + (vecinos[mascara] - inicio)
+        if pesos is None:
+            cuenta = np.bincount(posiciones, minlength=alto_bloque * ancho)
+            return cuenta.reshape(alto_bloque, ancho)
+
+        compartidas = np.repeat(claves_bloque, largos)[mascara]
+        valores_items, valores_por_clave = valores
+        minimos = np.minimum(
+            np.repeat(valores_items[a:b], largos)[mascara],
+            valores_por_clave[expandidos[mascara]],
+        )
+        return np.stack([
+            np.bincount(
+                posiciones, weights=pesos_clave[compartidas] * minimos,
+                minlength=alto_bloque * ancho,
+            ).reshape(alto_bloque, ancho)
+            for pesos_clave in pesos
+        ])
+
+    def puntajes_bloque(self, inicio, fin):
+        """
+        Devuelve los puntajes de las filas [inicio, fin) contra las columnas
+        [inicio, n), para ambos algoritmos: ndarray (2, B, n-inicio) en el
+        orden de `ALGORITMOS`.
+        """
+        # Etiquetas compartidas, ponderadas para ambos algoritmos
+        puntajes = self._coincidencias(
+            self._etiquetas, inicio, fin, self._pesos_etiquetas, self._valores_etiquetas
+        )
+
+        claves = self._coincidencias(self._claves, inicio, fin)
+        directores = self._coincidencias(self._directores, inicio, fin)
+
+        for k, alg in enumerate(ALGORITMOS):
+            puntajes[k] += _PESO_PALABRA_CLAVE[alg] * claves
+            puntajes[k] += _PESO_DIRECTOR[alg] * directores
+
+        # Secuelas del bloque (sobrescriben el puntaje calculado)
+        desde, hasta = np.searchsorted(self._secuelas[0], [inicio, fin])
+        filas = self._secuelas[0][desde:hasta] - inicio
+        cols = self._secuelas[1][desde:hasta] - inicio
+        puntajes[:, filas, cols] = _PESO_SECUELA
+
+        return puntajes
+
+    def aristas(self, umbral=4):
+        """
+        Calcula las aristas (i, j, puntaje) con i < j y puntaje >= umbral.
+        Las aristas salen ordenadas por (i, j), el mismo orden del doble bucle.
+
+        Returns:
+            dict[str, list[tuple[int, int, float]]]: aristas por algoritmo.
+        """
+        aristas = {alg: [] for alg in ALGORITMOS}
+        for bloque in self.bloques_aristas(umbral):
+            for alg, lista in bloque.items():
+                aristas[alg].extend(lista)
+        return aristas
+
+    def bloques_aristas(self, umbral=4):
+        """
+        Como `aristas`, pero genera las de cada bloque de filas por separado,
+        para quien las consume sin juntarlas todas en memoria.
+
+        Yields:
+            dict[str, list[tuple[int, int, float]]]: aristas del bloque por algoritmo.
+        """
+        if self.n < 2:
+            return
+
+        # Tolerancia para no perder pares por el orden de la suma flotante;
+        # el umbral definitivo se aplica sobre el puntaje redondeado con
+        # `round`, igual que `obtener_pesos_aristas`.
+        tolerancia = 10 ** -DECIMALES
+        for inicio, fin in self._bloques():
+            puntajes = self.puntajes_bloque(inicio, fin)
+            bloque = {}
+            for k, alg in enumerate(ALGORITMOS):
+                matriz = puntajes[k]
+                # Solo el triángulo superior estricto (j > i)
+                filas, cols = np.nonzero(np.triu(matriz >= umbral - tolerancia, k=1))
+                aristas = []
+                for i, j, valor in zip(
+                    (filas + inicio).tolist(), (cols + inicio).tolist(), matriz[filas, cols].tolist()
+                ):
+                    valor = round(valor, DECIMALES)
+                    if valor >= umbral:
+                        aristas.append((i, j, valor))
+                bloque[alg] = aristas
+            yield bloque
+
+    def _bloques(self):
+        """
+        Cortes [inicio, fin) de filas tales que cada bloque tenga a lo sumo
+        `_CELDAS_POR_BLOQUE` celdas de resultados y `_COINCIDENCIAS_POR_BLOQUE`
+        coincidencias expandidas (siempre al menos una fila).
+        """
+        costo = sum(
+            _costo_por_item(indice) for indice in (self._etiquetas, self._claves, self._directores)
+        )
+        inicio = 0
+        while inicio < self.n:
+            alto_maximo = max(1, _CELDAS_POR_BLOQUE // (self.n - inicio))
+            acumulado = np.cumsum(costo[inicio:inicio + alto_maximo])
+            alto = max(1, int(np.searchsorted(acumulado, _COINCIDENCIAS_POR_BLOQUE, side="right")))
+            fin = min(self.n, inicio + alto)
+            yield inicio, fin
+            inicio = fin
@@ -0,0 +1,117 @@
+"""
+Puntaje de pares en paralelo para `GrafoContenido.generar_similitud`.
+
+El espacio de pares (i, j), i < j, se reparte por tramos de filas [desde,
+hasta) con aproximadamente la misma cantidad de pares cada uno (las primeras
+filas tienen más). Cada proceso recibe los contenidos una sola vez (al
+iniciarse) y puntúa sus tramos con `obtener_pesos_aristas`, igual que el motor
+serial: todos los pares ("pares") o solo los candidatos de `IndiceCandidatos`
+("indice").
+
+Los tramos se devuelven en orden (`Executor.map`), así que las aristas llegan
+ordenadas por (i, j), exactamente como en el motor serial: el grafo resultante
+(incluidos los desempates y el límite k) es el mismo.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from bisect import bisect_left
+
+from ._codificacion import CODIFICADOR, codificacion
+from ._helpers import obtener_pesos_aristas
+
+
+# Tramos por trabajador: más de uno para repartir mejor la carga.
+TRAMOS_POR_TRABAJADOR = 4
+
+# Estado de cada proceso trabajador (lo carga `_iniciar_trabajador`).
+_trabajador = {}
+
+
+def tramos_de_filas(n: int, cantidad: int) -> list[tuple[int, int]]:
+    """
+    Divide las filas 0..n-1 en hasta `cantidad` tramos contiguos con
+    aproximadamente la misma cantidad de pares (la fila i tiene n-1-i).
+    """
+    if n < 2 or cantidad < 1:
+        return [(0, n)] if n else []
+    acumulados = list(accumulate(n - 1 - i for i in range(n)))
+    total = acumulados[-1]
+    cortes = [0]
+    for parte in range(1, cantidad):
+        corte = bisect_left(acumulados, total * parte / cantidad) + 1
+        if cortes[-1] < corte < n:
+            cortes.append(corte)
+    cortes.append(n)
+    return list(zip(cortes, cortes[1:]))
+
+
+def _iniciar_trabajador(contenidos, tipo, umbral, indice, tablas_codificador):
+    if tablas_codificador is not None:
+        # Sin "fork", los contenidos llegan con la codificación del proceso
+        # principal: el `CODIFICADOR` de este proceso debe usar los mismos ids
+        # (el orden de los ids define el orden de las sumas de cada score).
+        CODIFICADOR.etiquetas, CODIFICADOR.palabras_claves = tablas_codificador
+    _trabajador.update(
+        contenidos=contenidos,
+        ids=[contenido.id for contenido in contenidos],
+        tipo=tipo,
+        umbral=umbral,
+        indice=indice,
+    )
+
+
+def _puntuar_tramo(desde: int, hasta: int) -> dict[str, list[tuple[int, int, float]]]:
+    """Aristas (i, j, score) >= umbral de las filas [desde, hasta), por algoritmo."""
+    contenidos, tipo, umbral = _trabajador["contenidos"], _trabajador["tipo"], _trabajador["umbral"]
+    indice = _trabajador["indice"]
+    n = len(contenidos)
+    if indice is None:
+        pares = ((i, j) for i in range(desde, hasta) for j in range(i + 1, n))
+    else:
+        pares = indice.pares(_trabajador["ids"], desde, hasta)
+
+    similares, maraton = [], []
+    for i, j in pares:
+        a, b = contenidos[i], contenidos[j]
+        score_similares = obtener_pesos_aristas(a, b, tipo, "similares")
+        score_maraton = obtener_pesos_aristas(a, b, tipo, "maraton")
+        if score_similares >= umbral and a.id != b.id:
+            similares.append((i, j, score_similares))
+        if score_maraton >= umbral and a.id != b.id:
+            maraton.append((i, j, score_maraton))
+    return {"similares": similares, "maraton": maraton}
+
+
+def puntuar_en_paralelo(contenidos: list, tipo, umbral, trabajadores: int, indice=None):
+    """
+    Genera, tramo por tramo y en orden, las aristas `{algoritmo: [(i, j, score)]}`
+    de `contenidos` (posiciones en esa lista), puntuadas en `trabajadores` procesos.
+
+    Args:
+        contenidos (list): vértices del grafo, en el orden de sus posiciones.
+        tipo (str): tipo de contenido (define los niveles de etiquetas).
+        umbral (float): puntaje mínimo de una arista.
+        trabajadores (int): procesos a usar.
+        indice (IndiceCandidatos, opcional): si se pasa, solo se puntúan sus
+            pares candidatos; si no, todos los pares.
+    """
+    from ..carga_paralela import contexto_procesos
+
+    # Se codifica todo antes de repartir: cada trabajador recibe la misma
+    # codificación en vez de rehacerla por su cuenta.
+    for contenido in contenidos:
+        codificacion(contenido)
+    contexto = contexto_procesos()
+    tablas = None
+    if contexto.get_start_method() != "fork":
+        tablas = (CODIFICADOR.etiquetas, CODIFICADOR.palabras_claves)
+    tramos = tramos_de_filas(len(contenidos), trabajadores * TRAMOS_POR_TRABAJADOR)
+    with ProcessPoolExecutor(
+        trabajadores,
+        mp_context=contexto,
+        initializer=_iniciar_trabajador,
+        initargs=(contenidos, tipo, umbral, indice, tablas),
+    ) as pool:
+        desdes, hastas = zip(*tramos) if tramos else ((), ())
+        yield from pool.map(_puntuar_tramo, desdes, hastas)
@@ -1,7 +1,14 @@
+from .._vocabulario import internar, internar_mapa, internar_tupla
+
+
 class ContenidoBase:
     """TDA Contenido Base que representa el contenido común a películas, documentales y series.
     Puede ser heredado por otros tipos de contenido más específicos.
 
+    Representación compacta: `__slots__` (sin `__dict__` por instancia), textos
+    repetidos internados en el vocabulario compartido, `etiquetas` como un
+    `MapaCompacto` de solo lectura, y `palabras_claves` / `ids_secuelas` como tuplas.
+
     Args:
         nombre: Nombre del contenido
         etiquetas: Dict con género como clave y nivel como valor
@@ -10,6 +17,18 @@ class ContenidoBase:
                 Ej: {"aventura", "emocionante", "familiar"}
     """
 
+    __slots__ = (
+        "id",
+        "titulo",
+        "etiquetas",
+        "palabras_claves",
+        "anio",
+        "produccion",
+        "ids_secuelas",
+        # Etiquetas y palabras clave codificadas para los scorers (ver `_codificacion`).
+        "_codificacion",
+    )
+
     def __init__(
         self,
         id: str,
@@ -18,25 +37,26 @@ class ContenidoBase:
         palabras_claves: set[str],
         anio: int,
         produccion: str,
-        ids_secuelas: list[str] = [],
+        ids_secuelas: tuple[str, ...] = (),
     ):
         self.id = id
         self.titulo = titulo
-        self.etiquetas = etiquetas
-        self.palabras_claves = palabras_claves
-        self.anio = anio
-        self.produccion = produccion
-        self.ids_secuelas = ids_secuelas
+        self.etiquetas = internar_mapa(etiquetas)
+        # Tupla sin repetidos (como el set original, pero ~10 veces más chica)
+        self.palabras_claves = internar_tupla(palabras_claves, unicos=True)
+        self.anio = internar(anio)
+        self.produccion = internar(produccion)
+        self.ids_secuelas = tuple(ids_secuelas or ())
 
     def to_dict(self):
         return {
             "id": self.id,
             "titulo": self.titulo,
-            "etiquetas": self.etiquetas,
+            "etiquetas": dict(self.etiquetas) if self.etiquetas is not None else None,
             "palabras_claves": list(self.palabras_claves),
             "anio": self.anio,
             "produccion": self.produccion,
-            "ids_secuelas": self.ids_secuelas,
+            "ids_secuelas": list(self.ids_secuelas),
         }
 
     # 1. Método de Clase para Deserialización
@@ -55,7 +75,7 @@ class ContenidoBase:
             id=data.get("id"),
             titulo=data.get("titulo"),
             etiquetas=data.get("etiquetas"),
-            palabras_claves=set(data.get("palabras_claves")),
+            palabras_claves=data.get("palabras_claves"),
             anio=data.get("anio"),
             produccion=data.get("produccion"),
             ids_secuelas= data.get("ids_secuelas"),
@@ -1,8 +1,25 @@
-import json
 import os
+import threading
+from contextlib import contextmanager
 from .pelicula import Pelicula      # Asume que estos son tus TDA
 from .documental import Documental  # Asume que tienen from_dict/to_dict
 from .serie import Serie            # Asume que tienen from_dict/to_dict
+from ._cache import CacheLRU, VistaContenidos
+from ..persistencia import (
+    AlmacenBase,
+    AlmacenBinario,
+    AlmacenJSON,
+    AlmacenSQLiteContenidos,
+    Consulta,
+    EstadisticasBM25,
+    MODO_COMPLETO,
+    MODO_WAL,
+    MOTOR_BINARIO,
+    MOTOR_JSON,
+    MOTOR_SQLITE,
+    consulta_bm25,
+    paginar,
+)
 
 
 # Rutas estáticas de la base de datos (DB)
@@ -10,16 +27,70 @@ DB_PELIS_FILE = "db/peliculas.json"
 DB_DOCUS_FILE = "db/documentales.json"
 DB_SERIES_FILE = "db/series.json"
 
+# Cantidad máxima de TDA hidratados que se mantienen en memoria por tipo.
+CAPACIDAD_CACHE = 10_000
+
 
 class DBContenidos:
     """
     Clase para gestionar la persistencia de Contenidos (Peliculas,
-    Documentales o Series) en archivos JSON.
+    Documentales o Series). Los registros viven en un motor de almacenamiento
+    intercambiable (`AlmacenBase`): JSON en memoria (por defecto) o SQLite.
     """
-    def __init__(self, tipo: str):
-        """Inicializa la DB para un tipo específico y carga los datos."""
+    # Índices del almacén que se arman al precargar con `indexar=True`
+    # (trigramas de títulos/ids y listas invertidas de rasgos).
+    INDICES = ("texto", "consultas")
+
+    def __init__(
+        self,
+        tipo: str,
+        capacidad_cache: int | None = CAPACIDAD_CACHE,
+        modo_escritura: str = MODO_COMPLETO,
+        motor: str = MOTOR_JSON,
+        ruta: str | None = None,
+        almacen: AlmacenBase | None = None,
+    ):
+        """Inicializa la DB para un tipo específico (los datos se cargan en el primer uso).
+
+        Args:
+            tipo (str): 'peliculas', 'documentales' o 'series'.
+            capacidad_cache (int, opcional): máximo de TDA hidratados en memoria
+                (caché LRU). `None` = sin límite.
+            modo_escritura (str): "completo" reescribe el JSON en cada cambio;
+                "wal" anexa cada cambio a `db/<tipo>.json.log` y compacta en segundo plano
+                (con SQLite activa su `journal_mode=WAL`).
+            motor (str): "json" (archivo cargado en memoria), "sqlite"
+                (consultas indexadas; en memoria solo lo que se pide) o "binario"
+                (catálogo compilado con `exportar`, abierto con mmap, solo lectura).
+            ruta (str, opcional): archivo de datos. Por defecto `db/<tipo>.json`,
+                `db/<tipo>.sqlite3` o `db/<tipo>.bin` según el motor.
+            almacen (AlmacenBase, opcional): motor ya construido (ignora `motor` y `ruta`).
+        """
         self.tipo = tipo.lower() # 'peliculas', 'documentales', o 'series'
-        self.contenido = self._cargar_archivo(self.tipo)
+        if modo_escritura not in (MODO_COMPLETO, MODO_WAL):
+            raise ValueError(f"Modo de escritura no soportado: {modo_escritura}")
+        self.modo_escritura = modo_escritura
+        if almacen is None:
+            # Se valida ya (tipo y motor); el motor se abre recién en el primer uso.
+            self._obtener_file_path(self.tipo)
+            if motor not in (MOTOR_JSON, MOTOR_SQLITE, MOTOR_BINARIO):
+                raise ValueError(f"Motor de almacenamiento no soportado: {motor}")
+        self._motor, self._ruta = motor, ruta
+        # 💡 Motor de almacenamiento: se abre en el primer uso (ver `_almacen`).
+        self._almacen_abierto = almacen
+        self._lock_almacen = threading.Lock()
+        # Identity map acotado (LRU) id -> TDA hidratado.
+        self._hidratados = CacheLRU(capacidad_cache)
+
+        # Operaciones de la transacción abierta (None = sin transacción).
+        self._pendientes = None
+        # Versión del catálogo: se incrementa con cada alta/baja/modificación.
+        # Permite a las cachés (p. ej. el grafo de recomendaciones) saber
+        # si quedaron desactualizadas sin comparar todo el contenido.
+        self.version = 0
+        # Funciones a notificar ante cada cambio: observador(evento, contenido_id, contenido)
+        # con evento "agregar" (contenido = TDA guardado) o "eliminar" (contenido = None).
+        self._observadores = []
 
     # --- 1. Métodos de Utilería y Persistencia ---
 
@@ -35,40 +106,68 @@ class DBContenidos:
             raise ValueError(f"Tipo de contenido no soportado: {tipo}")
 
 
-    def _cargar_archivo(self, tipo: str) -> dict:
-        """Carga el diccionario de contenidos desde el archivo JSON."""
-        DB_FILE = self._obtener_file_path(tipo)
+    @property
+    def _almacen(self) -> AlmacenBase:
+        """Motor de almacenamiento, abierto en el primer uso: construir el repositorio no toca el disco."""
+        if self._almacen_abierto is None:
+            with self._lock_almacen:
+                if self._almacen_abierto is None:
+                    self._almacen_abierto = self._crear_almacen(self._motor, self._ruta, self.modo_escritura)
+        return self._almacen_abierto
 
-        if not os.path.exists(DB_FILE) or os.path.getsize(DB_FILE) == 0:
-            return {}
-            
-        try:
-            with open(DB_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # La clave es el tipo (e.g., 'peliculas')
-                return data.get(tipo, {})
-
-        except json.JSONDecodeError as e:
-            # Si el JSON está mal, hay que avisar de forma brutal.
-            print(f"Error fatal: El archivo '{DB_FILE}' no tiene un formato JSON válido: {e}")
-            return {}
-        except Exception as e:
-            print(f"Error desconocido al cargar el archivo '{DB_FILE}': {e}")
-            return {}
-
-
-    def _guardar_archivo(self, tipo: str):
-        """Guarda el diccionario actual de contenidos en el archivo JSON."""
-        DB_FILE = self._obtener_file_path(tipo)
-        
-        # Se guarda el diccionario completo con la clave que es el tipo (e.g., 'peliculas')
-        data = {tipo: self.contenido}
+    def precargar(self, en_segundo_plano: bool = True, indexar: bool = False) -> threading.Thread | None:
+        """
+        Abre el motor y carga sus datos antes de que se necesiten (p. ej. mientras
+        se muestra el menú); con `indexar` arma además sus índices. En segundo
+        plano devuelve el hilo (daemon) que la hace.
+        """
+        if not en_segundo_plano:
+            self._almacen.precargar(self.INDICES if indexar else ())
+            return None
+        hilo = threading.Thread(target=self.precargar, args=(False, indexar), daemon=True)
+        hilo.start()
+        return hilo
 
-        try:
-            with open(DB_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error al escribir en el archivo '{DB_FILE}': {e}")
+    def tarea_precarga(self, indexar: bool = True):
+        """
+        Precarga serializable para correr en otro proceso (ver `AlmacenBase.tarea_precarga`);
+        su resultado se instala con `adoptar_precarga`. None si el motor no la admite.
+        """
+        return self._almacen.tarea_precarga(self.INDICES if indexar else ())
+
+    def adoptar_precarga(self, estado) -> bool:
+        """Instala el estado que devolvió la `tarea_precarga` en otro proceso."""
+        return self._almacen.adoptar_estado(estado)
+
+    def __len__(self) -> int:
+        """Cantidad de registros (abre el motor si hace falta)."""
+        return len(self._almacen)
+
+    def _crear_almacen(self, motor: str, ruta: str | None, modo_escritura: str) -> AlmacenBase:
+        """Construye el motor de almacenamiento pedido para este tipo."""
+        ruta_json = self._obtener_file_path(self.tipo)
+        if motor == MOTOR_JSON:
+            return AlmacenJSON(ruta or ruta_json, self.tipo, modo_escritura)
+        if motor == MOTOR_SQLITE:
+            ruta = ruta or os.path.splitext(ruta_json)[0] + ".sqlite3"
+            return AlmacenSQLiteContenidos(ruta, modo_escritura)
+        if motor == MOTOR_BINARIO:
+            return AlmacenBinario(ruta or os.path.splitext(ruta_json)[0] + ".bin")
+        raise ValueError(f"Motor de almacenamiento no soportado: {motor}")
+
+    def suscribir(self, observador):
+        """Registra una función a notificar cuando el catálogo cambia."""
+        self._observadores.append(observador)
+
+    def desuscribir(self, observador):
+        """Quita un observador registrado con `suscribir`."""
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+
+    def _notificar(self, evento: str, contenido_id: str, contenido=None):
+        """Avisa a los observadores de un cambio ya persistido."""
+        for observador in list(self._observadores):
+            observador(evento, contenido_id, contenido)
 
 
     # --- 2. Métodos de Conversión (Serialización/Deserialización) ---
@@ -96,28 +195,127 @@ class DBContenidos:
             raise TypeError(f"El objeto de tipo {type(objeto)} no tiene un método 'to_dict()' para serializarlo.")
 
 
-    # --- 3. Operaciones CRUD Básicas ---
+    # --- 3. Identity Map ---
+
+    def _hidratar(self, data: dict):
+        """Devuelve el TDA de un registro, reutilizando el ya construido (caché LRU)."""
+        contenido_id = data.get("id")
+        objeto = self._hidratados.obtener(contenido_id)
+        if objeto is None:
+            objeto = self._diccionario_a_objeto(data)
+            self._hidratados.guardar(contenido_id, objeto)
+        return objeto
+
+    def estadisticas_cache(self) -> dict:
+        """Aciertos, fallos y desalojos de la caché de TDA hidratados."""
+        return self._hidratados.estadisticas()
+
 
-    def obtener_todos(self) -> list[Pelicula | Documental | Serie]:
-        """Devuelve una lista de todos los objetos TDA (Pelicula, Documental, Serie)."""
-        # Comprensión de lista simple y eficiente.
-        return [self._diccionario_a_objeto(data) for data in self.contenido]
+    # --- 4. Operaciones CRUD Básicas ---
+
+    def obtener_todos(self) -> VistaContenidos:
+        """Devuelve una vista (secuencia) de todos los objetos TDA (Pelicula, Documental, Serie).
+
+        La vista es perezosa: cada TDA se construye al accederlo y pasa por la caché LRU.
+        """
+        return VistaContenidos(self._almacen.registros(), self._hidratar)
+
+
+    def iter_todos(self):
+        """Genera los TDA de a uno, con memoria constante.
+
+        Pensado para recorridos completos (exportaciones, análisis, construir el grafo):
+        si el JSON todavía no se cargó se lee en streaming, y los TDA generados no
+        pasan por la caché LRU (no desplazan a los que se usan de verdad).
+        """
+        for data in self._almacen.iter_registros():
+            yield self._diccionario_a_objeto(data)
 
     
     def obtener_por_id(self, contenido_id: str) -> Pelicula | Documental | Serie:
-        """Busca y devuelve el objeto TDA por su ID, o None si no se encuentra."""
-        lista_contenidos = self.obtener_todos()
-        # Buscamos el objeto ya convertido en la lista de objetos
-        for contenido in lista_contenidos:
-            if getattr(contenido, 'id', None) == contenido_id:
-                return contenido
+        """Busca y devuelve el objeto TDA por su ID, o None si no se encuentra.
+
+        Acceso O(1) (índice de IDs / clave primaria); consultas repetidas devuelven el mismo objeto.
+        """
+        objeto = self._hidratados.obtener(contenido_id)
+        if objeto is not None:
+            return objeto
+
+        data = self._almacen.obtener(contenido_id)
+        if data is None:
+            # No se encontró
+            return None
+        objeto = self._diccionario_a_objeto(data)
+        self._hidratados.guardar(contenido_id, objeto)
+        return objeto
+
+
+    def buscar(self, titulo=None, etiquetas=None, palabras_claves=None, id_contenido=None) -> list:
+        """
+        Devuelve los TDA que pasan los filtros de `NuevoCatalogo.buscar`.
+        El motor resuelve los filtros (con índices en SQLite) y solo se
+        hidratan los contenidos que coinciden.
+        """
+        return [
+            self._hidratar(data)
+            for data in self._almacen.buscar_contenidos(titulo, etiquetas, palabras_claves, id_contenido)
+        ]
+
+
+    def consultar_ids(self, consulta: Consulta) -> list[str]:
+        """IDs (en orden de alta) de los contenidos que cumplen una `Consulta`, sin hidratar nada."""
+        return self._almacen.consultar(consulta)
+
+
+    def consultar(self, consulta: Consulta, limite: int | None = None, desplazamiento: int = 0) -> list:
+        """
+        Devuelve los TDA que cumplen una `Consulta` (ver `plataforma.persistencia.consultas`),
+        paginados con `limite`/`desplazamiento`. La consulta se resuelve con los
+        índices del motor y solo se hidrata la página pedida.
+
+        Ej:
+            db.consultar(Etiqueta("Magia", minimo=0.8) & ~Director("Peter Jackson"), limite=20)
+        """
+        ids = paginar(self.consultar_ids(consulta), limite, desplazamiento)
+        return [self.obtener_por_id(contenido_id) for contenido_id in ids]
+
 
-        # No se encontró
-        return None
+    def contar(self, consulta: Consulta) -> int:
+        """Cantidad de contenidos que cumplen una `Consulta` (para paginar)."""
+        return len(self.consultar_ids(consulta))
+
+
+    def estadisticas_bm25(self, texto: str | None) -> EstadisticasBM25:
+        """Estadísticas BM25 de este tipo para los términos de `texto` (se suman entre tipos)."""
+        return self._almacen.estadisticas_bm25(consulta_bm25(texto))
+
+
+    def rankear(
+        self, texto: str | None, etiquetas=None, k: int = 10, estadisticas: EstadisticasBM25 | None = None
+    ) -> list[tuple[float, int, str]]:
+        """
+        Los `k` contenidos más relevantes para `texto` (BM25 sobre título y
+        palabras clave, ponderado por los niveles de `etiquetas`), como
+        `(puntaje, orden, id)` de mayor a menor, sin hidratar nada.
+        """
+        if k < 0:
+            raise ValueError("k no puede ser negativo.")
+        return self._almacen.rankear(consulta_bm25(texto), etiquetas or (), k, estadisticas)
+
+
+    def buscar_relevantes(self, texto: str | None, etiquetas=None, k: int = 10) -> list:
+        """
+        Los `k` TDA más relevantes para `texto`, del más al menos relevante.
+        Solo se hidratan esos k.
+
+        Ej:
+            db.buscar_relevantes("anillo", etiquetas=["Magia"], k=10)
+        """
+        return [self.obtener_por_id(contenido_id) for _, _, contenido_id in self.rankear(texto, etiquetas, k)]
 
 
     def agregar_contenido(self, contenido):
-        """Añade o actualiza un objeto TDA y lo guarda en el archivo JSON."""
+        """Añade o actualiza un objeto TDA y lo persiste."""
         # 💡 Convertimos el objeto TDA A DICCIONARIO para persistir.
         contenido_data = self._objeto_a_diccionario(contenido)
 
@@ -126,47 +324,123 @@ class DBContenidos:
         if not contenido_id:
             raise ValueError("El objeto de contenido debe tener un 'id' válido.")
 
-        # Si self.contenido es una lista (estructura actual del JSON), inserta o reemplaza
-        if isinstance(self.contenido, list):
-            for i, item in enumerate(self.contenido):
-                if item.get("id") == contenido_id:
-                    self.contenido[i] = contenido_data
-                    break
-            else:
-                # No existía, lo agregamos
-                self.contenido.append(contenido_data)
-
-        # Si por alguna razón es un dict (versiones anteriores), mantener compatibilidad
-        elif isinstance(self.contenido, dict):
-            self.contenido[contenido_id] = contenido_data
-
-        else:
-            raise TypeError("Estructura de 'self.contenido' inesperada. Debe ser lista o dict.")
-
-        # Guarda todo el diccionario persistente.
-        self._guardar_archivo(self.tipo)
+        self._aplicar_guardar(contenido_data)
+        self._confirmar({"op": "guardar", "id": contenido_id, "registro": contenido_data})
 
     def eliminar_contenido(self, contenido_id: str) -> bool:
             """
             Elimina un contenido por su ID, si existe, y guarda los cambios.
             Devuelve True si se eliminó, False si no se encontró.
             """
-            # Si la estructura es lista, buscamos por id y removemos
-            if isinstance(self.contenido, list):
-                for i, item in enumerate(self.contenido):
-                    if item.get("id") == contenido_id:
-                        self.contenido.pop(i)
-                        self._guardar_archivo(self.tipo)
-                        return True
+            if not self._aplicar_eliminar(contenido_id):
                 return False
 
-            # Si es dict, eliminar por clave
-            if isinstance(self.contenido, dict):
-                if contenido_id in self.contenido:
-                    del self.contenido[contenido_id]
-                    self._guardar_archivo(self.tipo)
-                    return True
-                return False
+            self._confirmar({"op": "eliminar", "id": contenido_id})
+            return True
+
+    # --- Operaciones en Lote y Transacciones ---
+
+    def agregar_muchos(self, contenidos):
+        """Añade o actualiza varios TDA guardando el archivo UNA sola vez."""
+        with self.transaccion():
+            for contenido in contenidos:
+                self.agregar_contenido(contenido)
+
+    def eliminar_muchos(self, contenido_ids) -> int:
+        """Elimina varios contenidos por ID guardando una sola vez. Devuelve cuántos se eliminaron."""
+        eliminados = 0
+        with self.transaccion():
+            for contenido_id in contenido_ids:
+                if self.eliminar_contenido(contenido_id):
+                    eliminados += 1
+        return eliminados
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa cambios: se aplican en memoria y se persisten una sola vez al salir
+        del bloque `with`. Si el bloque lanza una excepción, se deshacen todos
+        los cambios y no se escribe nada. Las transacciones anidadas se integran
+        a la exterior.
+
+        Ej:
+            with db.transaccion():
+                db.agregar_contenido(p1)
+                db.eliminar_contenido("HP02")
+        """
+        if self._pendientes is not None:
+            yield self
+            return
+
+        self._almacen.iniciar_transaccion()
+        self._pendientes = []
+        try:
+            yield self
+        except BaseException:
+            pendientes, self._pendientes = self._pendientes, None
+            self._almacen.deshacer_transaccion()
+            for operacion in pendientes:
+                self._hidratados.descartar(operacion["id"])
+            raise
+
+        pendientes, self._pendientes = self._pendientes, None
+        self._almacen.persistir(pendientes)
+        # Posición de la última operación de cada id: solo esa refleja lo guardado.
+        ultimas = {operacion["id"]: k for k, operacion in enumerate(pendientes)}
+        for k, operacion in enumerate(pendientes):
+            self._publicar(operacion, vigente=ultimas[operacion["id"]] == k)
+
+
+    # --- 5. Aplicación de cambios ---
+
+    def _aplicar_guardar(self, contenido_data: dict):
+        """Inserta o reemplaza un registro crudo en el almacén (sin confirmar)."""
+        self._almacen.guardar(contenido_data)
+        # El TDA cacheado quedó desactualizado
+        self._hidratados.descartar(contenido_data.get("id"))
+
+    def _aplicar_eliminar(self, contenido_id: str) -> bool:
+        """Quita un registro crudo del almacén (sin confirmar). False si no existía."""
+        if not self._almacen.eliminar(contenido_id):
+            return False
+        self._hidratados.descartar(contenido_id)
+        return True
+
+    def _confirmar(self, operacion: dict):
+        """Persiste y publica un cambio ya aplicado, o lo difiere si hay una transacción abierta."""
+        if self._pendientes is not None:
+            self._pendientes.append(operacion)
+            return
+        self._almacen.persistir([operacion])
+        self._publicar(operacion)
+
+    def _publicar(self, operacion: dict, vigente: bool = True):
+        """Incrementa la versión y avisa a los observadores de un cambio persistido.
+
+        `vigente` indica que el registro de la operación es el que quedó guardado
+        (dentro de un lote, un id puede haberse reemplazado después).
+        """
+        contenido_id = operacion["id"]
+        self.version += 1
+        if operacion["op"] == "eliminar":
+            self._notificar("eliminar", contenido_id)
+            return
+
+        # Se notifica el TDA hidratado desde lo guardado (no el objeto del llamador).
+        if vigente:
+            contenido = self._hidratar(operacion["registro"])
+        else:
+            contenido = self._diccionario_a_objeto(operacion["registro"])
+        self._notificar("agregar", contenido_id, contenido)
+
+    def compactar(self, en_segundo_plano: bool = True):
+        """Vuelca los cambios pendientes del log al archivo principal (modo "wal")."""
+        # Con una transacción abierta el estado aún no está confirmado.
+        if self._pendientes is not None or self._almacen_abierto is None:
+            return
+        self._almacen.compactar(en_segundo_plano=en_segundo_plano)
 
-            # Estructura inesperada
-            raise TypeError("Estructura de 'self.contenido' inesperada. Debe ser lista o dict.")
\ No newline at end of file
+    def cerrar(self):
+        """Espera compactaciones pendientes y libera el almacén (si llegó a abrirse)."""
+        if self._almacen_abierto is not None:
+            self._almacen_abierto.cerrar()
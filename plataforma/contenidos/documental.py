@@ -1,10 +1,13 @@
 from .contenido_base import ContenidoBase
+from .._vocabulario import internar
 from datetime import datetime, date
 
 
 class Documental(ContenidoBase):
     """TDA para Documentales"""
 
+    __slots__ = ("director", "fecha", "duracion")
+
     def __init__(self, director: str, fecha: str, duracion: int, **kwargs):
         """
         Args:
@@ -21,7 +24,7 @@ class Documental(ContenidoBase):
         super().__init__(**kwargs) 
         
         # Campos propios de Documental
-        self.director = director
+        self.director = internar(director)
 
         # `fecha` puede venir como `str` (desde JSON) o como `datetime/date`.
         # - Si es datetime/date: formateamos a 'DD-MM-YYYY'.
@@ -36,8 +39,9 @@ class Documental(ContenidoBase):
             except Exception:
                 # Conservamos la representación tal cual (string)
                 self.fecha = str(fecha)
+        self.fecha = internar(self.fecha)
 
-        self.duracion = duracion
+        self.duracion = internar(duracion)
 
 
     def to_dict(self) -> dict:
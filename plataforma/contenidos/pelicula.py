@@ -1,10 +1,13 @@
 from .contenido_base import ContenidoBase
+from .._vocabulario import internar, internar_tupla
 
 
 class Pelicula(ContenidoBase):
     """TDA para Películas"""
 
-    def __init__(self, director: str, actores: set[str], duracion: int, **kwargs):
+    __slots__ = ("director", "actores", "duracion")
+
+    def __init__(self, director: str, actores: tuple[str, ...], duracion: int, **kwargs):
         """
         Args:
             nombre (str): Titulo de la película
@@ -16,9 +19,9 @@ class Pelicula(ContenidoBase):
             palabras_clave (list): Lista de palabras clave.
         """
         super().__init__(**kwargs)
-        self.director = director
-        self.actores = actores
-        self.duracion = duracion
+        self.director = internar(director)
+        self.actores = internar_tupla(actores, unicos=True)
+        self.duracion = internar(duracion)
 
     def to_dict(self):
         base_dict = super().to_dict()
@@ -47,9 +50,8 @@ class Pelicula(ContenidoBase):
         director = data_copy.pop("director", None)
         duracion = data_copy.pop("duracion", None)
 
-        # Convierte la lista (lo que viene del JSON) a set (el TDA lo necesita)
-        actores_list = data_copy.pop("actores", [])
-        actores = set(actores_list)
+        # La lista (lo que viene del JSON) se guarda como tupla en el TDA
+        actores = data_copy.pop("actores", [])
 
         # 2. El resto de la 'data' (lo que queda después de los .pop()) 
         #    SON los argumentos base (id, titulo, anio, etc.).
@@ -1,10 +1,13 @@
 from .contenido_base import ContenidoBase
+from .._vocabulario import internar
 
 
 class Serie(ContenidoBase):
+    __slots__ = ("genero_principal", "temporadas")
+
     def __init__(self, genero: str, temporadas: dict[int: dict], **kwargs):
         super().__init__(**kwargs)
-        self.genero_principal = genero
+        self.genero_principal = internar(genero)
         self.temporadas = temporadas
 
 
@@ -1,7 +1,113 @@
+import sys
+from bisect import insort
+from heapq import heappush, heapreplace
+from itertools import count, islice
+
 from .contenidos import Pila, Cola, obtener_pesos_aristas
+from .contenidos._adyacencia_csr import AdyacenciaCSR, IndiceVertices
+from .contenidos._candidatos import IndiceCandidatos
+from .contenidos._motor_similitud import MotorSimilitud, NUMPY_DISPONIBLE
+from .contenidos._similitud_paralela import puntuar_en_paralelo
+
+
+# Posición de desempate de los vecinos que no son vértices del grafo (p. ej.
+# aristas cargadas a mano): van después y, entre ellos, por orden de inserción.
+_SIN_POSICION = float("inf")
+
+
+def _clave_vecino(posiciones: dict):
+    """
+    Clave del orden canónico de las listas de adyacencia: score descendente y,
+    a igual score, la posición del vecino en el catálogo (`posiciones`: id ->
+    posición). Así la lista queda igual la arme la construcción, `ordenar_vecinos`
+    o una inserción ordenada.
+    """
+    def clave(vecino):
+        return (-vecino[1], posiciones.get(vecino[0], _SIN_POSICION))
+    return clave
+
+
+def _ids_vecinos(adyacencia, nodo_id) -> list:
+    """Ids de los vecinos de un nodo (en el orden de su lista), en ambos formatos."""
+    if isinstance(adyacencia, AdyacenciaCSR):
+        return adyacencia.ids_vecinos(nodo_id)
+    return [vecino[0] for vecino in adyacencia.get(nodo_id, ())]
+
+
+def _cantidad_aristas(adyacencia) -> int:
+    if isinstance(adyacencia, AdyacenciaCSR):
+        return adyacencia.cantidad_aristas()
+    return sum(len(lista) for lista in adyacencia.values())
+
+
+def _validar_limite(valor, nombre, minimo=0):
+    """`k` y `profundidad_maxima`: None (sin límite) o un entero >= `minimo`."""
+    if valor is not None and (not isinstance(valor, int) or valor < minimo):
+        raise ValueError(f"{nombre} debe ser un entero >= {minimo} o None: {valor!r}")
+
+
+# Memoria aproximada de cada entrada (vecino_id, score) de una lista de
+# adyacencia: la tupla, su lugar en la lista y medio score (cada score lo
+# comparten las dos entradas de la arista; los ids ya existen en los vértices).
+_BYTES_POR_ARISTA = sys.getsizeof((None, None)) + 8 + sys.getsizeof(0.0) // 2
+
+
+class _ColectorAristas:
+    """
+    Recibe las aristas (a, b, score) de un algoritmo durante la construcción.
+    Sin límite las agrega a ambas listas de adyacencia; con `k`, guarda por
+    nodo solo sus k mejores vecinos en un heap acotado, así la memoria queda
+    en O(n·k) y no en O(n²) aunque el catálogo sea casi completo.
+
+    Ante empates de score gana el vecino de menor posición en el catálogo (el
+    orden canónico, ver `_clave_vecino`): el resultado es el mismo que ordenar
+    la lista completa y quedarse con las k primeras.
+    """
+
+    def __init__(self, adyacencia: dict, k: int | None = None, posiciones: dict | None = None):
+        self.adyacencia = adyacencia
+        self.k = k
+        self.posiciones = {} if posiciones is None else posiciones
+        # Entradas (en ambos sentidos) que superaron el umbral
+        self.candidatas = 0
+        # nodo -> heap de (score, -posición, vecino_id); la raíz es la peor
+        self._montones = {}
+
+    def agregar(self, a_id, b_id, score):
+        self.candidatas += 2
+        if self.k is None:
+            self.adyacencia[a_id].append((b_id, score))
+            self.adyacencia[b_id].append((a_id, score))
+            return
+        for origen, destino in ((a_id, b_id), (b_id, a_id)):
+            entrada = (score, -self.posiciones.get(destino, _SIN_POSICION), destino)
+            monton = self._montones.setdefault(origen, [])
+            if len(monton) < self.k:
+                heappush(monton, entrada)
+            elif entrada > monton[0]:
+                heapreplace(monton, entrada)
+
+    def cerrar(self):
+        """Vuelca los heaps a las listas de adyacencia (de mayor a menor score)."""
+        for origen, monton in self._montones.items():
+            monton.sort(reverse=True)
+            self.adyacencia[origen].extend((destino, score) for score, _, destino in monton)
+        self._montones = {}
+
 
 # --- Grafo para recomendaciones y topológico ---
 class GrafoContenido:
+    # Desde este tamaño conviene el motor vectorizado frente al doble bucle.
+    MIN_VERTICES_NUMPY = 200
+    # Si los candidatos superan esta fracción de todos los pares, el catálogo
+    # es "denso" y en modo "auto" se prefiere el motor vectorizado.
+    FRACCION_CANDIDATOS_NUMPY = 0.05
+    # Resultados por defecto de los recorridos de recomendación.
+    RESULTADOS_RECORRIDO = 7
+    # Por debajo de este tamaño no compensa levantar procesos: se construye
+    # en serie aunque se pidan trabajadores.
+    MIN_VERTICES_PARALELO = 1000
+
     def __init__(self):
         """Inicializa un grafo vacío para el catálogo de contenidos, por tipo de contenido:
         Grafo de Peliculas, Grafo de Documentales o Grafo de Series.
@@ -13,20 +119,42 @@ class GrafoContenido:
         self.adyacencia_similitud = {} 
         # Grafo ponderado para Maratón (DFS)
         self.adyacencia_maraton = {} 
+        # 💡 Las listas (vecino_id, score) de ambos se mantienen ordenadas por
+        # score descendente (ver `ordenar_vecinos`): los recorridos no reordenan.
+        # Con `compactar` ambos pasan a `AdyacenciaCSR` (misma interfaz de dict).
         # Grafo no ponderado para Orden Topológico
         self.adyacencia_orden_sagas = {}
 
+        # Parámetros de la última `generar_similitud` (para actualizaciones
+        # incrementales) e índice de candidatos asociado.
+        self.tipo = None
+        self.umbral = 4
+        self.k_similares = None
+        self.k_maraton = None
+        self._indice_candidatos = None
+        # Aristas candidatas (sobre el umbral) de la última construcción, por algoritmo
+        self._candidatas = {}
+        # id -> posición del vértice en el catálogo (orden de alta), para
+        # desempatar vecinos de igual score (ver `_clave_vecino`). Solo crece:
+        # el orden relativo es el mismo que tendría una reconstrucción.
+        self._posiciones = {}
+        self._siguiente_posicion = count()
+
     def agregar(self, contenido):
         """Agrega un contenido al grafo, inicializando sus listas de adyacencia.
         Args:
             contenido (ContenidoBase): El contenido a agregar al grafo.
         """
+        self._registrar_posicion(contenido.id)
         self.vertices_contenido[contenido.id] = contenido
         self.adyacencia_similitud[contenido.id] = []
         self.adyacencia_maraton[contenido.id] = []
         self.adyacencia_orden_sagas[contenido.id] = []
 
 
+    def _registrar_posicion(self, nodo_id):
+        if nodo_id not in self._posiciones:
+            self._posiciones[nodo_id] = next(self._siguiente_posicion)
 
     def ver_vertices(self):
         """Retorna una lista de los IDs de los contenidos en el grafo."""
@@ -52,10 +180,146 @@ class GrafoContenido:
         """
         return self.adyacencia_orden_sagas.get(nodo_id, [])
 
-    def generar_similitud(self, umbral=4, tipo=None):
-        """Genera aristas de similitud usando el peso ponderado para recomendaciones."""
+    def generar_similitud(
+        self, umbral=4, tipo=None, motor="auto", k_similares=None, k_maraton=None, trabajadores=None
+    ):
+        """Genera aristas de similitud usando el peso ponderado para recomendaciones.
+
+        Args:
+            umbral (float): puntaje mínimo para crear una arista.
+            tipo (str): tipo de contenido (define los niveles de etiquetas).
+            motor (str): "pares" (doble bucle con `obtener_pesos_aristas`),
+                "indice" (solo los pares candidatos de `IndiceCandidatos`),
+                "numpy" (motor vectorizado `MotorSimilitud`) o "auto", que usa
+                el índice salvo que los candidatos sean más de
+                `FRACCION_CANDIDATOS_NUMPY` de todos los pares y NumPy esté
+                disponible (catálogos densos, donde conviene vectorizar).
+            k_similares (int, opcional): si se indica, cada nodo guarda solo sus
+                k vecinos de mayor score en el grafo de similares.
+            k_maraton (int, opcional): ídem para el grafo de maratón.
+            trabajadores (int, opcional): procesos para puntuar los pares con
+                los motores "pares" e "indice" (ver `_similitud_paralela`).
+                Con None, 1 o menos de `MIN_VERTICES_PARALELO` vértices se
+                construye en serie; "numpy" siempre es serial (ya vectoriza).
+
+        Con k, la lista de cada nodo son SUS mejores vecinos: A puede tener a B
+        sin que B tenga a A. El grafo queda lineal en el tamaño del catálogo
+        (ver `reporte_aristas`).
+        """
+        _validar_limite(k_similares, "k_similares", minimo=1)
+        _validar_limite(k_maraton, "k_maraton", minimo=1)
+        _validar_limite(trabajadores, "trabajadores", minimo=1)
+        # La construcción agrega a listas: si el grafo estaba compacto se
+        # arma con dicts y se vuelve a compactar al final.
+        compacto = self.compacto
+        if compacto:
+            self.descompactar()
+        self.tipo, self.umbral = tipo, umbral
+        self.k_similares, self.k_maraton = k_similares, k_maraton
+        self._indice_candidatos = None
+        colectores = {
+            "similares": _ColectorAristas(self.adyacencia_similitud, k_similares, self._posiciones),
+            "maraton": _ColectorAristas(self.adyacencia_maraton, k_maraton, self._posiciones),
+        }
+
+        indice = None
+        if motor == "auto":
+            indice = self._construir_indice_candidatos(umbral, tipo)
+            n = len(self.vertices_contenido)
+            total_pares = n * (n - 1) // 2
+            denso = indice.costo_estimado() > total_pares * self.FRACCION_CANDIDATOS_NUMPY
+            usar_numpy = NUMPY_DISPONIBLE and n >= self.MIN_VERTICES_NUMPY and denso
+            motor = "numpy" if usar_numpy else "indice"
+
+        paralelo = (
+            trabajadores is not None and trabajadores > 1
+            and len(self.vertices_contenido) >= self.MIN_VERTICES_PARALELO
+        )
+        if motor == "numpy":
+            self._generar_similitud_numpy(umbral, tipo, colectores)
+        elif motor in ("indice", "pares") and paralelo:
+            if motor == "indice" and indice is None:
+                indice = self._construir_indice_candidatos(umbral, tipo)
+            self._generar_similitud_paralela(umbral, tipo, colectores, trabajadores, indice)
+        elif motor == "indice":
+            self._generar_similitud_indice(umbral, tipo, colectores, indice)
+        elif motor == "pares":
+            self._generar_similitud_pares(umbral, tipo, colectores)
+        else:
+            raise ValueError(f"Motor de similitud no soportado: {motor}")
+
+        for colector in colectores.values():
+            colector.cerrar()
+        self._candidatas = {alg: colector.candidatas for alg, colector in colectores.items()}
+        self.ordenar_vecinos()
+        if compacto:
+            self.compactar()
+
+    def ordenar_vecinos(self):
+        """
+        Paso final de la construcción: ordena cada lista de adyacencia de
+        similitud y maratón por score descendente (empates por posición del
+        vecino en el catálogo), una sola vez, para que los recorridos la usen
+        tal cual. Quien cargue aristas a mano debe llamarlo.
+        """
+        clave = _clave_vecino(self._posiciones)
+        for adyacencia in (self.adyacencia_similitud, self.adyacencia_maraton):
+            if isinstance(adyacencia, AdyacenciaCSR):
+                continue  # sus filas solo se escriben ya ordenadas
+            for lista in adyacencia.values():
+                lista.sort(key=clave)
+
+    # --- Almacenamiento compacto (CSR) ---
+
+    @property
+    def compacto(self) -> bool:
+        """True si las adyacencias de similitud y maratón están en formato CSR."""
+        return isinstance(self.adyacencia_similitud, AdyacenciaCSR)
+
+    def compactar(self):
+        """
+        Pasa las adyacencias de similitud y maratón a `AdyacenciaCSR`: arrays
+        contiguos de int32 (vecinos) y float32 (scores) con un índice id <->
+        posición compartido, ~8 bytes por arista en vez de ~76. Los métodos
+        públicos y las actualizaciones incrementales siguen funcionando igual,
+        pero los scores se guardan en float32 y se devuelven redondeados a
+        `DECIMALES_PESO` (4) decimales: pueden diferir de los del modo dict a
+        partir del quinto decimal (el orden de cada lista se conserva tal cual).
+
+        Llamarlo sobre un grafo ya compacto lo reorganiza desde cero.
+        """
+        vertices = IndiceVertices(self.vertices_contenido)
+        self.adyacencia_similitud = AdyacenciaCSR(vertices, self.adyacencia_similitud)
+        self.adyacencia_maraton = AdyacenciaCSR(vertices, self.adyacencia_maraton)
+
+    def descompactar(self):
+        """Vuelve a las listas de tuplas en dicts (la representación original)."""
+        self.adyacencia_similitud = dict(self.adyacencia_similitud.items())
+        self.adyacencia_maraton = dict(self.adyacencia_maraton.items())
+
+    def memoria_adyacencia(self) -> int:
+        """
+        Bytes aproximados de las adyacencias de similitud y maratón (entradas e
+        índice de posiciones; no cuenta los ids ni los contenidos, compartidos).
+        """
+        adyacencias = (self.adyacencia_similitud, self.adyacencia_maraton)
+        if self.compacto:
+            vertices = self.adyacencia_similitud.vertices
+            return sum(a.nbytes() for a in adyacencias) + (
+                sys.getsizeof(vertices.ids) + sys.getsizeof(vertices.posiciones)
+            )
+        return sum(
+            sys.getsizeof(adyacencia)
+            + sum(sys.getsizeof(lista) for lista in adyacencia.values())
+            + _cantidad_aristas(adyacencia) * (_BYTES_POR_ARISTA - 8)
+            for adyacencia in adyacencias
+        )
+
+    def _generar_similitud_pares(self, umbral, tipo, colectores):
+        """Doble bucle original: calcula ambos scores para cada par de vértices."""
 
         ids = list(self.vertices_contenido.keys())
+        similares, maraton = colectores["similares"], colectores["maraton"]
 
         for i in range(len(ids)):
             for j in range(i + 1, len(ids)):
@@ -67,14 +331,106 @@ class GrafoContenido:
                 
                 if score_similares >= umbral and a.id != b.id:
                     # Almacenar en el grafo de Similitud
-                    self.adyacencia_similitud[a.id].append((b.id, score_similares))
-                    self.adyacencia_similitud[b.id].append((a.id, score_similares))
+                    similares.agregar(a.id, b.id, score_similares)
                 
                 # Usar un umbral (quizás el mismo) para el grafo de maratón
                 if score_maraton >= umbral and a.id != b.id:
                     # Almacenar en el grafo de Maratón
-                    self.adyacencia_maraton[a.id].append((b.id, score_maraton))
-                    self.adyacencia_maraton[b.id].append((a.id, score_maraton))
+                    maraton.agregar(a.id, b.id, score_maraton)
+
+    def _generar_similitud_paralela(self, umbral, tipo, colectores, trabajadores, indice=None):
+        """
+        Puntúa los pares (todos, o los candidatos de `indice`) en `trabajadores`
+        procesos. Los tramos se agregan en orden, así que el grafo es idéntico
+        al de los motores seriales (empates y límite k incluidos).
+        """
+        contenidos = list(self.vertices_contenido.values())
+        if indice is not None:
+            self._indice_candidatos = indice
+        for tramo in puntuar_en_paralelo(contenidos, tipo, umbral, trabajadores, indice):
+            for algoritmo, aristas in tramo.items():
+                colector = colectores[algoritmo]
+                for i, j, score in aristas:
+                    colector.agregar(contenidos[i].id, contenidos[j].id, score)
+
+    def _construir_indice_candidatos(self, umbral, tipo) -> IndiceCandidatos:
+        """Indexa todos los vértices por etiqueta, palabra clave, director y secuela."""
+        indice = IndiceCandidatos(tipo=tipo, umbral=umbral)
+        for contenido in self.vertices_contenido.values():
+            indice.agregar(contenido)
+        return indice
+
+    def _generar_similitud_indice(self, umbral, tipo, colectores, indice=None):
+        """Puntúa solo los pares que comparten algún rasgo capaz de superar el umbral."""
+        ids = list(self.vertices_contenido.keys())
+        if indice is None:
+            indice = self._construir_indice_candidatos(umbral, tipo)
+        self._indice_candidatos = indice
+        similares, maraton = colectores["similares"], colectores["maraton"]
+
+        # Los pares vienen ordenados por (i, j), igual que el doble bucle.
+        for i, j in indice.pares(ids):
+            a, b = self.vertices_contenido[ids[i]], self.vertices_contenido[ids[j]]
+
+            score_similares = obtener_pesos_aristas(a, b, tipo, "similares")
+            score_maraton = obtener_pesos_aristas(a, b, tipo, "maraton")
+
+            if score_similares >= umbral:
+                similares.agregar(a.id, b.id, score_similares)
+
+            if score_maraton >= umbral:
+                maraton.agregar(a.id, b.id, score_maraton)
+
+    def _generar_similitud_numpy(self, umbral, tipo, colectores):
+        """Calcula ambos grafos de una vez con el motor vectorizado."""
+        ids = list(self.vertices_contenido.keys())
+        motor = MotorSimilitud(self.vertices_contenido.values(), tipo=tipo)
+
+        # Las aristas vienen ordenadas por (i, j): mismo orden de inserción
+        # que el doble bucle, así los recorridos desempatan igual. Se consumen
+        # por bloque, sin juntar todas (con k, nunca hay O(n²) en memoria).
+        for bloque in motor.bloques_aristas(umbral=umbral):
+            for algoritmo, aristas in bloque.items():
+                colector = colectores[algoritmo]
+                for i, j, score in aristas:
+                    colector.agregar(ids[i], ids[j], score)
+
+    def reporte_aristas(self) -> dict:
+        """
+        Aristas por algoritmo: candidatas (las que superaron el umbral en la
+        última `generar_similitud`, contando ambos sentidos), guardadas (las
+        entradas actuales de las listas), descartadas por el límite k y una
+        estimación de la memoria ahorrada en bytes.
+        """
+        reporte = {}
+        for algoritmo, adyacencia, k in (
+            ("similares", self.adyacencia_similitud, self.k_similares),
+            ("maraton", self.adyacencia_maraton, self.k_maraton),
+        ):
+            guardadas = _cantidad_aristas(adyacencia)
+            candidatas = self._candidatas.get(algoritmo, guardadas)
+            descartadas = max(candidatas - guardadas, 0)
+            reporte[algoritmo] = {
+                "k": k,
+                "candidatas": candidatas,
+                "guardadas": guardadas,
+                "descartadas": descartadas,
+                "bytes_ahorrados": descartadas * _BYTES_POR_ARISTA,
+            }
+        return reporte
+
+    def imprimir_reporte_aristas(self):
+        """Muestra `reporte_aristas` en forma de tabla."""
+        print("\n📉 ARISTAS DEL GRAFO")
+        print("=" * 72)
+        print(f"  {'algoritmo':<12}{'k':>6}{'candidatas':>13}{'guardadas':>12}{'ahorro':>14}")
+        for algoritmo, datos in self.reporte_aristas().items():
+            k = "-" if datos["k"] is None else datos["k"]
+            ahorro = f"{datos['bytes_ahorrados'] / 2**20:.1f} MiB"
+            print(
+                f"  {algoritmo:<12}{k:>6}{datos['candidatas']:>13}{datos['guardadas']:>12}{ahorro:>14}"
+            )
+        print("=" * 72)
 
     def generar_orden(self):
         """Genera las aristas de orden entre los contenidos del grafo
@@ -86,6 +442,138 @@ class GrafoContenido:
                 if sec in self.vertices_contenido:  # Verificar que la secuela exista en el grafo
                     self.adyacencia_orden_sagas[c.id].append(sec)  # Agregar arista de orden
 
+    # --- Mantenimiento incremental ---
+
+    def _obtener_indice_candidatos(self) -> IndiceCandidatos:
+        """Índice de candidatos del grafo (se construye si el motor usado no lo dejó)."""
+        if self._indice_candidatos is None:
+            self._indice_candidatos = self._construir_indice_candidatos(self.umbral, self.tipo)
+        return self._indice_candidatos
+
+    def _quitar_aristas(self, adyacencia, nodo_id, vecinos):
+        """Quita las aristas hacia `nodo_id` de la lista de cada vecino (copia y reemplaza)."""
+        for vecino_id in vecinos:
+            lista = adyacencia.get(vecino_id)
+            if lista is not None:
+                nueva = [v for v in lista if v[0] != nodo_id]
+                if len(nueva) != len(lista):
+                    adyacencia[vecino_id] = nueva
+
+    def _apuntan_a(self, adyacencia, nodo_id, k, indice) -> set:
+        """
+        Nodos cuya lista puede tener una arista hacia `nodo_id`. Sin límite k las
+        aristas son simétricas y alcanza con sus propios vecinos; con k, cualquier
+        candidato del índice pudo haberlo guardado aunque `nodo_id` no lo guarde.
+        """
+        vecinos = {v[0] for v in adyacencia.get(nodo_id, [])}
+        if k is not None:
+            vecinos.update(indice.candidatos(self.vertices_contenido[nodo_id]))
+        return vecinos
+
+    def actualizar_vertice(self, contenido):
+        """
+        Agrega o reemplaza un contenido y recalcula SOLO sus aristas de similitud,
+        maratón y orden, sin reconstruir el grafo. Usa el `tipo` y `umbral` de la
+        última `generar_similitud`.
+
+        Las listas de adyacencia afectadas se reemplazan por listas nuevas ya
+        completas, de modo que un recorrido en curso nunca ve una lista a medias.
+        Cada lista queda en el orden canónico (score descendente y, a igual
+        score, posición en el catálogo), igual que tras reconstruir el grafo.
+
+        Con límite k (ver `generar_similitud`), las aristas que se liberan al
+        reemplazar o eliminar no rescatan vecinos descartados en la construcción:
+        eso recién ocurre en la próxima `generar_similitud`.
+
+        Args:
+            contenido (ContenidoBase): El contenido nuevo o modificado.
+        """
+        nodo_id = contenido.id
+        indice = self._obtener_indice_candidatos()
+
+        # 1. Quitar las aristas viejas del vértice (si existía)
+        if nodo_id in self.vertices_contenido:
+            for adyacencia, k in (
+                (self.adyacencia_similitud, self.k_similares),
+                (self.adyacencia_maraton, self.k_maraton),
+            ):
+                vecinos = self._apuntan_a(adyacencia, nodo_id, k, indice)
+                self._quitar_aristas(adyacencia, nodo_id, vecinos)
+
+        # 2. Puntuar solo contra los candidatos del índice
+        indice.agregar(contenido)
+        similares, maraton = [], []
+        # El orden final lo fija `_clave_vecino`; este solo hace la iteración reproducible
+        for vecino_id in sorted(indice.candidatos(contenido)):
+            vecino = self.vertices_contenido.get(vecino_id)
+            if vecino is None:
+                continue
+            score_similares = obtener_pesos_aristas(contenido, vecino, self.tipo, "similares")
+            score_maraton = obtener_pesos_aristas(contenido, vecino, self.tipo, "maraton")
+            if score_similares >= self.umbral:
+                similares.append((vecino_id, score_similares))
+            if score_maraton >= self.umbral:
+                maraton.append((vecino_id, score_maraton))
+
+        # 3. Publicar el vértice y sus aristas (en ambos sentidos), manteniendo
+        # cada lista ordenada por score (inserción ordenada en la copia) y,
+        # si hay límite k, solo con los k mejores vecinos de cada nodo.
+        self._registrar_posicion(nodo_id)
+        clave = _clave_vecino(self._posiciones)
+        similares.sort(key=clave)
+        maraton.sort(key=clave)
+        self.vertices_contenido[nodo_id] = contenido
+        for adyacencia, aristas, k in (
+            (self.adyacencia_similitud, similares, self.k_similares),
+            (self.adyacencia_maraton, maraton, self.k_maraton),
+        ):
+            adyacencia[nodo_id] = aristas[:k]
+            for vecino_id, score in aristas:
+                lista = list(adyacencia.get(vecino_id, []))
+                insort(lista, (nodo_id, score), key=clave)
+                adyacencia[vecino_id] = lista[:k]
+
+        # 4. Orden de sagas: sus secuelas y quienes lo tienen como secuela
+        self.adyacencia_orden_sagas[nodo_id] = [
+            sec for sec in contenido.ids_secuelas if sec in self.vertices_contenido
+        ]
+        for previo_id in indice.referencian(nodo_id):
+            orden = self.adyacencia_orden_sagas.get(previo_id, [])
+            if nodo_id not in orden:
+                self.adyacencia_orden_sagas[previo_id] = orden + [nodo_id]
+
+    def eliminar_vertice(self, nodo_id) -> bool:
+        """
+        Elimina un contenido del grafo junto con todas las aristas que lo apuntan.
+        Devuelve True si se eliminó, False si no existía.
+
+        Args:
+            nodo_id (str): El ID del contenido.
+        """
+        if nodo_id not in self.vertices_contenido:
+            return False
+
+        indice = self._obtener_indice_candidatos()
+        for adyacencia, k in (
+            (self.adyacencia_similitud, self.k_similares),
+            (self.adyacencia_maraton, self.k_maraton),
+        ):
+            vecinos = self._apuntan_a(adyacencia, nodo_id, k, indice)
+            self._quitar_aristas(adyacencia, nodo_id, vecinos)
+            adyacencia.pop(nodo_id, None)
+
+        for previo_id in indice.referencian(nodo_id):
+            orden = self.adyacencia_orden_sagas.get(previo_id)
+            if orden and nodo_id in orden:
+                self.adyacencia_orden_sagas[previo_id] = [s for s in orden if s != nodo_id]
+        self.adyacencia_orden_sagas.pop(nodo_id, None)
+
+        indice.eliminar(nodo_id)
+        del self.vertices_contenido[nodo_id]
+        # Si vuelve, se agrega al final del catálogo: toma una posición nueva.
+        del self._posiciones[nodo_id]
+        return True
+
     def construir_desde_contenidos(self, contenidos, tipo: str = None):
         """
         Conveniencia: construye el grafo a partir de una lista de contenidos.
@@ -123,61 +611,77 @@ class GrafoContenido:
                 # Asumimos que item ya es un objeto con atributo `id`
                 self.agregar(item)
 
-    def dfs_autoplay(self, start_id):
+    def iter_dfs_autoplay(self, start_id, profundidad_maxima=None):
         """
-        implementacion de DFS para `autoplay`.
-        toma el id de un contenido puntual
-        - **retorna** un recorrido en profundidad basado en similitud de contenidos,
-        priorizando aquellos con mayor score de similitud.
+        Generador del DFS de `autoplay`: entrega los ids a medida que los visita,
+        así quien consume puede mostrar los primeros sin esperar al resto y el
+        recorrido se detiene apenas se deja de pedir (p. ej. con `islice`).
 
         Args:
             start_id (str): id del contenido inicial
+            profundidad_maxima (int, opcional): saltos máximos desde el inicial
+                (en el árbol del DFS); sin límite por defecto.
         """
-        # lista de nodos visitados en orden
-        visitados = []
+        _validar_limite(profundidad_maxima, "profundidad_maxima")
+        # 💡 visitados (set, consulta O(1)); el orden lo da el propio generador
+        visitados = set()
 
-        # Pila para DFS
+        # Pila para DFS: (nodo, profundidad)
         pila = Pila()
-        pila.apilar(start_id)
+        pila.apilar((start_id, 0))
 
         # DFS iterativo
         while not pila.esta_vacia():  # Mientras haya nodos por visitar
-            nodo_id = pila.desapilar()  # Obtener el nodo superior de la pila
+            nodo_id, profundidad = pila.desapilar()  # Obtener el nodo superior de la pila
 
             if nodo_id not in visitados:  # Si no ha sido visitado
-                visitados.append(nodo_id)  # Marcar como visitado
-                vecinos = self.adyacencia_similitud.get(nodo_id, [])  # Obtener vecinos
-
-                # ordenar vecinos por score descendente
-                vecinos_ordenados = sorted(
-                    vecinos,
-                    # ordenar por el índice 1, que es el score.
-                    key=lambda v: v[1], 
-                    reverse=True,
-                )
+                visitados.add(nodo_id)  # Marcar como visitado
+                yield nodo_id
+                if profundidad_maxima is not None and profundidad >= profundidad_maxima:
+                    continue
+                # Vecinos ya ordenados por score descendente (ver `ordenar_vecinos`)
+                vecinos = _ids_vecinos(self.adyacencia_similitud, nodo_id)
 
                 # agregamos al stack en orden inverso para mantener score descendente
-                for vecino_tuple in reversed(vecinos_ordenados):
-                    vecino_id = vecino_tuple[0] # Extraemos el ID del índice 0
+                for vecino_id in reversed(vecinos):
                     if vecino_id not in visitados:  # Si el vecino no ha sido visitado
-                        pila.apilar(vecino_id)  # Apilar el vecino para visitar luego
+                        pila.apilar((vecino_id, profundidad + 1))  # Apilar el vecino para visitar luego
 
-        return visitados[:7]
-
-    def bfs_ver_similar(self, start_id):
+    def dfs_autoplay(self, start_id, k=RESULTADOS_RECORRIDO, profundidad_maxima=None):
         """
-        implementacion de BFS para `ver contenido similar`.
-        toma el id de un contenido puntual.
-        - **retorna** un recorrido en anchura basado en similitud de contenidos,
+        implementacion de DFS para `autoplay`.
+        toma el id de un contenido puntual
+        - **retorna** un recorrido en profundidad basado en similitud de contenidos,
         priorizando aquellos con mayor score de similitud.
 
+        El recorrido termina apenas junta `k` contenidos (ver `iter_dfs_autoplay`),
+        así que su costo depende de `k` y no del tamaño de la componente.
+
+        Args:
+            start_id (str): id del contenido inicial
+            k (int, opcional): cantidad máxima de resultados (None = todos).
+            profundidad_maxima (int, opcional): saltos máximos desde el inicial.
+        """
+        _validar_limite(k, "k")
+        return list(islice(self.iter_dfs_autoplay(start_id, profundidad_maxima), k))
+
+    def iter_bfs_ver_similar(self, start_id, profundidad_maxima=None):
+        """
+        Generador del BFS de `ver contenido similar`: entrega los ids por nivel
+        a medida que los visita y se detiene apenas se deja de pedir.
+
         Args:
             start_id (str): id del contenido inicial
+            profundidad_maxima (int, opcional): saltos máximos desde el inicial;
+                sin límite por defecto.
         """
-        # lista de nodos visitados en orden
-        visitados = []
+        _validar_limite(profundidad_maxima, "profundidad_maxima")
+        # 💡 visitados (set, consulta O(1)); el orden lo da el propio generador
+        visitados = set()
+        # Cada nodo entra una sola vez a la cola: su profundidad va aparte.
+        profundidades = {start_id: 0}
 
-        # Cola para BFS
+        # Cola para BFS (`vecino in cola` también es O(1))
         cola = Cola()
         cola.encolar(start_id)
 
@@ -186,25 +690,36 @@ class GrafoContenido:
             nodo_id = cola.desencolar()  # Obtener el nodo frontal de la cola
 
             if nodo_id not in visitados:  # Si no ha sido visitado
-                visitados.append(nodo_id)  # Marcar como visitado
-                vecinos = self.adyacencia_maraton.get(nodo_id, [])  # Obtener vecinos
-
-                # ordenar vecinos por score descendente
-                vecinos_ordenados = sorted(
-                    vecinos,
-                    # ¡CAMBIO CLAVE! 'v' YA NO ES UN ID. 'v' es la tupla (ID, score).
-                    # Debes ordenar por el índice 1, que es el score.
-                    key=lambda v: v[1], 
-                    reverse=True,
-                )
-
-                for vecino_tuple in vecinos_ordenados:  # Iterar sobre vecinos
+                visitados.add(nodo_id)  # Marcar como visitado
+                yield nodo_id
+                profundidad = profundidades.pop(nodo_id)
+                if profundidad_maxima is not None and profundidad >= profundidad_maxima:
+                    continue
+                # Vecinos ya ordenados por score descendente (ver `ordenar_vecinos`)
+                vecinos = _ids_vecinos(self.adyacencia_maraton, nodo_id)
+
+                for vecino_id in vecinos:  # Iterar sobre vecinos
                     # Si el vecino no ha sido visitado ni está en la cola
-                    vecino_id = vecino_tuple[0]
                     if vecino_id not in visitados and vecino_id not in cola:
+                        profundidades[vecino_id] = profundidad + 1
                         cola.encolar(vecino_id)  # Encolar el vecino para visitar luego
 
-        return visitados[:7]
+    def bfs_ver_similar(self, start_id, k=RESULTADOS_RECORRIDO, profundidad_maxima=None):
+        """
+        implementacion de BFS para `ver contenido similar`.
+        toma el id de un contenido puntual.
+        - **retorna** un recorrido en anchura basado en similitud de contenidos,
+        priorizando aquellos con mayor score de similitud.
+
+        El recorrido termina apenas junta `k` contenidos (ver `iter_bfs_ver_similar`).
+
+        Args:
+            start_id (str): id del contenido inicial
+            k (int, opcional): cantidad máxima de resultados (None = todos).
+            profundidad_maxima (int, opcional): saltos máximos desde el inicial.
+        """
+        _validar_limite(k, "k")
+        return list(islice(self.iter_bfs_ver_similar(start_id, profundidad_maxima), k))
 
     def generar_topologico(self, start_id=None):
         """Genera un orden topológico de contenidos puntuales en el grafo
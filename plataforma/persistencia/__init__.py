@@ -0,0 +1,70 @@
+from .wal import RegistroWAL, escribir_json_atomico, UMBRAL_COMPACTACION
+from .almacen import (
+    AlmacenBase,
+    coincide_contenido,
+    migrar,
+    MODO_COMPLETO,
+    MODO_WAL,
+    MOTOR_JSON,
+    MOTOR_SQLITE,
+    MOTOR_BINARIO,
+)
+from .almacen_json import AlmacenJSON
+from .indice_trigramas import IndiceTrigramas, normalizar_texto
+from .consultas import (
+    Consulta,
+    Etiqueta,
+    PalabraClave,
+    Director,
+    Actor,
+    Anio,
+    Y,
+    O,
+    No,
+    paginar,
+)
+from .indice_postings import IndicePostings
+from .indice_clientes import IndiceClientes
+from .ranking import EstadisticasBM25, consulta_bm25, tokenizar
+from .lector_json import iterar_registros_json
+from .almacen_binario import AlmacenBinario, exportar_binario
+from .almacen_sqlite import AlmacenSQLite, AlmacenSQLiteContenidos, AlmacenSQLiteClientes
+
+
+__all__ = [
+    "RegistroWAL",
+    "escribir_json_atomico",
+    "UMBRAL_COMPACTACION",
+    "AlmacenBase",
+    "AlmacenJSON",
+    "iterar_registros_json",
+    "IndiceTrigramas",
+    "normalizar_texto",
+    "Consulta",
+    "Etiqueta",
+    "PalabraClave",
+    "Director",
+    "Actor",
+    "Anio",
+    "Y",
+    "O",
+    "No",
+    "paginar",
+    "IndicePostings",
+    "IndiceClientes",
+    "EstadisticasBM25",
+    "consulta_bm25",
+    "tokenizar",
+    "AlmacenSQLite",
+    "AlmacenSQLiteContenidos",
+    "AlmacenSQLiteClientes",
+    "AlmacenBinario",
+    "exportar_binario",
+    "coincide_contenido",
+    "migrar",
+    "MODO_COMPLETO",
+    "MODO_WAL",
+    "MOTOR_JSON",
+    "MOTOR_SQLITE",
+    "MOTOR_BINARIO",
+]
@@ -0,0 +1,42 @@
+"""
+Comandos de mantenimiento de la base de datos.
+
+Ej:
+    python -m plataforma.persistencia exportar db/peliculas.json
+    python -m plataforma.persistencia exportar db/peliculas.json -o /tmp/peliculas.bin
+"""
+
+import argparse
+import os
+from .almacen_binario import exportar_binario
+from .almacen_json import AlmacenJSON
+
+
+def exportar(origen: str, destino: str | None = None, clave: str | None = None) -> str:
+    """Compila un JSON de `db/` al catálogo binario. Devuelve la ruta generada."""
+    base = os.path.splitext(origen)[0]
+    clave = clave or os.path.basename(base)
+    destino = destino or f"{base}.bin"
+
+    almacen = AlmacenJSON(origen, clave)
+    cantidad = exportar_binario(almacen.registros(), destino)
+    print(f"Exportados {cantidad} registros de '{origen}' a '{destino}'.")
+    return destino
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog="python -m plataforma.persistencia")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p_exportar = comandos.add_parser("exportar", help="compila un JSON de db/ a catálogo binario (.bin)")
+    p_exportar.add_argument("origen", help="archivo JSON (p. ej. db/peliculas.json)")
+    p_exportar.add_argument("-o", "--destino", help="archivo .bin (por defecto, junto al JSON)")
+    p_exportar.add_argument("--clave", help="clave raíz del JSON (por defecto, el nombre del archivo)")
+
+    args = parser.parse_args(argumentos)
+    if args.comando == "exportar":
+        exportar(args.origen, args.destino, args.clave)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Interfaz común de los motores de almacenamiento de los repositorios
+(`DBContenidos`, `DBClientes`).
+
+Un almacén guarda registros crudos (diccionarios con una clave "id") y sabe
+persistirlos. Los repositorios se ocupan de convertirlos a TDA, de la caché
+de objetos hidratados y de avisar a los observadores; el almacén solo decide
+DÓNDE y CÓMO viven los datos (JSON en memoria, SQLite en disco, ...).
+
+Protocolo de escritura (igual para todos los motores):
+    almacen.guardar(registro)       # aplica el cambio (visible para las lecturas)
+    almacen.persistir([operacion])  # lo confirma en disco
+
+y para agrupar cambios:
+    almacen.iniciar_transaccion()
+    ... guardar / eliminar ...
+    almacen.persistir(operaciones)  # o almacen.deshacer_transaccion()
+"""
+
+from .consultas import Consulta, consulta_de_filtros
+from .indice_clientes import CAMPOS_FECHA, coincide_fecha, esta_activo, fecha_texto, rango_fechas
+from .indice_trigramas import normalizar_texto
+from .ranking import EstadisticasBM25, TopK, puntuar_registro, terminos_registro
+
+
+# Modos de escritura: reescritura completa del archivo o Write-Ahead Log.
+MODO_COMPLETO = "completo"
+MODO_WAL = "wal"
+
+# Índices perezosos que se pueden armar al precargar (`AlmacenBase._indice_<nombre>`).
+INDICES = ("texto", "consultas", "clientes")
+
+# Motores disponibles.
+MOTOR_JSON = "json"
+MOTOR_SQLITE = "sqlite"
+MOTOR_BINARIO = "binario"
+
+
+def _igual(a, b, ignorar_mayusculas: bool) -> bool:
+    if ignorar_mayusculas and isinstance(a, str) and isinstance(b, str):
+        return a.lower() == b.lower()
+    return a == b
+
+
+def coincide_contenido(data: dict, titulo=None, etiquetas=None, palabras_claves=None, id_contenido=None) -> bool:
+    """
+    Aplica los filtros de `NuevoCatalogo.buscar` sobre un registro crudo de contenido.
+    Es la referencia que deben respetar las consultas de los motores.
+    """
+    # Busqueda por ID (subcadena, sin distinguir mayúsculas ni acentos)
+    if id_contenido and normalizar_texto(id_contenido) not in normalizar_texto(data.get("id") or ""):
+        return False
+
+    # Busqueda por título (subcadena, sin distinguir mayúsculas ni acentos)
+    if titulo and normalizar_texto(titulo) not in normalizar_texto(data.get("titulo") or ""):
+        return False
+
+    # Busqueda por etiquetas: alcanza con tener alguna
+    if etiquetas and not any(e in (data.get("etiquetas") or {}) for e in etiquetas):
+        return False
+
+    # Busqueda por palabras clave: alcanza con compartir alguna
+    if palabras_claves and set(palabras_claves).isdisjoint(data.get("palabras_claves") or ()):
+        return False
+
+    return True
+
+
+class AlmacenBase:
+    """
+    Interfaz de un motor de almacenamiento de registros identificados por "id".
+
+    Las consultas (`buscar_por`, `buscar_contenidos`) tienen una implementación
+    por recorrido completo que sirve para cualquier motor; los motores con
+    índices (SQLite) las redefinen como consultas indexadas. Los motores en
+    memoria pueden ofrecer además un índice de trigramas (`_indice_texto`) para
+    acotar las búsquedas por título/id, y listas invertidas (`_indice_consultas`)
+    para las consultas por rasgos.
+    """
+
+    # --- Lectura ---
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, registro_id) -> bool:
+        return self.obtener(registro_id) is not None
+
+    def obtener(self, registro_id: str) -> dict | None:
+        """Registro crudo con ese id, o None."""
+        raise NotImplementedError
+
+    def registros(self):
+        """Secuencia (en orden de alta) de todos los registros crudos."""
+        raise NotImplementedError
+
+    def ids(self) -> list[str]:
+        """IDs de todos los registros, en orden de alta."""
+        return [data.get("id") for data in self.registros()]
+
+    def iter_registros(self):
+        """
+        Genera los registros de a uno, en orden de alta, con memoria acotada
+        (para recorridos completos: exportaciones, análisis, construcción de grafos).
+        """
+        yield from self.registros()
+
+    # --- Consultas ---
+
+    def buscar_por(self, campo: str, valor, ignorar_mayusculas: bool = False) -> list[dict]:
+        """Registros cuyo `campo` es igual a `valor` (en orden de alta)."""
+        if campo == "id" and not ignorar_mayusculas:
+            data = self.obtener(valor)
+            return [] if data is None else [data]
+        return [
+            data for data in self.registros()
+            if _igual(data.get(campo), valor, ignorar_mayusculas)
+        ]
+
+    def _indice_texto(self):
+        """Índice de trigramas de títulos/ids (`IndiceTrigramas`), o None si el motor no tiene."""
+        return None
+
+    def _indice_consultas(self):
+        """Listas invertidas de rasgos (`IndicePostings`), o None si el motor no tiene."""
+        return None
+
+    def _indice_clientes(self):
+        """Índices secundarios de clientes (`IndiceClientes`), o None si el motor no tiene."""
+        return None
+
+    def buscar_contenidos(self, titulo=None, etiquetas=None, palabras_claves=None, id_contenido=None):
+        """Genera los registros de contenido que pasan los filtros de `coincide_contenido`."""
+        ids = None
+        indice = self._indice_texto() if (titulo or id_contenido) else None
+        if indice is not None:
+            # Subcadenas de título/id ya verificadas por el índice.
+            ids = indice.buscar(titulo=titulo, id_contenido=id_contenido)
+            titulo = id_contenido = None
+
+        filtro = consulta_de_filtros(etiquetas, palabras_claves)
+        postings = self._indice_consultas() if filtro is not None else None
+        if postings is not None:
+            # Etiquetas / palabras clave: unión de sus postings.
+            encontrados = postings.buscar(filtro)
+            if ids is not None:
+                encontrados_set = set(encontrados)
+                encontrados = [i for i in ids if i in encontrados_set]
+            ids = encontrados
+            etiquetas = palabras_claves = None
+
+        # Solo se leen los registros candidatos (o todos, si no hay índices).
+        registros = self.registros() if ids is None else (self.obtener(i) for i in ids)
+        for data in registros:
+            if coincide_contenido(data, titulo, etiquetas, palabras_claves, id_contenido):
+                yield data
+
+    def consultar(self, consulta: Consulta) -> list[str]:
+        """Ids (en orden de alta) de los registros que cumplen una `Consulta`."""
+        postings = self._indice_consultas()
+        if postings is not None:
+            return postings.buscar(consulta)
+        return [data.get("id") for data in self.registros() if consulta.coincide(data)]
+
+    def clientes_por_nombre(self, nombre: str) -> list[str]:
+        """Ids (en orden de alta) de los clientes con ese nombre, sin distinguir mayúsculas."""
+        indice = self._indice_clientes()
+        if indice is not None:
+            return indice.por_nombre(nombre)
+        return [data.get("id") for data in self.buscar_por("nombre", nombre, ignorar_mayusculas=True)]
+
+    def clientes_por_tipo_servicio(self, tipo_servicio: str) -> list[str]:
+        """Ids (en orden de alta) de los clientes con ese tipo de servicio."""
+        indice = self._indice_clientes()
+        if indice is not None:
+            return indice.por_tipo_servicio(tipo_servicio)
+        return [data.get("id") for data in self.buscar_por("tipo_servicio", tipo_servicio)]
+
+    def clientes_por_fecha(self, campo: str, desde=None, hasta=None) -> list[str]:
+        """
+        Ids de los clientes con `campo` ("fecha_alta" o "fecha_baja") entre
+        `desde` y `hasta` (incluidos, opcionales), ordenados por esa fecha.
+        """
+        if campo not in CAMPOS_FECHA:
+            raise ValueError(f"Campo de fecha no indexado: {campo}")
+        indice = self._indice_clientes()
+        if indice is not None:
+            return indice.por_fecha(campo, desde, hasta)
+        desde, hasta = rango_fechas(desde, hasta)
+        encontrados = [
+            (data[campo], orden, data.get("id"))
+            for orden, data in enumerate(self.iter_registros())
+            if coincide_fecha(data.get(campo), desde, hasta)
+        ]
+        return [registro_id for *_, registro_id in sorted(encontrados)]
+
+    def clientes_activos(self, fecha=None) -> list[str]:
+        """
+        Ids de los clientes activos en `fecha` (ordenados por fecha de alta) o,
+        sin fecha, de los que no tienen baja (en orden de alta).
+        """
+        indice = self._indice_clientes()
+        if indice is not None:
+            return indice.activos(fecha)
+        fecha = fecha_texto(fecha)
+        activos = [
+            (data.get("fecha_alta") if fecha else "", orden, data.get("id"))
+            for orden, data in enumerate(self.iter_registros())
+            if esta_activo(data, fecha)
+        ]
+        return [registro_id for *_, registro_id in sorted(activos)]
+
+    def estadisticas_bm25(self, terminos) -> EstadisticasBM25:
+        """Estadísticas de colección para puntuar `terminos` con BM25 (ver `ranking`)."""
+        postings = self._indice_consultas()
+        if postings is not None:
+            return postings.estadisticas_bm25(terminos)
+        estadisticas = EstadisticasBM25()
+        buscados = set(terminos)
+        for data in self.iter_registros():
+            frecuencias = terminos_registro(data)
+            estadisticas.cantidad += 1
+            estadisticas.largo_total += sum(frecuencias.values())
+            for termino in buscados.intersection(frecuencias):
+                estadisticas.frecuencias[termino] = estadisticas.frecuencias.get(termino, 0) + 1
+        return estadisticas
+
+    def rankear(
+        self, consulta: dict[str, int], etiquetas=(), k: int = 10, estadisticas: EstadisticasBM25 | None = None
+    ) -> list[tuple[float, int, str]]:
+        """
+        Los `k` registros más relevantes para `consulta` (términos -> repeticiones),
+        como `(puntaje, orden, id)` de mayor a menor puntaje; `orden` desempata
+        por orden de alta. Sin índice se recorren los registros de a uno, sin
+        guardar más que los k mejores.
+        """
+        postings = self._indice_consultas()
+        if postings is not None:
+            return postings.rankear(consulta, etiquetas, k, estadisticas)
+        top = TopK(k)
+        if k == 0 or not (consulta or etiquetas):
+            return top.resultados()
+        if estadisticas is None:
+            estadisticas = self.estadisticas_bm25(consulta)
+        for orden, data in enumerate(self.iter_registros()):
+            puntaje = puntuar_registro(data, consulta, etiquetas, estadisticas)
+            if puntaje > 0:
+                top.agregar(puntaje, orden, data.get("id"))
+        return top.resultados()
+
+    # --- Escritura ---
+
+    def guardar(self, registro: dict):
+        """Inserta o reemplaza (por id) un registro, sin confirmarlo todavía."""
+        raise NotImplementedError
+
+    def eliminar(self, registro_id: str) -> bool:
+        """Quita un registro, sin confirmarlo todavía. False si no existía."""
+        raise NotImplementedError
+
+    def persistir(self, operaciones: list[dict]):
+        """Confirma los cambios ya aplicados (y la transacción abierta, si la hay)."""
+        raise NotImplementedError
+
+    def iniciar_transaccion(self):
+        """Marca el punto al que vuelve `deshacer_transaccion`."""
+        raise NotImplementedError
+
+    def deshacer_transaccion(self):
+        """Descarta todos los cambios desde `iniciar_transaccion`."""
+        raise NotImplementedError
+
+    # --- Mantenimiento ---
+
+    def importar(self, registros):
+        """Carga muchos registros en una sola transacción (p. ej. para migrar de motor)."""
+        operaciones = []
+        self.iniciar_transaccion()
+        try:
+            for data in registros:
+                self.guardar(data)
+                operaciones.append({"op": "guardar", "id": data.get("id"), "registro": data})
+        except BaseException:
+            self.deshacer_transaccion()
+            raise
+        self.persistir(operaciones)
+        return len(operaciones)
+
+    def precargar(self, indices=()):
+        """
+        Trae a memoria lo que el motor carga en su primer uso y arma de antemano
+        los `indices` pedidos ("texto", "consultas" y/o "clientes"; ver `_indice_*`).
+        """
+        for nombre in indices:
+            if nombre not in INDICES:
+                raise ValueError(f"Índice desconocido: {nombre}")
+            getattr(self, f"_indice_{nombre}")()
+
+    def tarea_precarga(self, indices=()):
+        """
+        Función sin argumentos y serializable (pickle) que hace la precarga en
+        OTRO proceso y devuelve el estado para `adoptar_estado`, o None si el
+        motor no se puede cargar fuera de este proceso (por defecto).
+        """
+        return None
+
+    def adoptar_estado(self, estado) -> bool:
+        """Instala el estado que devolvió `tarea_precarga`. False si ya no hacía falta."""
+        return False
+
+    def compactar(self, en_segundo_plano: bool = True):
+        """Reorganiza el almacenamiento si el motor lo necesita (por defecto, nada)."""
+
+    def cerrar(self):
+        """Libera archivos/conexiones (por defecto, nada)."""
+
+
+def migrar(origen: AlmacenBase, destino: AlmacenBase) -> int:
+    """
+    Copia todos los registros de un almacén a otro (p. ej. de JSON a SQLite).
+    Devuelve la cantidad de registros copiados.
+
+    Ej:
+        migrar(AlmacenJSON("db/peliculas.json", "peliculas"),
+               AlmacenSQLiteContenidos("db/peliculas.sqlite3"))
+    """
+    return destino.importar(origen.registros())
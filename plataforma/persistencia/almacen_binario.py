@@ -0,0 +1,248 @@
+"""
+Catálogo binario compilado, de solo lectura, que se abre con `mmap`.
+
+Se genera desde el JSON con `exportar_binario` (o `python -m plataforma.persistencia
+exportar ...`) y permite buscar un registro por id sin leer el resto del archivo:
+abrirlo cuesta lo mismo con 10 que con 10 millones de títulos, en memoria solo
+quedan las páginas de los registros que se tocan, y varios procesos que abren
+el mismo archivo comparten el page cache del sistema operativo.
+
+Formato (enteros little-endian):
+
+    cabecera    MAGIA (8 bytes) | cantidad u32 | ancho_id u16 | version u16
+                | inicio_posiciones u64 | inicio_ids u64 | inicio_datos u64
+    posiciones  cantidad x u64: offset de cada registro, en el orden original
+    ids         cantidad x (id UTF-8 rellenado con \\0 hasta ancho_id | posición u32),
+                ordenada por id -> búsqueda binaria de ancho fijo
+    datos       por registro: largo u32 | registro en JSON UTF-8
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from .almacen import AlmacenBase
+from .indice_postings import IndicePostings
+from .indice_trigramas import IndiceTrigramas
+from .wal import _reemplazar_atomico
+
+
+MAGIA = b"PLATCAT\x00"
+VERSION_FORMATO = 1
+
+_CABECERA = struct.Struct("<8sIHHQQQ")
+_POSICION = struct.Struct("<Q")
+_LARGO = struct.Struct("<I")
+
+
+def exportar_binario(registros, ruta: str) -> int:
+    """
+    Compila una secuencia de registros crudos (con "id") al formato binario.
+    Escribe en un temporal propio (que se borra si algo falla) y lo renombra:
+    quien tenga abierto el archivo anterior lo sigue leyendo sin problemas. Devuelve la cantidad exportada.
+    """
+    datos = []
+    ids = {}
+    for data in registros:
+        registro_id = data.get("id")
+        if not registro_id:
+            raise ValueError("Todos los registros deben tener un 'id' válido.")
+        clave = str(registro_id).encode("utf-8")
+        if b"\x00" in clave:
+            raise ValueError(f"ID inválido para el catálogo binario: {registro_id!r}")
+        if clave in ids:
+            raise ValueError(f"ID duplicado en el catálogo: {registro_id}")
+        ids[clave] = len(datos)
+        datos.append(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    cantidad = len(datos)
+    ancho_id = max((len(clave) for clave in ids), default=0)
+    entrada_id = struct.Struct(f"<{ancho_id}sI")
+
+    inicio_posiciones = _CABECERA.size
+    inicio_ids = inicio_posiciones + cantidad * _POSICION.size
+    inicio_datos = inicio_ids + cantidad * entrada_id.size
+
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    def escribir(f):
+        f.write(_CABECERA.pack(
+            MAGIA, cantidad, ancho_id, VERSION_FORMATO,
+            inicio_posiciones, inicio_ids, inicio_datos,
+        ))
+
+        offset = inicio_datos
+        for blob in datos:
+            f.write(_POSICION.pack(offset))
+            offset += _LARGO.size + len(blob)
+
+        for clave in sorted(ids):
+            f.write(entrada_id.pack(clave, ids[clave]))
+
+        for blob in datos:
+            f.write(_LARGO.pack(len(blob)))
+            f.write(blob)
+
+    _reemplazar_atomico(ruta, escribir, binario=True)
+    return cantidad
+
+
+class _RegistrosBinarios(Sequence):
+    """Secuencia de los registros del catálogo binario: cada acceso decodifica uno solo."""
+
+    def __init__(self, almacen: "AlmacenBinario"):
+        self._almacen = almacen
+
+    def __len__(self):
+        return len(self._almacen)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._almacen._registro_en(i) for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de registro fuera de rango.")
+        return self._almacen._registro_en(indice)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._almacen._registro_en(i)
+
+    def ids(self) -> list[str]:
+        return self._almacen.ids()
+
+
+class AlmacenBinario(AlmacenBase):
+    """
+    Motor de almacenamiento de solo lectura sobre un catálogo binario
+    (ver `exportar_binario`). Las búsquedas por id son una búsqueda binaria
+    sobre la tabla de ids de ancho fijo, directamente en el `mmap`.
+
+    Args:
+        ruta (str): archivo generado por `exportar_binario`.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._archivo.close()
+            raise ValueError(f"El archivo '{ruta}' está vacío: no es un catálogo binario.")
+
+        if len(self._mapa) < _CABECERA.size:
+            self.cerrar()
+            raise ValueError(f"El archivo '{ruta}' no es un catálogo binario válido.")
+        (
+            magia, self._cantidad, self._ancho_id, version,
+            self._inicio_posiciones, self._inicio_ids, self._inicio_datos,
+        ) = _CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA or version != VERSION_FORMATO:
+            self.cerrar()
+            raise ValueError(f"El archivo '{ruta}' no es un catálogo binario válido (versión {VERSION_FORMATO}).")
+        self._entrada_id = struct.Struct(f"<{self._ancho_id}sI")
+        # Índices de trigramas y de rasgos: se arman en la primera búsqueda que los usa.
+        self._trigramas = None
+        self._postings = None
+
+    # --- Acceso a bajo nivel ---
+
+    def _registro_en(self, posicion: int) -> dict:
+        """Decodifica el registro que está en `posicion` (orden original)."""
+        (offset,) = _POSICION.unpack_from(self._mapa, self._inicio_posiciones + posicion * _POSICION.size)
+        (largo,) = _LARGO.unpack_from(self._mapa, offset)
+        inicio = offset + _LARGO.size
+        return json.loads(self._mapa[inicio:inicio + largo].decode("utf-8"))
+
+    def _entrada(self, k: int) -> tuple[bytes, int]:
+        return self._entrada_id.unpack_from(self._mapa, self._inicio_ids + k * self._entrada_id.size)
+
+    def _buscar_posicion(self, registro_id: str) -> int | None:
+        """Búsqueda binaria del id en la tabla de ids. Devuelve su posición o None."""
+        clave = str(registro_id).encode("utf-8")
+        if len(clave) > self._ancho_id:
+            return None
+        clave = clave.ljust(self._ancho_id, b"\x00")
+
+        bajo, alto = 0, self._cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._entrada(medio)[0] < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < self._cantidad:
+            actual, posicion = self._entrada(bajo)
+            if actual == clave:
+                return posicion
+        return None
+
+    def _indice_texto(self) -> IndiceTrigramas:
+        if self._trigramas is None:
+            self._trigramas = IndiceTrigramas(self.registros())
+        return self._trigramas
+
+    def _indice_consultas(self) -> IndicePostings:
+        if self._postings is None:
+            self._postings = IndicePostings(self.registros())
+        return self._postings
+
+    # --- Lectura ---
+
+    def __len__(self):
+        return self._cantidad
+
+    def __contains__(self, registro_id):
+        return self._buscar_posicion(registro_id) is not None
+
+    def obtener(self, registro_id: str) -> dict | None:
+        posicion = self._buscar_posicion(registro_id)
+        if posicion is None:
+            return None
+        return self._registro_en(posicion)
+
+    def registros(self) -> _RegistrosBinarios:
+        return _RegistrosBinarios(self)
+
+    def ids(self) -> list[str]:
+        """IDs en el orden original, leídos de la tabla (sin decodificar registros)."""
+        ids = [None] * self._cantidad
+        for k in range(self._cantidad):
+            clave, posicion = self._entrada(k)
+            ids[posicion] = clave.rstrip(b"\x00").decode("utf-8")
+        return ids
+
+    # --- Escritura (no soportada) ---
+
+    def _solo_lectura(self):
+        raise PermissionError(
+            f"El catálogo binario '{self.ruta}' es de solo lectura: "
+            "modifica el JSON y vuelve a exportarlo."
+        )
+
+    def guardar(self, registro: dict):
+        self._solo_lectura()
+
+    def eliminar(self, registro_id: str) -> bool:
+        self._solo_lectura()
+
+    def iniciar_transaccion(self):
+        """Una transacción sin escrituras es válida: no hay nada que hacer."""
+
+    def deshacer_transaccion(self):
+        """Nada que deshacer: no se admiten escrituras."""
+
+    def persistir(self, operaciones: list[dict]):
+        if operaciones:
+            self._solo_lectura()
+
+    def cerrar(self):
+        """Libera el mapeo y el archivo."""
+        if not self._mapa.closed:
+            self._mapa.close()
+        self._archivo.close()
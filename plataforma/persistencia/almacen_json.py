@@ -0,0 +1,334 @@
+import json
+import os
+import threading
+from functools import partial
+from .almacen import AlmacenBase, MODO_COMPLETO, MODO_WAL
+from .indice_clientes import IndiceClientes
+from .indice_postings import IndicePostings
+from .indice_trigramas import IndiceTrigramas
+from .lector_json import iterar_registros_json
+from .wal import RegistroWAL
+
+
+class AlmacenJSON(AlmacenBase):
+    """
+    Motor de almacenamiento sobre un archivo JSON `{clave: registros}` que se
+    carga entero en memoria. `registros` puede ser una lista (contenidos) o un
+    diccionario id -> registro (clientes y contenidos de versiones anteriores).
+
+    El archivo se carga recién en el primer acceso que lo necesita. Un recorrido
+    con `iter_registros` antes de eso lo lee en streaming, sin cargarlo.
+    Los índices (trigramas de títulos/ids, listas invertidas de rasgos y
+    secundarios de clientes) se arman en la primera búsqueda que los usa y desde ahí se mantienen con cada
+    alta/baja.
+
+    Args:
+        ruta (str): ruta del archivo JSON (p. ej. "db/peliculas.json").
+        clave (str): clave raíz del JSON (p. ej. "peliculas" o "clientes").
+        modo_escritura (str): "completo" reescribe el JSON en cada cambio;
+            "wal" anexa cada cambio a `<ruta>.log` y compacta en segundo plano.
+    """
+
+    def __init__(self, ruta: str, clave: str, modo_escritura: str = MODO_COMPLETO):
+        if modo_escritura not in (MODO_COMPLETO, MODO_WAL):
+            raise ValueError(f"Modo de escritura no soportado: {modo_escritura}")
+        self.ruta = ruta
+        self.clave = clave
+        self.modo_escritura = modo_escritura
+
+        # Registros e índice id -> posición (lista) o id -> clave (dict), para
+        # acceso O(1). Se cargan en el primer uso (ver `datos`).
+        self._datos = None
+        self._indice_ids = {}
+        self._cargado = False
+        self._lock_carga = threading.RLock()
+        # Copia de `datos` tomada al iniciar una transacción (None = sin transacción).
+        self._respaldo = None
+        # Índices de trigramas, de rasgos y de clientes (None = todavía no se necesitaron).
+        self._trigramas = None
+        self._postings = None
+        self._clientes = None
+
+        self._wal = RegistroWAL(self.ruta) if modo_escritura == MODO_WAL else None
+
+    # --- Archivo ---
+
+    @property
+    def datos(self):
+        """Registros en memoria (lista o dict); se cargan del archivo en el primer acceso."""
+        if not self._cargado:
+            self._cargar()
+        return self._datos
+
+    def _cargar(self):
+        with self._lock_carga:
+            if self._cargado or self._datos is not None:
+                # Ya cargado (o cargándose en este mismo hilo, al reproducir el WAL).
+                return
+            self._datos = self._cargar_archivo()
+            self._reindexar()
+            # En modo "wal" se reproducen los cambios posteriores al último snapshot.
+            if self._wal is not None:
+                for operacion in self._wal.operaciones():
+                    self._aplicar_operacion(operacion)
+            self._cargado = True
+
+    def _cargar_archivo(self):
+        """Carga los registros desde el archivo JSON."""
+        if not os.path.exists(self.ruta) or os.path.getsize(self.ruta) == 0:
+            return {}
+
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data.get(self.clave, {})
+
+        except json.JSONDecodeError as e:
+            # Si el JSON está mal, hay que avisar de forma brutal.
+            print(f"Error fatal: El archivo '{self.ruta}' no tiene un formato JSON válido: {e}")
+            return {}
+        except Exception as e:
+            print(f"Error desconocido al cargar el archivo '{self.ruta}': {e}")
+            return {}
+
+    def _guardar_archivo(self):
+        """Guarda todos los registros en el archivo JSON."""
+        data = {self.clave: self.datos}
+        try:
+            with open(self.ruta, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"Error al escribir en el archivo '{self.ruta}': {e}")
+
+    # --- Índice por ID ---
+
+    def _reindexar(self):
+        """Reconstruye el índice id -> posición (lista) o id -> clave (dict)."""
+        if isinstance(self._datos, list):
+            self._indice_ids = {item.get("id"): i for i, item in enumerate(self._datos)}
+        elif isinstance(self._datos, dict):
+            self._indice_ids = {registro_id: registro_id for registro_id in self._datos}
+        else:
+            raise TypeError("Estructura de datos inesperada. Debe ser lista o dict.")
+
+    def _indice_texto(self) -> IndiceTrigramas:
+        if self._trigramas is None:
+            with self._lock_carga:
+                if self._trigramas is None:
+                    self._trigramas = IndiceTrigramas(self.registros())
+        return self._trigramas
+
+    def _indice_consultas(self) -> IndicePostings:
+        if self._postings is None:
+            with self._lock_carga:
+                if self._postings is None:
+                    self._postings = IndicePostings(self.registros())
+        return self._postings
+
+    def _indice_clientes(self) -> IndiceClientes:
+        if self._clientes is None:
+            with self._lock_carga:
+                if self._clientes is None:
+                    self._clientes = IndiceClientes(self.registros())
+        return self._clientes
+
+    # --- Lectura ---
+
+    def __len__(self):
+        return len(self.datos)
+
+    def __contains__(self, registro_id):
+        return self.obtener(registro_id) is not None
+
+    def obtener(self, registro_id: str) -> dict | None:
+        datos = self.datos
+        posicion = self._indice_ids.get(registro_id)
+        if posicion is None:
+            return None
+        return datos[posicion]
+
+    def registros(self):
+        # La lista se devuelve tal cual: es una vista "viva" de los datos.
+        if isinstance(self.datos, dict):
+            return list(self.datos.values())
+        return self.datos
+
+    def ids(self) -> list[str]:
+        return [data.get("id") for data in self.registros()]
+
+    def iter_registros(self):
+        # Sin cargar y sin cambios pendientes en el log: se lee en streaming.
+        if not self._cargado and (self._wal is None or self._wal.tamanio() == 0):
+            yield from iterar_registros_json(self.ruta, self.clave)
+            return
+        yield from self.registros()
+
+    # --- Escritura ---
+
+    def guardar(self, registro: dict):
+        datos = self.datos
+        registro_id = registro.get("id")
+
+        anterior = None
+        # Lista (estructura actual de los contenidos): inserta o reemplaza
+        if isinstance(datos, list):
+            posicion = self._indice_ids.get(registro_id)
+            if posicion is not None:
+                anterior = datos[posicion]
+                datos[posicion] = registro
+            else:
+                self._indice_ids[registro_id] = len(datos)
+                datos.append(registro)
+
+        # Dict id -> registro
+        elif isinstance(datos, dict):
+            anterior = datos.get(registro_id)
+            datos[registro_id] = registro
+            self._indice_ids[registro_id] = registro_id
+
+        else:
+            raise TypeError("Estructura de datos inesperada. Debe ser lista o dict.")
+
+        if self._trigramas is not None:
+            self._trigramas.agregar(registro)
+        if self._postings is not None:
+            self._postings.agregar(registro, anterior)
+        if self._clientes is not None:
+            self._clientes.agregar(registro, anterior)
+
+    def eliminar(self, registro_id: str) -> bool:
+        datos = self.datos
+        posicion = self._indice_ids.get(registro_id)
+        if posicion is None:
+            return False
+
+        anterior = datos[posicion]
+        # En una lista se remueve por posición y se reindexan las siguientes.
+        if isinstance(datos, list):
+            datos.pop(posicion)
+            del self._indice_ids[registro_id]
+            for i in range(posicion, len(datos)):
+                self._indice_ids[datos[i].get("id")] = i
+
+        elif isinstance(datos, dict):
+            del datos[registro_id]
+            del self._indice_ids[registro_id]
+
+        else:
+            raise TypeError("Estructura de datos inesperada. Debe ser lista o dict.")
+
+        if self._trigramas is not None:
+            self._trigramas.eliminar(registro_id)
+        if self._postings is not None:
+            self._postings.eliminar(anterior)
+        if self._clientes is not None:
+            self._clientes.eliminar(anterior)
+        return True
+
+    def _aplicar_operacion(self, operacion: dict):
+        """Aplica una operación del WAL ("guardar" o "eliminar") en memoria."""
+        if operacion.get("op") == "guardar":
+            self.guardar(operacion["registro"])
+        elif operacion.get("op") == "eliminar":
+            self.eliminar(operacion["id"])
+
+    # --- Transacciones ---
+
+    def iniciar_transaccion(self):
+        self._respaldo = self.datos.copy()
+
+    def deshacer_transaccion(self):
+        respaldo, self._respaldo = self._respaldo, None
+        if respaldo is None:
+            return
+        # En el lugar, para que las vistas ya entregadas sigan siendo válidas.
+        if isinstance(self.datos, list):
+            self.datos[:] = respaldo
+        else:
+            self.datos.clear()
+            self.datos.update(respaldo)
+        self._reindexar()
+        # Los índices se vuelven a armar en la próxima búsqueda.
+        self._trigramas = None
+        self._postings = None
+        self._clientes = None
+
+    def persistir(self, operaciones: list[dict]):
+        """
+        En modo "completo" reescribe el archivo una vez; en modo "wal" anexa las
+        operaciones al log (O(1) por cambio) y, si el log creció demasiado, lo
+        compacta en segundo plano.
+        """
+        self._respaldo = None
+        if not operaciones:
+            return
+
+        if self._wal is None:
+            self._guardar_archivo()
+            return
+
+        self._wal.agregar_muchas(operaciones)
+        if self._wal.necesita_compactar():
+            self.compactar()
+
+    # --- Mantenimiento ---
+
+    def precargar(self, indices=()):
+        """Carga el archivo (y reproduce el log) si todavía no se cargó, y arma los `indices`."""
+        self._cargar()
+        super().precargar(indices)
+
+    def tarea_precarga(self, indices=()):
+        if self._cargado:
+            return None
+        return partial(cargar_estado_json, self.ruta, self.clave, self.modo_escritura, tuple(indices))
+
+    def estado(self) -> dict:
+        """Registros e índices ya armados (lo que `adoptar_estado` instala en otro almacén)."""
+        return {
+            "datos": self.datos,
+            "trigramas": self._trigramas,
+            "postings": self._postings,
+            "clientes": self._clientes,
+        }
+
+    def adoptar_estado(self, estado: dict) -> bool:
+        """
+        Instala registros e índices cargados en otro proceso (el log, si lo hay,
+        ya viene aplicado). No hace nada si este almacén ya se cargó.
+        """
+        with self._lock_carga:
+            if self._cargado or self._datos is not None:
+                return False
+            self._datos = estado["datos"]
+            self._reindexar()
+            self._trigramas = estado.get("trigramas")
+            self._postings = estado.get("postings")
+            self._clientes = estado.get("clientes")
+            self._cargado = True
+        return True
+
+    def compactar(self, en_segundo_plano: bool = True):
+        """Vuelca el estado actual al JSON y vacía el WAL (solo en modo "wal")."""
+        # Con una transacción abierta el estado en memoria aún no está confirmado.
+        if self._wal is None or self._respaldo is not None:
+            return
+        # Copia superficial: los registros se reemplazan, nunca se mutan en el lugar.
+        # Se toma cuando le toca el turno a esta compactación (ver `RegistroWAL.compactar`).
+        self._wal.compactar(lambda: {self.clave: self.datos.copy()}, en_segundo_plano=en_segundo_plano)
+
+    def cerrar(self):
+        """Espera compactaciones pendientes y libera el WAL (si lo hay)."""
+        if self._wal is not None:
+            self._wal.cerrar()
+
+
+def cargar_estado_json(ruta: str, clave: str, modo_escritura: str = MODO_COMPLETO, indices=()) -> dict:
+    """
+    Carga (y reproduce el log de) un archivo JSON, arma los `indices` y devuelve
+    el `estado` del almacén. Pensada para correr en un proceso aparte
+    (`AlmacenJSON.tarea_precarga`): el resultado viaja serializado con pickle.
+    """
+    almacen = AlmacenJSON(ruta, clave, modo_escritura)
+    almacen.precargar(indices)
+    return almacen.estado()
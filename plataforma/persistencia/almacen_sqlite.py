@@ -0,0 +1,668 @@
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Sequence
+from .almacen import AlmacenBase, MODO_COMPLETO, MODO_WAL, coincide_contenido
+from .consultas import Actor, Anio, Consulta, Director, Etiqueta, No, O, PalabraClave, Y
+from .indice_clientes import CAMPOS_FECHA, fecha_texto, rango_fechas
+from .indice_trigramas import normalizar_texto, trigramas
+from .ranking import EstadisticasBM25, TopK, aporte, terminos_registro
+
+
+def _plegar(valor):
+    """Versión en minúsculas de un texto (para búsquedas sin distinguir mayúsculas)."""
+    return valor.lower() if isinstance(valor, str) else None
+
+
+def _valor_columna(valor):
+    """Adapta un valor del registro a un tipo que SQLite pueda guardar en una columna."""
+    if valor is None or isinstance(valor, (str, int, float)):
+        return valor
+    return json.dumps(valor, ensure_ascii=False)
+
+
+class _RegistrosSQLite(Sequence):
+    """
+    Secuencia perezosa de los registros de una tabla, en orden de alta.
+    Se recorre por lotes (paginando por rowid), así que en memoria solo
+    queda el lote actual.
+    """
+
+    def __init__(self, almacen: "AlmacenSQLite"):
+        self._almacen = almacen
+
+    def __len__(self):
+        return len(self._almacen)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            # Un solo LIMIT/OFFSET por rebanada: pedir cada índice por separado
+            # haría que SQLite salteara las primeras filas una vez por elemento.
+            posiciones = range(*indice.indices(len(self)))
+            if not posiciones:
+                return []
+            desde = min(posiciones[0], posiciones[-1])
+            hasta = max(posiciones[0], posiciones[-1])
+            filas = self._almacen._consultar(
+                f"SELECT registro FROM {self._almacen.TABLA} ORDER BY rowid LIMIT ? OFFSET ?",
+                (hasta - desde + 1, desde),
+            )
+            return [json.loads(filas[p - desde][0]) for p in posiciones if p - desde < len(filas)]
+
+        # Un índice suelto cuesta O(índice) (OFFSET saltea filas); para recorrer
+        # la tabla entera conviene iterar, que pagina por rowid.
+        if indice < 0:
+            indice += len(self)
+        fila = None
+        if indice >= 0:
+            fila = self._almacen._consultar_uno(
+                f"SELECT registro FROM {self._almacen.TABLA} ORDER BY rowid LIMIT 1 OFFSET ?",
+                (indice,),
+            )
+        if fila is None:
+            raise IndexError("Índice de registro fuera de rango.")
+        return json.loads(fila[0])
+
+    def __iter__(self):
+        ultimo = 0
+        while True:
+            filas = self._almacen._consultar(
+                f"SELECT rowid, registro FROM {self._almacen.TABLA} "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (ultimo, self._almacen.TAMANIO_LOTE),
+            )
+            if not filas:
+                return
+            for _, registro in filas:
+                yield json.loads(registro)
+            ultimo = filas[-1][0]
+
+    def ids(self) -> list[str]:
+        return self._almacen.ids()
+
+
+class AlmacenSQLite(AlmacenBase):
+    """
+    Motor de almacenamiento sobre una base SQLite (módulo estándar `sqlite3`).
+
+    Cada registro se guarda completo como JSON en la columna `registro`, y
+    además se copian a columnas indexadas los campos por los que se consulta
+    (`COLUMNAS`). Los campos de `PLEGADAS` tienen también una columna
+    `<campo>_min` en minúsculas, para búsquedas sin distinguir mayúsculas.
+    Así las lecturas por id o por esos campos son consultas indexadas y en
+    memoria solo están los registros que se piden.
+
+    El orden de alta se conserva con el rowid (un reemplazo no lo cambia).
+
+    Args:
+        ruta (str): archivo de la base (se crea si no existe).
+        modo_escritura (str): "completo" usa el journal clásico de SQLite;
+            "wal" activa `journal_mode=WAL` (escrituras más baratas y lecturas
+            que no se bloquean con las escrituras).
+    """
+
+    TABLA = "registros"
+    COLUMNAS: tuple[str, ...] = ()
+    PLEGADAS: tuple[str, ...] = ()
+    # Registros que se traen por consulta al recorrer la tabla entera.
+    TAMANIO_LOTE = 1000
+
+    def __init__(self, ruta: str, modo_escritura: str = MODO_COMPLETO):
+        if modo_escritura not in (MODO_COMPLETO, MODO_WAL):
+            raise ValueError(f"Modo de escritura no soportado: {modo_escritura}")
+        self.ruta = ruta
+        self.modo_escritura = modo_escritura
+
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        # isolation_level=None: las transacciones se abren y cierran a mano.
+        self._conexion = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        if modo_escritura == MODO_WAL:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._crear_esquema()
+
+    # --- Esquema ---
+
+    def _columnas_tabla(self) -> list[str]:
+        return ["id", *self.COLUMNAS, *(f"{c}_min" for c in self.PLEGADAS), "registro"]
+
+    def _crear_esquema(self):
+        columnas = ", ".join(
+            "id TEXT PRIMARY KEY" if c == "id" else
+            "registro TEXT NOT NULL" if c == "registro" else c
+            for c in self._columnas_tabla()
+        )
+        with self._lock:
+            self._conexion.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLA} ({columnas})")
+            for columna in (*self.COLUMNAS, *(f"{c}_min" for c in self.PLEGADAS)):
+                self._conexion.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.TABLA}_{columna} "
+                    f"ON {self.TABLA} ({columna})"
+                )
+            self._crear_tablas_auxiliares()
+
+    def _crear_tablas_auxiliares(self):
+        """Tablas normalizadas propias de cada subclase (por defecto, ninguna)."""
+
+    def _guardar_auxiliares(self, registro: dict):
+        """Actualiza las tablas normalizadas de un registro (por defecto, nada)."""
+
+    def _eliminar_auxiliares(self, registro_id: str):
+        """Borra las filas de las tablas normalizadas de un registro (por defecto, nada)."""
+
+    # --- Consultas internas ---
+
+    def _consultar(self, sql: str, parametros=()) -> list[tuple]:
+        with self._lock:
+            return self._conexion.execute(sql, parametros).fetchall()
+
+    def _consultar_uno(self, sql: str, parametros=()):
+        with self._lock:
+            return self._conexion.execute(sql, parametros).fetchone()
+
+    # --- Lectura ---
+
+    def __len__(self):
+        return self._consultar_uno(f"SELECT COUNT(*) FROM {self.TABLA}")[0]
+
+    def obtener(self, registro_id: str) -> dict | None:
+        fila = self._consultar_uno(
+            f"SELECT registro FROM {self.TABLA} WHERE id = ?", (registro_id,)
+        )
+        return None if fila is None else json.loads(fila[0])
+
+    def registros(self) -> _RegistrosSQLite:
+        return _RegistrosSQLite(self)
+
+    def ids(self) -> list[str]:
+        return [fila[0] for fila in self._consultar(f"SELECT id FROM {self.TABLA} ORDER BY rowid")]
+
+    def buscar_por(self, campo: str, valor, ignorar_mayusculas: bool = False) -> list[dict]:
+        if ignorar_mayusculas and campo in self.PLEGADAS:
+            condicion, parametros = f"{campo}_min = ?", (_plegar(valor),)
+        elif (campo == "id" or campo in self.COLUMNAS) and not ignorar_mayusculas:
+            condicion, parametros = f"{campo} = ?", (_valor_columna(valor),)
+        else:
+            # Campo sin índice: recorrido completo.
+            return super().buscar_por(campo, valor, ignorar_mayusculas)
+
+        filas = self._consultar(
+            f"SELECT registro FROM {self.TABLA} WHERE {condicion} ORDER BY rowid", parametros
+        )
+        return [json.loads(fila[0]) for fila in filas]
+
+    # --- Escritura ---
+
+    def _comenzar(self) -> bool:
+        """Abre una transacción si no hay una abierta. Devuelve True si la abrió."""
+        if self._conexion.in_transaction:
+            return False
+        self._conexion.execute("BEGIN")
+        return True
+
+    def guardar(self, registro: dict):
+        registro_id = registro.get("id")
+        valores = [_valor_columna(registro_id)]
+        valores.extend(_valor_columna(registro.get(c)) for c in self.COLUMNAS)
+        valores.extend(_plegar(registro.get(c)) for c in self.PLEGADAS)
+        valores.append(json.dumps(registro, ensure_ascii=False))
+
+        columnas = self._columnas_tabla()
+        actualizacion = ", ".join(f"{c} = excluded.{c}" for c in columnas[1:])
+        sql = (
+            f"INSERT INTO {self.TABLA} ({', '.join(columnas)}) "
+            f"VALUES ({', '.join('?' for _ in columnas)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {actualizacion}"
+        )
+
+        with self._lock:
+            propia = self._comenzar()
+            try:
+                self._conexion.execute(sql, valores)
+                self._guardar_auxiliares(registro)
+            except BaseException:
+                if propia:
+                    self._conexion.execute("ROLLBACK")
+                raise
+
+    def eliminar(self, registro_id: str) -> bool:
+        with self._lock:
+            propia = self._comenzar()
+            try:
+                cursor = self._conexion.execute(
+                    f"DELETE FROM {self.TABLA} WHERE id = ?", (registro_id,)
+                )
+                if cursor.rowcount == 0:
+                    if propia:
+                        self._conexion.execute("ROLLBACK")
+                    return False
+                self._eliminar_auxiliares(registro_id)
+            except BaseException:
+                if propia:
+                    self._conexion.execute("ROLLBACK")
+                raise
+        return True
+
+    # --- Transacciones ---
+
+    def iniciar_transaccion(self):
+        with self._lock:
+            self._comenzar()
+
+    def deshacer_transaccion(self):
+        with self._lock:
+            if self._conexion.in_transaction:
+                self._conexion.execute("ROLLBACK")
+
+    def persistir(self, operaciones: list[dict]):
+        """Confirma (COMMIT) la transacción abierta: una sola escritura a disco por lote."""
+        with self._lock:
+            if self._conexion.in_transaction:
+                self._conexion.execute("COMMIT")
+
+    # --- Mantenimiento ---
+
+    def compactar(self, en_segundo_plano: bool = True):
+        """En modo "wal" vuelca el journal de SQLite a la base (checkpoint)."""
+        if self.modo_escritura != MODO_WAL:
+            return
+        with self._lock:
+            if not self._conexion.in_transaction:
+                self._conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def cerrar(self):
+        """Confirma lo pendiente y cierra la conexión."""
+        with self._lock:
+            if self._conexion.in_transaction:
+                self._conexion.execute("COMMIT")
+            self._conexion.close()
+
+
+class AlmacenSQLiteContenidos(AlmacenSQLite):
+    """
+    Almacén SQLite de contenidos: columnas indexadas `titulo`, `anio` y
+    `director`, más las tablas normalizadas `etiquetas`, `palabras_claves`
+    (etiqueta/palabra -> contenido) y `trigramas` (trigrama del título/id
+    normalizado -> contenido) para resolver los filtros de
+    `NuevoCatalogo.buscar` con índices, y `terminos` (término -> contenido,
+    frecuencia ponderada) y `largos` (largo de cada contenido) para la
+    búsqueda por relevancia BM25 (ver `ranking`).
+    """
+
+    TABLA = "contenidos"
+    COLUMNAS = ("titulo", "anio", "director")
+    PLEGADAS = ("id", "titulo")
+
+    def _crear_tablas_auxiliares(self):
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS etiquetas ("
+            "etiqueta TEXT NOT NULL, contenido_id TEXT NOT NULL, valor REAL, "
+            "PRIMARY KEY (etiqueta, contenido_id)) WITHOUT ROWID"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_etiquetas_contenido ON etiquetas (contenido_id)"
+        )
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS palabras_claves ("
+            "palabra TEXT NOT NULL, contenido_id TEXT NOT NULL, "
+            "PRIMARY KEY (palabra, contenido_id)) WITHOUT ROWID"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_palabras_claves_contenido ON palabras_claves (contenido_id)"
+        )
+        existentes = {
+            fila[0]
+            for fila in self._conexion.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('trigramas', 'terminos')"
+            )
+        }
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS trigramas ("
+            "campo TEXT NOT NULL, trigrama TEXT NOT NULL, contenido_id TEXT NOT NULL, "
+            "PRIMARY KEY (campo, trigrama, contenido_id)) WITHOUT ROWID"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_trigramas_contenido ON trigramas (contenido_id)"
+        )
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS terminos ("
+            "termino TEXT NOT NULL, contenido_id TEXT NOT NULL, frecuencia REAL NOT NULL, "
+            "PRIMARY KEY (termino, contenido_id)) WITHOUT ROWID"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_terminos_contenido ON terminos (contenido_id)"
+        )
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS largos ("
+            "contenido_id TEXT PRIMARY KEY, largo REAL NOT NULL) WITHOUT ROWID"
+        )
+        faltantes = [
+            guardar
+            for tabla, guardar in (("trigramas", self._guardar_trigramas), ("terminos", self._guardar_terminos))
+            if tabla not in existentes
+        ]
+        if faltantes:
+            # Base creada antes de que existieran las tablas: se indexa lo que ya hay.
+            self._conexion.execute("BEGIN")
+            for (registro,) in self._conexion.execute(f"SELECT registro FROM {self.TABLA}").fetchall():
+                for guardar in faltantes:
+                    guardar(json.loads(registro))
+            self._conexion.execute("COMMIT")
+
+    def _guardar_auxiliares(self, registro: dict):
+        contenido_id = registro.get("id")
+        self._eliminar_auxiliares(contenido_id)
+        self._conexion.executemany(
+            "INSERT INTO etiquetas (etiqueta, contenido_id, valor) VALUES (?, ?, ?)",
+            [
+                # Un nivel booleano no es numérico (`_es_numero`): se guarda como texto.
+                (etiqueta, contenido_id, json.dumps(valor) if isinstance(valor, bool) else _valor_columna(valor))
+                for etiqueta, valor in (registro.get("etiquetas") or {}).items()
+            ],
+        )
+        self._conexion.executemany(
+            "INSERT INTO palabras_claves (palabra, contenido_id) VALUES (?, ?)",
+            [(palabra, contenido_id) for palabra in set(registro.get("palabras_claves") or ())],
+        )
+        self._guardar_trigramas(registro)
+        self._guardar_terminos(registro)
+
+    def _guardar_trigramas(self, registro: dict):
+        contenido_id = registro.get("id")
+        filas = []
+        for campo in ("titulo", "id"):
+            valor = registro.get(campo)
+            if isinstance(valor, str):
+                filas.extend((campo, t, contenido_id) for t in trigramas(normalizar_texto(valor)))
+        self._conexion.executemany(
+            "INSERT OR IGNORE INTO trigramas (campo, trigrama, contenido_id) VALUES (?, ?, ?)", filas
+        )
+
+    def _guardar_terminos(self, registro: dict):
+        contenido_id = registro.get("id")
+        frecuencias = terminos_registro(registro)
+        self._conexion.executemany(
+            "INSERT OR REPLACE INTO terminos (termino, contenido_id, frecuencia) VALUES (?, ?, ?)",
+            [(termino, contenido_id, tf) for termino, tf in frecuencias.items()],
+        )
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO largos (contenido_id, largo) VALUES (?, ?)",
+            (contenido_id, sum(frecuencias.values())),
+        )
+
+    def _eliminar_auxiliares(self, registro_id: str):
+        self._conexion.execute("DELETE FROM etiquetas WHERE contenido_id = ?", (registro_id,))
+        self._conexion.execute("DELETE FROM palabras_claves WHERE contenido_id = ?", (registro_id,))
+        self._conexion.execute("DELETE FROM trigramas WHERE contenido_id = ?", (registro_id,))
+        self._conexion.execute("DELETE FROM terminos WHERE contenido_id = ?", (registro_id,))
+        self._conexion.execute("DELETE FROM largos WHERE contenido_id = ?", (registro_id,))
+
+    def buscar_contenidos(self, titulo=None, etiquetas=None, palabras_claves=None, id_contenido=None):
+        """
+        Misma semántica que `coincide_contenido`, resuelta con una sola consulta.
+        Las subcadenas de título/id se acotan con la tabla de trigramas y los
+        candidatos se verifican luego con `coincide_contenido`.
+        """
+        condiciones, parametros = [], []
+
+        # Subcadenas: el contenido tiene que tener TODOS los trigramas de la consulta.
+        for campo, consulta in (("id", id_contenido), ("titulo", titulo)):
+            buscados = sorted(trigramas(normalizar_texto(consulta))) if consulta else ()
+            if buscados:
+                condiciones.append(
+                    "id IN ("
+                    + " INTERSECT ".join(
+                        "SELECT contenido_id FROM trigramas WHERE campo = ? AND trigrama = ?"
+                        for _ in buscados
+                    )
+                    + ")"
+                )
+                for trigrama in buscados:
+                    parametros.extend((campo, trigrama))
+
+        # Etiquetas / palabras clave: alcanza con tener alguna (índice por etiqueta/palabra).
+        etiquetas = list(etiquetas or ())
+        if etiquetas:
+            condiciones.append(
+                "id IN (SELECT contenido_id FROM etiquetas WHERE etiqueta IN "
+                f"({', '.join('?' for _ in etiquetas)}))"
+            )
+            parametros.extend(etiquetas)
+        palabras_claves = list(palabras_claves or ())
+        if palabras_claves:
+            condiciones.append(
+                "id IN (SELECT contenido_id FROM palabras_claves WHERE palabra IN "
+                f"({', '.join('?' for _ in palabras_claves)}))"
+            )
+            parametros.extend(palabras_claves)
+
+        sql = f"SELECT registro FROM {self.TABLA}"
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += " ORDER BY rowid"
+
+        for fila in self._consultar(sql, parametros):
+            data = json.loads(fila[0])
+            if coincide_contenido(data, titulo=titulo, id_contenido=id_contenido):
+                yield data
+
+    def _consulta_a_sql(self, consulta: Consulta) -> tuple[str, list]:
+        """Traduce una `Consulta` a una condición SQL (con la semántica de `Consulta.coincide`)."""
+        if isinstance(consulta, Etiqueta):
+            sql = "id IN (SELECT contenido_id FROM etiquetas WHERE etiqueta = ?"
+            parametros = [consulta.valor]
+            if consulta.minimo is not None:
+                sql += " AND typeof(valor) IN ('integer', 'real') AND valor >= ?"
+                parametros.append(consulta.minimo)
+            return sql + ")", parametros
+        if isinstance(consulta, PalabraClave):
+            return "id IN (SELECT contenido_id FROM palabras_claves WHERE palabra = ?)", [consulta.valor]
+        if isinstance(consulta, Director):
+            return "director IS ?", [_valor_columna(consulta.valor)]
+        if isinstance(consulta, Actor):
+            # Los actores no tienen tabla propia: se leen del JSON del registro.
+            return (
+                "EXISTS (SELECT 1 FROM json_each(registro, '$.actores') WHERE value = ?)",
+                [_valor_columna(consulta.valor)],
+            )
+        if isinstance(consulta, Anio):
+            return (
+                "(typeof(anio) IN ('integer', 'real') AND anio BETWEEN ? AND ?)",
+                [consulta.desde, consulta.hasta],
+            )
+        if isinstance(consulta, (Y, O)):
+            if not consulta.consultas:
+                return ("1" if isinstance(consulta, Y) else "0"), []
+            partes, parametros = [], []
+            for c in consulta.consultas:
+                sql, p = self._consulta_a_sql(c)
+                partes.append(f"({sql})")
+                parametros.extend(p)
+            return (" AND " if isinstance(consulta, Y) else " OR ").join(partes), parametros
+        if isinstance(consulta, No):
+            sql, parametros = self._consulta_a_sql(consulta.consulta)
+            return f"NOT ({sql})", parametros
+        raise TypeError(f"Consulta no soportada: {consulta!r}")
+
+    def consultar(self, consulta: Consulta) -> list[str]:
+        condicion, parametros = self._consulta_a_sql(consulta)
+        filas = self._consultar(
+            f"SELECT id FROM {self.TABLA} WHERE {condicion} ORDER BY rowid", parametros
+        )
+        return [fila[0] for fila in filas]
+
+    # --- Relevancia (BM25) ---
+
+    def estadisticas_bm25(self, terminos) -> EstadisticasBM25:
+        """Cantidad de contenidos, largo total y frecuencia documental de los `terminos`, por SQL."""
+        terminos = list(terminos)
+        with self._lock:
+            cantidad = self._conexion.execute(f"SELECT COUNT(*) FROM {self.TABLA}").fetchone()[0]
+            largo_total = self._conexion.execute("SELECT TOTAL(largo) FROM largos").fetchone()[0]
+            frecuencias = {}
+            if terminos:
+                frecuencias = dict(self._conexion.execute(
+                    "SELECT termino, COUNT(*) FROM terminos WHERE termino IN "
+                    f"({', '.join('?' for _ in terminos)}) GROUP BY termino",
+                    terminos,
+                ).fetchall())
+        return EstadisticasBM25(cantidad, largo_total, frecuencias)
+
+    def rankear(
+        self, consulta: dict[str, int], etiquetas=(), k: int = 10, estadisticas: EstadisticasBM25 | None = None
+    ) -> list[tuple[float, int, str]]:
+        """
+        Los `k` mejores `(puntaje, orden, id)` como `AlmacenBase.rankear`, pero
+        leyendo solo las filas de `terminos`/`etiquetas` de lo buscado (sin
+        decodificar registros). `orden` es el rowid: respeta el orden de alta.
+        """
+        top = TopK(k)
+        if k == 0 or not (consulta or etiquetas):
+            return top.resultados()
+        if estadisticas is None:
+            estadisticas = self.estadisticas_bm25(consulta)
+        etiquetas = list(dict.fromkeys(etiquetas))
+
+        # rowid -> {término: frecuencia} / {etiqueta: nivel}
+        frecuencias, niveles, datos = {}, {}, {}
+        if consulta:
+            filas = self._consultar(
+                f"SELECT c.rowid, c.id, l.largo, t.termino, t.frecuencia FROM terminos t "
+                f"JOIN {self.TABLA} c ON c.id = t.contenido_id "
+                "JOIN largos l ON l.contenido_id = t.contenido_id "
+                f"WHERE t.termino IN ({', '.join('?' for _ in consulta)})",
+                list(consulta),
+            )
+            for orden, contenido_id, largo, termino, tf in filas:
+                frecuencias.setdefault(orden, {})[termino] = tf
+                datos[orden] = (contenido_id, largo)
+        if etiquetas and (datos or not consulta):
+            sql = (
+                f"SELECT c.rowid, c.id, e.etiqueta, e.valor FROM etiquetas e "
+                f"JOIN {self.TABLA} c ON c.id = e.contenido_id "
+                f"WHERE e.etiqueta IN ({', '.join('?' for _ in etiquetas)}) "
+                "AND typeof(e.valor) IN ('integer', 'real')"
+            )
+            parametros = list(etiquetas)
+            if consulta:
+                # Con texto, las etiquetas solo ponderan a los que tienen algún término.
+                sql += (
+                    " AND e.contenido_id IN (SELECT contenido_id FROM terminos WHERE termino IN "
+                    f"({', '.join('?' for _ in consulta)}))"
+                )
+                parametros.extend(consulta)
+            for orden, contenido_id, etiqueta, nivel in self._consultar(sql, parametros):
+                niveles.setdefault(orden, {})[etiqueta] = nivel
+                datos.setdefault(orden, (contenido_id, 0.0))
+
+        # Se suma en el orden de la consulta y de las etiquetas, como `puntuar_registro`.
+        largo_medio = estadisticas.largo_medio
+        for orden, (contenido_id, largo) in datos.items():
+            bonus = 0.0
+            for etiqueta in etiquetas:
+                nivel = niveles.get(orden, {}).get(etiqueta)
+                if nivel is not None:
+                    bonus += nivel
+            if consulta:
+                puntaje = 0.0
+                propias = frecuencias[orden]
+                for termino, repeticiones in consulta.items():
+                    tf = propias.get(termino)
+                    if tf:
+                        puntaje += repeticiones * aporte(tf, largo, estadisticas.idf(termino), largo_medio)
+                puntaje *= 1.0 + bonus
+            else:
+                puntaje = bonus
+            if puntaje > 0:
+                top.agregar(puntaje, orden, contenido_id)
+        return top.resultados()
+
+
+class AlmacenSQLiteClientes(AlmacenSQLite):
+    """
+    Almacén SQLite de clientes: columnas indexadas `nro_cliente` y `nombre`
+    (sin distinguir mayúsculas), más la tabla `segmentos` (tipo de servicio y
+    fechas de alta/baja, indexadas) para segmentar y para los reportes de bajas.
+    """
+
+    TABLA = "clientes"
+    COLUMNAS = ("nro_cliente", "nombre")
+    PLEGADAS = ("nombre",)
+
+    def _crear_tablas_auxiliares(self):
+        existia = self._conexion.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segmentos'"
+        ).fetchone()
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS segmentos ("
+            "cliente_id TEXT PRIMARY KEY, tipo_servicio, fecha_alta, fecha_baja) WITHOUT ROWID"
+        )
+        for columna in ("tipo_servicio", *CAMPOS_FECHA):
+            self._conexion.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_segmentos_{columna} ON segmentos ({columna})"
+            )
+        if not existia:
+            # Base creada antes de que existiera la tabla: se indexa lo que ya hay.
+            self._conexion.execute("BEGIN")
+            for (registro,) in self._conexion.execute(f"SELECT registro FROM {self.TABLA}").fetchall():
+                self._guardar_auxiliares(json.loads(registro))
+            self._conexion.execute("COMMIT")
+
+    def _guardar_auxiliares(self, registro: dict):
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO segmentos (cliente_id, tipo_servicio, fecha_alta, fecha_baja) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                registro.get("id"),
+                *(_valor_columna(registro.get(c)) for c in ("tipo_servicio", *CAMPOS_FECHA)),
+            ),
+        )
+
+    def _eliminar_auxiliares(self, registro_id: str):
+        self._conexion.execute("DELETE FROM segmentos WHERE cliente_id = ?", (registro_id,))
+
+    def _ids_segmento(self, condicion: str, parametros=(), orden: str = "c.rowid") -> list[str]:
+        filas = self._consultar(
+            f"SELECT s.cliente_id FROM segmentos s JOIN {self.TABLA} c ON c.id = s.cliente_id "
+            f"WHERE {condicion} ORDER BY {orden}",
+            parametros,
+        )
+        return [fila[0] for fila in filas]
+
+    def clientes_por_nombre(self, nombre: str) -> list[str]:
+        filas = self._consultar(
+            f"SELECT id FROM {self.TABLA} WHERE nombre_min = ? ORDER BY rowid", (_plegar(nombre),)
+        )
+        return [fila[0] for fila in filas]
+
+    def clientes_por_tipo_servicio(self, tipo_servicio: str) -> list[str]:
+        return self._ids_segmento("s.tipo_servicio = ?", (_valor_columna(tipo_servicio),))
+
+    def clientes_por_fecha(self, campo: str, desde=None, hasta=None) -> list[str]:
+        if campo not in CAMPOS_FECHA:
+            raise ValueError(f"Campo de fecha no indexado: {campo}")
+        desde, hasta = rango_fechas(desde, hasta)
+        condiciones, parametros = [f"typeof(s.{campo}) = 'text'"], []
+        if desde is not None:
+            condiciones.append(f"s.{campo} >= ?")
+            parametros.append(desde)
+        if hasta is not None:
+            condiciones.append(f"s.{campo} <= ?")
+            parametros.append(hasta)
+        return self._ids_segmento(" AND ".join(condiciones), parametros, f"s.{campo}, c.rowid")
+
+    def clientes_activos(self, fecha=None) -> list[str]:
+        fecha = fecha_texto(fecha)
+        if fecha is None:
+            return self._ids_segmento("s.fecha_baja IS NULL")
+        return self._ids_segmento(
+            "typeof(s.fecha_alta) = 'text' AND s.fecha_alta <= ? "
+            "AND NOT (typeof(s.fecha_baja) = 'text' AND s.fecha_baja <= ?)",
+            (fecha, fecha),
+            "s.fecha_alta, c.rowid",
+        )
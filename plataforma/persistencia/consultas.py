@@ -0,0 +1,217 @@
+"""
+Consultas combinables sobre los rasgos de los contenidos (etiquetas, palabras
+clave, director, actores y año), para `NuevoCatalogo.consultar`.
+
+Las hojas filtran por un rasgo y se combinan con `&` (Y), `|` (O) y `~` (NO):
+
+    (Etiqueta("Magia", minimo=0.8) | PalabraClave("dragones")) & ~Director("Peter Jackson")
+    Y(Etiqueta("Fantasía de Mundo"), Anio(2000, 2010))
+
+Cada consulta sabe verificarse sobre un registro crudo (`coincide`), que es la
+referencia de su semántica; los motores la resuelven con índices
+(`IndicePostings` en memoria, SQL en SQLite).
+"""
+
+
+class Consulta:
+    """Base de las consultas: se combinan con `&` (Y), `|` (O) y `~` (NO)."""
+
+    def coincide(self, data: dict) -> bool:
+        """True si el registro crudo `data` cumple la consulta."""
+        raise NotImplementedError
+
+    def __and__(self, otra: "Consulta") -> "Y":
+        return Y(self, otra)
+
+    def __or__(self, otra: "Consulta") -> "O":
+        return O(self, otra)
+
+    def __invert__(self) -> "No":
+        return No(self)
+
+
+def _es_numero(valor) -> bool:
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+# --- Hojas ---
+
+class Rasgo(Consulta):
+    """Consulta por igualdad exacta sobre un campo de un solo valor o de una colección."""
+
+    campo = ""
+
+    def __init__(self, valor):
+        if valor is None:
+            raise ValueError(f"{type(self).__name__} necesita un valor.")
+        self.valor = valor
+
+    def valores(self, data: dict):
+        """Valores de este rasgo en un registro crudo."""
+        raise NotImplementedError
+
+    def coincide(self, data: dict) -> bool:
+        return self.valor in self.valores(data)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.valor!r})"
+
+
+class Etiqueta(Rasgo):
+    """
+    Contenidos con la etiqueta `valor`; con `minimo`, solo si su nivel es >= `minimo`.
+
+    Ej: Etiqueta("Magia", minimo=0.8)
+    """
+
+    campo = "etiqueta"
+
+    def __init__(self, valor: str, minimo: float | None = None):
+        super().__init__(valor)
+        if minimo is not None and not _es_numero(minimo):
+            raise TypeError("El mínimo de una etiqueta debe ser un número.")
+        self.minimo = minimo
+
+    def valores(self, data: dict):
+        return data.get("etiquetas") or {}
+
+    def coincide(self, data: dict) -> bool:
+        etiquetas = self.valores(data)
+        if self.valor not in etiquetas:
+            return False
+        if self.minimo is None:
+            return True
+        nivel = etiquetas[self.valor]
+        return _es_numero(nivel) and nivel >= self.minimo
+
+    def __repr__(self):
+        if self.minimo is None:
+            return super().__repr__()
+        return f"Etiqueta({self.valor!r}, minimo={self.minimo!r})"
+
+
+class PalabraClave(Rasgo):
+    """Contenidos con la palabra clave `valor`."""
+
+    campo = "palabra_clave"
+
+    def valores(self, data: dict):
+        return data.get("palabras_claves") or ()
+
+
+class Director(Rasgo):
+    """Contenidos dirigidos por `valor` (películas y documentales)."""
+
+    campo = "director"
+
+    def valores(self, data: dict):
+        return (data.get("director"),)
+
+
+class Actor(Rasgo):
+    """Contenidos en los que actúa `valor` (películas)."""
+
+    campo = "actor"
+
+    def valores(self, data: dict):
+        return data.get("actores") or ()
+
+
+class Anio(Consulta):
+    """
+    Contenidos de un año, o de un rango de años (ambos extremos incluidos).
+
+    Ej: Anio(1999), Anio(2000, 2010)
+    """
+
+    campo = "anio"
+
+    def __init__(self, desde: int, hasta: int | None = None):
+        hasta = desde if hasta is None else hasta
+        if not (_es_numero(desde) and _es_numero(hasta)):
+            raise TypeError("Los años de la consulta deben ser números.")
+        if desde > hasta:
+            raise ValueError(f"Rango de años inválido: {desde} > {hasta}")
+        self.desde = desde
+        self.hasta = hasta
+
+    def coincide(self, data: dict) -> bool:
+        anio = data.get("anio")
+        return _es_numero(anio) and self.desde <= anio <= self.hasta
+
+    def __repr__(self):
+        if self.desde == self.hasta:
+            return f"Anio({self.desde!r})"
+        return f"Anio({self.desde!r}, {self.hasta!r})"
+
+
+# --- Combinaciones ---
+
+class Y(Consulta):
+    """Todas las consultas a la vez (sin consultas: todos los contenidos)."""
+
+    def __init__(self, *consultas: Consulta):
+        self.consultas = []
+        for consulta in consultas:
+            # Y(Y(a, b), c) -> Y(a, b, c)
+            self.consultas.extend(consulta.consultas if isinstance(consulta, Y) else (consulta,))
+
+    def coincide(self, data: dict) -> bool:
+        return all(consulta.coincide(data) for consulta in self.consultas)
+
+    def __repr__(self):
+        return f"Y({', '.join(map(repr, self.consultas))})"
+
+
+class O(Consulta):
+    """Alguna de las consultas (sin consultas: ningún contenido)."""
+
+    def __init__(self, *consultas: Consulta):
+        self.consultas = []
+        for consulta in consultas:
+            self.consultas.extend(consulta.consultas if isinstance(consulta, O) else (consulta,))
+
+    def coincide(self, data: dict) -> bool:
+        return any(consulta.coincide(data) for consulta in self.consultas)
+
+    def __repr__(self):
+        return f"O({', '.join(map(repr, self.consultas))})"
+
+
+class No(Consulta):
+    """Los contenidos que NO cumplen la consulta."""
+
+    def __init__(self, consulta: Consulta):
+        self.consulta = consulta
+
+    def coincide(self, data: dict) -> bool:
+        return not self.consulta.coincide(data)
+
+    def __invert__(self) -> Consulta:
+        return self.consulta
+
+    def __repr__(self):
+        return f"No({self.consulta!r})"
+
+
+def consulta_de_filtros(etiquetas=None, palabras_claves=None) -> Consulta | None:
+    """
+    Consulta equivalente a los filtros de etiquetas/palabras clave de
+    `NuevoCatalogo.buscar` (alcanza con tener alguna de cada lista), o None sin filtros.
+    """
+    partes = []
+    if etiquetas:
+        partes.append(O(*(Etiqueta(e) for e in etiquetas)))
+    if palabras_claves:
+        partes.append(O(*(PalabraClave(p) for p in palabras_claves)))
+    return Y(*partes) if partes else None
+
+
+def paginar(elementos: list, limite: int | None = None, desplazamiento: int = 0) -> list:
+    """Porción `[desplazamiento : desplazamiento + limite]` de una lista (`limite=None`: hasta el final)."""
+    if limite is not None and limite < 0:
+        raise ValueError("El límite no puede ser negativo.")
+    if desplazamiento < 0:
+        raise ValueError("El desplazamiento no puede ser negativo.")
+    fin = None if limite is None else desplazamiento + limite
+    return elementos[desplazamiento:fin]
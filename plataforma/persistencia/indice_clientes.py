@@ -0,0 +1,193 @@
+"""
+Índices secundarios de los clientes, para login, segmentación y reportes de
+bajas sin recorrer ni hidratar a todos los clientes.
+
+- nombre (sin distinguir mayúsculas) -> clientes: puede haber homónimos, así
+  que cada nombre guarda TODOS sus clientes y quien consulta decide qué hacer.
+- tipo_servicio -> clientes.
+- fecha_alta / fecha_baja: listas ordenadas de (fecha, documento). Las fechas
+  son textos "AAAA-MM-DD", que ordenan igual que las fechas, así que los rangos
+  y los "activos a una fecha" salen con búsqueda binaria (`bisect`).
+
+Como en `IndicePostings`, los clientes se numeran en orden de alta y los
+resultados salen en ese orden (los de fechas, por fecha y luego por alta).
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+
+# Campos de fecha indexados.
+CAMPOS_FECHA = ("fecha_alta", "fecha_baja")
+
+# Mayor que cualquier número de documento (para cerrar rangos con bisect).
+_SIN_LIMITE = float("inf")
+
+
+def plegar_nombre(nombre) -> str | None:
+    """Nombre sin distinguir mayúsculas (como `ignorar_mayusculas` y la columna `nombre_min`)."""
+    return nombre.lower() if isinstance(nombre, str) else None
+
+
+def fecha_texto(fecha) -> str | None:
+    """Fecha de consulta como texto "AAAA-MM-DD" (acepta texto, `date` o `datetime`)."""
+    if fecha is None or isinstance(fecha, str):
+        return fecha
+    if isinstance(fecha, date):
+        return fecha.strftime("%Y-%m-%d")
+    raise TypeError(f"Fecha no válida: {fecha!r}")
+
+
+def rango_fechas(desde, hasta) -> tuple[str | None, str | None]:
+    """Extremos (opcionales) de un rango de fechas como texto; valida que desde <= hasta."""
+    desde, hasta = fecha_texto(desde), fecha_texto(hasta)
+    if desde is not None and hasta is not None and desde > hasta:
+        raise ValueError(f"Rango de fechas inválido: {desde} > {hasta}")
+    return desde, hasta
+
+
+def coincide_fecha(valor, desde: str | None, hasta: str | None) -> bool:
+    """True si la fecha cruda `valor` está en [desde, hasta] (extremos opcionales)."""
+    if not isinstance(valor, str):
+        return False
+    return (desde is None or valor >= desde) and (hasta is None or valor <= hasta)
+
+
+def esta_activo(data: dict, fecha: str | None = None) -> bool:
+    """
+    True si el cliente estaba activo en `fecha`: ya dado de alta y sin baja
+    (o con baja posterior). Sin fecha: sin baja registrada (`Cliente.es_activo`).
+    """
+    baja = data.get("fecha_baja")
+    if fecha is None:
+        return baja is None
+    alta = data.get("fecha_alta")
+    if not isinstance(alta, str) or alta > fecha:
+        return False
+    return not (isinstance(baja, str) and baja <= fecha)
+
+
+class IndiceClientes:
+    """
+    Índices por nombre, tipo de servicio y fechas de un conjunto de registros de clientes.
+
+    Args:
+        registros (iterable[dict], opcional): registros iniciales (con "id").
+    """
+
+    def __init__(self, registros=()):
+        # id -> número de documento, y número de documento -> id (None = dado de baja)
+        self._docs: dict[str, int] = {}
+        self._ids: list[str | None] = []
+        self._nombres: dict[str, set[int]] = {}
+        self._servicios: dict[str, set[int]] = {}
+        # campo -> [(fecha, documento)] ordenada
+        self._fechas: dict[str, list[tuple[str, int]]] = {campo: [] for campo in CAMPOS_FECHA}
+        # documentos sin fecha de baja (activos hoy)
+        self._sin_baja: set[int] = set()
+        for registro in registros:
+            self.agregar(registro)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, registro_id):
+        return registro_id in self._docs
+
+    # --- Mantenimiento ---
+
+    def agregar(self, registro: dict, anterior: dict | None = None):
+        """
+        Indexa un registro. Si ya estaba indexado, `anterior` debe ser la versión
+        que se reemplaza (para quitarla de los índices).
+        """
+        registro_id = registro.get("id")
+        doc = self._docs.get(registro_id)
+        if doc is None:
+            doc = len(self._ids)
+            self._docs[registro_id] = doc
+            self._ids.append(registro_id)
+        else:
+            if anterior is None:
+                raise ValueError(f"Falta la versión anterior del cliente '{registro_id}' para reindexarlo.")
+            self._quitar(doc, anterior)
+        self._poner(doc, registro)
+
+    def eliminar(self, registro: dict) -> bool:
+        """Quita un registro (la versión indexada). Devuelve False si no estaba."""
+        doc = self._docs.pop(registro.get("id"), None)
+        if doc is None:
+            return False
+        self._quitar(doc, registro)
+        self._ids[doc] = None
+        return True
+
+    def _poner(self, doc: int, registro: dict):
+        nombre = plegar_nombre(registro.get("nombre"))
+        if nombre is not None:
+            self._nombres.setdefault(nombre, set()).add(doc)
+        servicio = registro.get("tipo_servicio")
+        if isinstance(servicio, str):
+            self._servicios.setdefault(servicio, set()).add(doc)
+        for campo in CAMPOS_FECHA:
+            fecha = registro.get(campo)
+            if isinstance(fecha, str):
+                insort(self._fechas[campo], (fecha, doc))
+        if registro.get("fecha_baja") is None:
+            self._sin_baja.add(doc)
+
+    def _quitar(self, doc: int, registro: dict):
+        for indice, clave in (
+            (self._nombres, plegar_nombre(registro.get("nombre"))),
+            (self._servicios, registro.get("tipo_servicio")),
+        ):
+            docs = indice.get(clave) if isinstance(clave, str) else None
+            if docs is not None:
+                docs.discard(doc)
+                if not docs:
+                    del indice[clave]
+        for campo in CAMPOS_FECHA:
+            fecha = registro.get(campo)
+            if isinstance(fecha, str):
+                fechas = self._fechas[campo]
+                posicion = bisect_left(fechas, (fecha, doc))
+                if posicion < len(fechas) and fechas[posicion] == (fecha, doc):
+                    del fechas[posicion]
+        self._sin_baja.discard(doc)
+
+    # --- Consultas ---
+
+    def _a_ids(self, docs) -> list[str]:
+        return [self._ids[doc] for doc in sorted(docs)]
+
+    def por_nombre(self, nombre: str) -> list[str]:
+        """Ids (en orden de alta) de los clientes con ese nombre, sin distinguir mayúsculas."""
+        return self._a_ids(self._nombres.get(plegar_nombre(nombre), ()))
+
+    def por_tipo_servicio(self, tipo_servicio: str) -> list[str]:
+        """Ids (en orden de alta) de los clientes con ese tipo de servicio."""
+        return self._a_ids(self._servicios.get(tipo_servicio, ()))
+
+    def _entre(self, campo: str, desde: str | None, hasta: str | None) -> list[tuple[str, int]]:
+        fechas = self._fechas[campo]
+        inicio = 0 if desde is None else bisect_left(fechas, (desde, -1))
+        fin = len(fechas) if hasta is None else bisect_right(fechas, (hasta, _SIN_LIMITE))
+        return fechas[inicio:fin]
+
+    def por_fecha(self, campo: str, desde=None, hasta=None) -> list[str]:
+        """Ids de los clientes con `campo` ("fecha_alta"/"fecha_baja") en [desde, hasta], por fecha."""
+        if campo not in CAMPOS_FECHA:
+            raise ValueError(f"Campo de fecha no indexado: {campo}")
+        desde, hasta = rango_fechas(desde, hasta)
+        return [self._ids[doc] for _, doc in self._entre(campo, desde, hasta)]
+
+    def activos(self, fecha=None) -> list[str]:
+        """
+        Ids de los clientes activos en `fecha` (ver `esta_activo`), por fecha de alta.
+        Sin fecha: los que no tienen baja, en orden de alta.
+        """
+        fecha = fecha_texto(fecha)
+        if fecha is None:
+            return self._a_ids(self._sin_baja)
+        bajas = {doc for _, doc in self._entre("fecha_baja", None, fecha)}
+        return [self._ids[doc] for _, doc in self._entre("fecha_alta", None, fecha) if doc not in bajas]
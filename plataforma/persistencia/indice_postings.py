@@ -0,0 +1,318 @@
+"""
+Listas invertidas (postings) de los rasgos de los contenidos, para resolver
+las `Consulta` sin recorrer ni hidratar el catálogo.
+
+Por cada rasgo (etiqueta, palabra clave, director, actor, año) y valor se
+guarda la lista ORDENADA de números de documento que lo tienen, en un
+`array("I")` (4 bytes por entrada); las etiquetas guardan además, alineado,
+el nivel de cada documento para los umbrales (`Etiqueta("Magia", minimo=0.8)`).
+
+Las consultas se resuelven con operaciones de conjuntos sobre los postings:
+Y intersecta empezando por la lista más corta (y, si los candidatos ya son
+pocos, los verifica con búsqueda binaria en vez de recorrer listas largas),
+O une y NO resta. Los documentos se numeran en orden de alta, así que los
+resultados salen en ese orden.
+
+Además se indexan los términos del título y las palabras clave (campo
+"termino", con su frecuencia ponderada alineada, y el largo de cada
+documento) para la búsqueda por relevancia BM25 de `rankear` (ver `ranking`).
+"""
+
+from array import array
+from bisect import bisect_left
+from .consultas import Anio, Consulta, Etiqueta, No, O, Rasgo, Y, _es_numero
+from .ranking import EstadisticasBM25, TopK, aporte, terminos_registro
+
+
+# Campos indexados (ver `Rasgo.campo`; "termino" es el de la búsqueda por relevancia).
+CAMPOS = ("etiqueta", "palabra_clave", "director", "actor", "anio", "termino")
+
+# Campos que guardan, alineado con cada posting, un valor por documento
+# (nivel de la etiqueta, frecuencia ponderada del término).
+_CAMPOS_CON_VALOR = ("etiqueta", "termino")
+
+# `rankear` puntúa de a bloques de documentos consecutivos: la memoria queda
+# acotada por k más el bloque, no por la cantidad de coincidencias.
+_BLOQUE_RANKING = 4096
+
+# Con menos candidatos que (largo del posting / este factor) conviene
+# verificarlos con búsqueda binaria antes que armar el conjunto del posting.
+_FACTOR_BUSQUEDA_BINARIA = 16
+
+
+def _rasgos(registro: dict) -> dict[str, dict]:
+    """campo -> {valor: nivel (etiquetas) o None} de un registro crudo."""
+    rasgos = {campo: {} for campo in CAMPOS}
+    for tag, nivel in (registro.get("etiquetas") or {}).items():
+        rasgos["etiqueta"][tag] = float(nivel) if _es_numero(nivel) else float("nan")
+    for campo, valores in (
+        ("palabra_clave", registro.get("palabras_claves") or ()),
+        ("actor", registro.get("actores") or ()),
+        ("director", (registro.get("director"),)),
+    ):
+        for valor in valores:
+            if valor is not None:
+                try:
+                    rasgos[campo][valor] = None
+                except TypeError:
+                    # Valor no hasheable: no se indexa (las consultas no lo encontrarían).
+                    pass
+    anio = registro.get("anio")
+    if _es_numero(anio):
+        rasgos["anio"][anio] = None
+    rasgos["termino"] = terminos_registro(registro)
+    return rasgos
+
+
+class IndicePostings:
+    """
+    Postings campo -> valor -> documentos (ordenados) de un conjunto de registros.
+
+    Args:
+        registros (iterable[dict], opcional): registros iniciales (con "id").
+    """
+
+    def __init__(self, registros=()):
+        # id -> número de documento, y número de documento -> id (None = dado de baja)
+        self._docs: dict[str, int] = {}
+        self._ids: list[str | None] = []
+        # campo -> valor -> documentos ordenados
+        self._postings: dict[str, dict] = {campo: {} for campo in CAMPOS}
+        # campo -> valor -> valores alineados con `_postings[campo][valor]`
+        # (niveles de las etiquetas, frecuencias de los términos)
+        self._valores: dict[str, dict[str, array]] = {campo: {} for campo in _CAMPOS_CON_VALOR}
+        # largo (suma de frecuencias de términos) de cada documento, para BM25
+        self._largos = array("d")
+        self._largo_total = 0.0
+        for registro in registros:
+            self.agregar(registro)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, registro_id):
+        return registro_id in self._docs
+
+    # --- Mantenimiento ---
+
+    def agregar(self, registro: dict, anterior: dict | None = None):
+        """
+        Indexa un registro. Si ya estaba indexado, `anterior` debe ser la versión
+        que se reemplaza (para quitar sus rasgos).
+        """
+        registro_id = registro.get("id")
+        doc = self._docs.get(registro_id)
+        if doc is None:
+            doc = len(self._ids)
+            self._docs[registro_id] = doc
+            self._ids.append(registro_id)
+            self._largos.append(0.0)
+        else:
+            if anterior is None:
+                raise ValueError(f"Falta la versión anterior del registro '{registro_id}' para reindexarlo.")
+            self._quitar(doc, _rasgos(anterior))
+        self._poner(doc, _rasgos(registro))
+
+    def eliminar(self, registro: dict) -> bool:
+        """Quita un registro (la versión indexada). Devuelve False si no estaba."""
+        doc = self._docs.pop(registro.get("id"), None)
+        if doc is None:
+            return False
+        self._quitar(doc, _rasgos(registro))
+        self._ids[doc] = None
+        return True
+
+    def _poner(self, doc: int, rasgos: dict):
+        for campo, valores in rasgos.items():
+            postings = self._postings[campo]
+            alineados = self._valores.get(campo)
+            for valor, dato in valores.items():
+                docs = postings.get(valor)
+                if docs is None:
+                    docs = postings[valor] = array("I")
+                    if alineados is not None:
+                        alineados[valor] = array("d")
+                # Las altas llegan en orden: casi siempre es un append.
+                posicion = len(docs) if not docs or docs[-1] < doc else bisect_left(docs, doc)
+                docs.insert(posicion, doc)
+                if alineados is not None:
+                    alineados[valor].insert(posicion, dato)
+        largo = sum(rasgos["termino"].values())
+        self._largos[doc] = largo
+        self._largo_total += largo
+
+    def _quitar(self, doc: int, rasgos: dict):
+        for campo, valores in rasgos.items():
+            postings = self._postings[campo]
+            alineados = self._valores.get(campo)
+            for valor in valores:
+                docs = postings.get(valor)
+                if docs is None:
+                    continue
+                posicion = bisect_left(docs, doc)
+                if posicion == len(docs) or docs[posicion] != doc:
+                    continue
+                del docs[posicion]
+                if alineados is not None:
+                    del alineados[valor][posicion]
+                if not docs:
+                    del postings[valor]
+                    if alineados is not None:
+                        del alineados[valor]
+        self._largo_total -= self._largos[doc]
+        self._largos[doc] = 0.0
+
+    # --- Consultas ---
+
+    def _todos(self) -> set[int]:
+        return set(self._docs.values())
+
+    def _posting(self, consulta: Rasgo):
+        return self._postings[consulta.campo].get(consulta.valor, ())
+
+    def _estimar(self, consulta: Consulta) -> int:
+        """Cota del tamaño del resultado (para elegir por dónde empezar una Y)."""
+        if isinstance(consulta, Rasgo):
+            return len(self._posting(consulta))
+        return len(self._docs)
+
+    def _evaluar(self, consulta: Consulta) -> set[int]:
+        """Números de documento que cumplen la consulta."""
+        if isinstance(consulta, Etiqueta) and consulta.minimo is not None:
+            niveles = self._valores["etiqueta"].get(consulta.valor, ())
+            return {doc for doc, nivel in zip(self._posting(consulta), niveles) if nivel >= consulta.minimo}
+
+        if isinstance(consulta, Rasgo):
+            return set(self._posting(consulta))
+
+        if isinstance(consulta, Anio):
+            docs = set()
+            for anio, posting in self._postings["anio"].items():
+                if consulta.desde <= anio <= consulta.hasta:
+                    docs.update(posting)
+            return docs
+
+        if isinstance(consulta, Y):
+            positivas = sorted(
+                (c for c in consulta.consultas if not isinstance(c, No)), key=self._estimar
+            )
+            negativas = [c.consulta for c in consulta.consultas if isinstance(c, No)]
+            docs = self._evaluar(positivas[0]) if positivas else self._todos()
+            for c in positivas[1:]:
+                if not docs:
+                    return docs
+                docs = self._intersectar(docs, c)
+            for c in negativas:
+                if not docs:
+                    return docs
+                docs -= self._evaluar(c)
+            return docs
+
+        if isinstance(consulta, O):
+            docs = set()
+            for c in consulta.consultas:
+                docs |= self._evaluar(c)
+            return docs
+
+        if isinstance(consulta, No):
+            return self._todos() - self._evaluar(consulta.consulta)
+
+        raise TypeError(f"Consulta no soportada: {consulta!r}")
+
+    def _intersectar(self, docs: set[int], consulta: Consulta) -> set[int]:
+        """`docs` ∩ resultado de `consulta`, sin armar postings largos si `docs` es chico."""
+        if (
+            isinstance(consulta, Rasgo)
+            and not (isinstance(consulta, Etiqueta) and consulta.minimo is not None)
+        ):
+            posting = self._posting(consulta)
+            if len(docs) * _FACTOR_BUSQUEDA_BINARIA < len(posting):
+                resultado = set()
+                for doc in docs:
+                    posicion = bisect_left(posting, doc)
+                    if posicion < len(posting) and posting[posicion] == doc:
+                        resultado.add(doc)
+                return resultado
+        return docs & self._evaluar(consulta)
+
+    def buscar(self, consulta: Consulta) -> list[str]:
+        """Ids (en orden de alta) de los registros que cumplen la consulta."""
+        return [self._ids[doc] for doc in sorted(self._evaluar(consulta))]
+
+    # --- Relevancia (BM25) ---
+
+    def estadisticas_bm25(self, terminos) -> EstadisticasBM25:
+        """Cantidad de documentos, largo total y frecuencia documental de los `terminos`."""
+        postings = self._postings["termino"]
+        return EstadisticasBM25(
+            len(self._docs),
+            self._largo_total,
+            {t: len(postings[t]) for t in terminos if t in postings},
+        )
+
+    def rankear(
+        self,
+        consulta: dict[str, int],
+        etiquetas=(),
+        k: int = 10,
+        estadisticas: EstadisticasBM25 | None = None,
+    ) -> list[tuple[float, int, str]]:
+        """
+        Los `k` mejores `(puntaje, orden, id)` para los términos de `consulta`
+        (ver `ranking.consulta_bm25`), ponderados por los niveles de `etiquetas`.
+        Sin términos, se ordena solo por esos niveles. `estadisticas` permite
+        puntuar con las de todo el catálogo; por defecto, las de este índice.
+        """
+        top = TopK(k)
+        if k == 0 or not (consulta or etiquetas):
+            return top.resultados()
+        if estadisticas is None:
+            estadisticas = self.estadisticas_bm25(consulta)
+        largo_medio = estadisticas.largo_medio
+
+        # Por cada lista: (documentos, valores alineados, posición actual, ...)
+        terminos = [
+            [self._postings["termino"][t], self._valores["termino"][t], 0, repeticiones, estadisticas.idf(t)]
+            for t, repeticiones in consulta.items()
+            if t in self._postings["termino"]
+        ]
+        niveles = [
+            [self._postings["etiqueta"][e], self._valores["etiqueta"][e], 0]
+            for e in dict.fromkeys(etiquetas)
+            if e in self._postings["etiqueta"]
+        ]
+        if consulta and not terminos or not consulta and not niveles:
+            return top.resultados()
+
+        largos = self._largos
+        for inicio in range(0, len(self._ids), _BLOQUE_RANKING):
+            fin = inicio + _BLOQUE_RANKING
+            puntajes = {}
+            for lista in terminos:
+                docs, frecuencias, i, repeticiones, idf = lista
+                while i < len(docs) and docs[i] < fin:
+                    doc = docs[i]
+                    puntajes[doc] = puntajes.get(doc, 0.0) + repeticiones * aporte(
+                        frecuencias[i], largos[doc], idf, largo_medio
+                    )
+                    i += 1
+                lista[2] = i
+
+            bonus = {}
+            for lista in niveles:
+                docs, valores, i = lista
+                while i < len(docs) and docs[i] < fin:
+                    nivel = valores[i]
+                    if nivel == nivel:  # NaN: nivel no numérico
+                        bonus[docs[i]] = bonus.get(docs[i], 0.0) + nivel
+                    i += 1
+                lista[2] = i
+
+            if consulta:
+                puntajes = ((doc, puntaje * (1.0 + bonus.get(doc, 0.0))) for doc, puntaje in puntajes.items())
+            else:
+                puntajes = bonus.items()
+            for doc, puntaje in puntajes:
+                if puntaje > 0:
+                    top.agregar(puntaje, doc, self._ids[doc])
+        return top.resultados()
@@ -0,0 +1,166 @@
+"""
+Índice de trigramas para las búsquedas por subcadena de `NuevoCatalogo.buscar`
+(título e id), sin distinguir mayúsculas ni acentos.
+
+Cada texto se normaliza (`normalizar_texto`) y se parte en trigramas: "matrix"
+-> {"mat", "atr", "tri", "rix"}. Toda subcadena de 3 o más caracteres tiene sus
+trigramas en el texto que la contiene, así que los candidatos de una consulta
+salen de la lista (posting) de su trigrama MENOS frecuente, y solo esos pocos
+se verifican con `in` sobre el texto normalizado. Las consultas de 1 o 2
+caracteres no tienen trigramas y se verifican contra todos los textos (que ya
+están normalizados en el índice: tampoco hace falta hidratar nada).
+
+Los postings son `array("I")` de números de documento (4 bytes por entrada).
+Las bajas y los cambios de texto no los recorren: dejan entradas obsoletas que
+la verificación descarta, y cuando son demasiadas el índice se reconstruye.
+"""
+
+import unicodedata
+from array import array
+
+
+def normalizar_texto(texto: str) -> str:
+    """Texto en minúsculas y sin acentos/diacríticos ("Película" -> "pelicula")."""
+    texto = texto.lower()
+    if texto.isascii():
+        return texto
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    )
+
+
+def trigramas(texto: str) -> set[str]:
+    """Trigramas (subcadenas de 3 caracteres) de un texto ya normalizado."""
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTrigramas:
+    """
+    Índice de trigramas de los campos `CAMPOS` de un conjunto de registros.
+
+    Los documentos se numeran en orden de alta (un reemplazo conserva su número),
+    así que `buscar` devuelve los ids en ese mismo orden.
+
+    Args:
+        registros (iterable[dict], opcional): registros iniciales (con "id").
+    """
+
+    CAMPOS = ("titulo", "id")
+
+    def __init__(self, registros=()):
+        self._vaciar()
+        for registro in registros:
+            self.agregar(registro)
+
+    def _vaciar(self):
+        # id -> número de documento, y número de documento -> id (None = dado de baja)
+        self._docs: dict[str, int] = {}
+        self._ids: list[str | None] = []
+        # campo -> textos normalizados por documento
+        self._textos: dict[str, list[str | None]] = {campo: [] for campo in self.CAMPOS}
+        # campo -> trigrama -> documentos que lo contenían al indexarse
+        self._postings: dict[str, dict[str, array]] = {campo: {} for campo in self.CAMPOS}
+        self._entradas = 0
+        self._obsoletas = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, registro_id):
+        return registro_id in self._docs
+
+    # --- Mantenimiento ---
+
+    def agregar(self, registro: dict):
+        """Indexa un registro nuevo o actualiza los textos de uno existente."""
+        registro_id = registro.get("id")
+        doc = self._docs.get(registro_id)
+        if doc is None:
+            doc = len(self._ids)
+            self._docs[registro_id] = doc
+            self._ids.append(registro_id)
+            for textos in self._textos.values():
+                textos.append(None)
+
+        for campo in self.CAMPOS:
+            valor = registro.get(campo)
+            nuevo = normalizar_texto(valor) if isinstance(valor, str) else ""
+            anterior = self._textos[campo][doc]
+            if nuevo == anterior:
+                continue
+            previos = trigramas(anterior) if anterior else set()
+            actuales = trigramas(nuevo)
+            postings = self._postings[campo]
+            for trigrama in actuales - previos:
+                posting = postings.get(trigrama)
+                if posting is None:
+                    posting = postings[trigrama] = array("I")
+                posting.append(doc)
+            self._entradas += len(actuales - previos)
+            # Los trigramas que el texto ya no tiene quedan como entradas obsoletas.
+            self._obsoletas += len(previos - actuales)
+            self._textos[campo][doc] = nuevo
+
+        self._compactar_si_hace_falta()
+
+    def eliminar(self, registro_id: str) -> bool:
+        """Da de baja un registro. Devuelve False si no estaba indexado."""
+        doc = self._docs.pop(registro_id, None)
+        if doc is None:
+            return False
+        self._ids[doc] = None
+        for campo in self.CAMPOS:
+            texto = self._textos[campo][doc]
+            if texto:
+                self._obsoletas += len(trigramas(texto))
+            self._textos[campo][doc] = None
+        self._compactar_si_hace_falta()
+        return True
+
+    def _compactar_si_hace_falta(self):
+        """Reconstruye el índice cuando más de la mitad de las entradas están obsoletas."""
+        if self._obsoletas <= 1024 or self._obsoletas * 2 <= self._entradas:
+            return
+        vivos = [
+            {"id": registro_id, **{campo: self._textos[campo][doc] for campo in self.CAMPOS if campo != "id"}}
+            for doc, registro_id in enumerate(self._ids)
+            if registro_id is not None
+        ]
+        self._vaciar()
+        for registro in vivos:
+            self.agregar(registro)
+
+    # --- Consultas ---
+
+    def _verificar(self, campo: str, consulta: str, docs) -> set[int]:
+        textos = self._textos[campo]
+        return {doc for doc in docs if textos[doc] is not None and consulta in textos[doc]}
+
+    def buscar(self, titulo: str | None = None, id_contenido: str | None = None) -> list[str]:
+        """
+        Ids (en orden de alta) cuyo título y/o id contienen las subcadenas dadas,
+        sin distinguir mayúsculas ni acentos. Sin filtros devuelve todos.
+        """
+        candidatos = None  # None = todos los documentos vivos
+        for campo, consulta in (("titulo", titulo), ("id", id_contenido)):
+            if not consulta:
+                continue
+            consulta = normalizar_texto(consulta)
+            buscados = trigramas(consulta)
+            if buscados:
+                postings = [self._postings[campo].get(t) for t in buscados]
+                if any(posting is None for posting in postings):
+                    return []
+                # El trigrama menos frecuente acota los candidatos.
+                docs = set(min(postings, key=len))
+                if candidatos is not None:
+                    docs &= candidatos
+            elif candidatos is not None:
+                docs = candidatos
+            else:
+                docs = range(len(self._ids))
+            candidatos = self._verificar(campo, consulta, docs)
+
+        if candidatos is None:
+            candidatos = self._docs.values()
+        return [self._ids[doc] for doc in sorted(candidatos)]
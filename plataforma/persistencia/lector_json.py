@@ -0,0 +1,156 @@
+"""
+Lectura incremental (en streaming) de los archivos JSON de `db/`.
+
+`json.load` arma el documento entero antes de devolver nada. Aquí se lee el
+archivo por bloques y se decodifica UN registro a la vez con
+`JSONDecoder.raw_decode`, así que la memoria usada es la del registro actual
+(más un bloque de lectura), sin importar el tamaño del archivo.
+
+Formato esperado: `{"<clave>": [registro, ...]}` o `{"<clave>": {id: registro, ...}}`.
+"""
+
+import json
+import os
+import re
+
+
+_DECODIFICADOR = json.JSONDecoder()
+_ESPACIOS = re.compile(r"\s*")
+# Caracteres que pueden seguir a un valor completo.
+_DELIMITADORES = frozenset(",]}: \t\r\n")
+
+# Caracteres leídos por bloque.
+TAMANIO_BLOQUE = 64 * 1024
+
+
+class _LectorIncremental:
+    """Cursor sobre un archivo de texto que decodifica valores JSON de a uno."""
+
+    def __init__(self, archivo, tamanio_bloque: int = TAMANIO_BLOQUE):
+        self._archivo = archivo
+        self._tamanio_bloque = tamanio_bloque
+        self._buffer = ""
+        self._pos = 0
+        self._fin = False
+
+    def _leer_mas(self) -> bool:
+        """Agrega un bloque al buffer (descartando lo ya consumido). False si no hay más."""
+        if self._fin:
+            return False
+        # Si un valor no entra en el buffer, se lee de a bloques cada vez más grandes.
+        bloque = self._archivo.read(max(self._tamanio_bloque, len(self._buffer) - self._pos))
+        if not bloque:
+            self._fin = True
+            return False
+        self._buffer = self._buffer[self._pos:] + bloque
+        self._pos = 0
+        return True
+
+    def caracter(self) -> str | None:
+        """Próximo carácter que no es espacio (sin consumirlo), o None al final."""
+        while True:
+            self._pos = _ESPACIOS.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._leer_mas():
+                return None
+
+    def consumir(self, esperado: str):
+        caracter = self.caracter()
+        if caracter != esperado:
+            raise json.JSONDecodeError(
+                f"Se esperaba '{esperado}' y se encontró {caracter!r}", self._buffer, self._pos
+            )
+        self._pos += 1
+
+    def valor(self):
+        """Decodifica el próximo valor JSON completo."""
+        self.caracter()
+        while True:
+            try:
+                valor, fin = _DECODIFICADOR.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Valor cortado por el final del bloque: se lee más y se reintenta.
+                if not self._leer_mas():
+                    raise
+                continue
+            # Un número cortado por el bloque ("12" de "123", "2" de "2.5") se decodifica
+            # igual: solo se acepta si lo que sigue confirma que el valor terminó.
+            if self._buffer[fin:fin + 1] not in _DELIMITADORES and self._leer_mas():
+                continue
+            self._pos = fin
+            return valor
+
+    def elementos(self):
+        """Genera los elementos de un array, o los valores de un objeto, de a uno."""
+        apertura = self.caracter()
+        if apertura not in ("[", "{"):
+            self.valor()
+            return
+
+        cierre = "]" if apertura == "[" else "}"
+        self._pos += 1
+        if self.caracter() == cierre:
+            self._pos += 1
+            return
+
+        while True:
+            if apertura == "{":
+                self.valor()  # clave (id)
+                self.consumir(":")
+            yield self.valor()
+
+            caracter = self.caracter()
+            if caracter == ",":
+                self._pos += 1
+            elif caracter == cierre:
+                self._pos += 1
+                return
+            else:
+                raise json.JSONDecodeError(
+                    f"Se esperaba ',' o '{cierre}'", self._buffer, self._pos
+                )
+
+
+def _iterar(archivo, clave: str):
+    lector = _LectorIncremental(archivo)
+    lector.consumir("{")
+    if lector.caracter() == "}":
+        return
+
+    while True:
+        nombre = lector.valor()
+        lector.consumir(":")
+        if nombre == clave:
+            yield from lector.elementos()
+            return
+        # Otra clave del documento: se decodifica y se descarta.
+        lector.valor()
+
+        caracter = lector.caracter()
+        if caracter == ",":
+            lector.consumir(",")
+        elif caracter == "}":
+            return
+        else:
+            lector.consumir("}")
+
+
+def iterar_registros_json(ruta: str, clave: str):
+    """
+    Genera, de a uno, los registros guardados bajo `clave` en el JSON de `ruta`
+    (sea un array o un objeto id -> registro), sin cargar el archivo entero.
+
+    Ej:
+        for data in iterar_registros_json("db/peliculas.json", "peliculas"):
+            ...
+    """
+    if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+        return
+
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            yield from _iterar(f, clave)
+    except json.JSONDecodeError as e:
+        # Si el JSON está mal, hay que avisar de forma brutal.
+        print(f"Error fatal: El archivo '{ruta}' no tiene un formato JSON válido: {e}")
@@ -0,0 +1,147 @@
+"""
+Búsqueda por relevancia (BM25) sobre el título y las palabras clave.
+
+Cada contenido es una bolsa de términos: los del título (normalizados como en
+`normalizar_texto` y separados por palabra) pesan `PESO_TITULO` y los de las
+palabras clave `PESO_PALABRA_CLAVE`. El puntaje de un contenido para una
+consulta es
+
+    bm25 = Σ_t  q_t · idf(t) · tf·(K1 + 1) / (tf + K1·(1 - B + B·largo / largo_medio))
+
+y, si se piden etiquetas, se multiplica por (1 + suma de los niveles que el
+contenido tiene en ellas). Sin texto, el puntaje es directamente esa suma.
+
+`puntuar_registro` es la referencia; `IndicePostings.rankear` calcula lo mismo
+con las listas invertidas. En ambos casos se conserva solo un montículo de
+los k mejores (`TopK`).
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from .indice_trigramas import normalizar_texto
+
+
+K1 = 1.2
+B = 0.75
+PESO_TITULO = 2.0
+PESO_PALABRA_CLAVE = 1.0
+
+_PALABRA = re.compile(r"\w+")
+
+
+def tokenizar(texto) -> list[str]:
+    """Términos normalizados de un texto ("El Señor..." -> ["el", "senor", ...])."""
+    if not isinstance(texto, str):
+        return []
+    return _PALABRA.findall(normalizar_texto(texto))
+
+
+def consulta_bm25(texto: str | None) -> dict[str, int]:
+    """Términos de la consulta -> cantidad de veces que aparecen (en orden de aparición)."""
+    return dict(Counter(tokenizar(texto)))
+
+
+def terminos_registro(registro: dict) -> dict[str, float]:
+    """Término -> frecuencia ponderada en el título y las palabras clave de un registro."""
+    frecuencias = {}
+    for termino in tokenizar(registro.get("titulo")):
+        frecuencias[termino] = frecuencias.get(termino, 0.0) + PESO_TITULO
+    for palabra in registro.get("palabras_claves") or ():
+        for termino in tokenizar(palabra):
+            frecuencias[termino] = frecuencias.get(termino, 0.0) + PESO_PALABRA_CLAVE
+    return frecuencias
+
+
+def _nivel(nivel) -> float | None:
+    if isinstance(nivel, (int, float)) and not isinstance(nivel, bool) and nivel == nivel:
+        return float(nivel)
+    return None
+
+
+class EstadisticasBM25:
+    """
+    Estadísticas de la colección que usa el idf: cantidad de contenidos, suma
+    de sus largos y en cuántos aparece cada término buscado. Se pueden sumar
+    las de varios almacenes para puntuar todo el catálogo con la misma escala.
+    """
+
+    def __init__(self, cantidad: int = 0, largo_total: float = 0.0, frecuencias: dict | None = None):
+        self.cantidad = cantidad
+        self.largo_total = largo_total
+        self.frecuencias = dict(frecuencias or {})
+
+    def __add__(self, otra: "EstadisticasBM25") -> "EstadisticasBM25":
+        frecuencias = Counter(self.frecuencias)
+        frecuencias.update(otra.frecuencias)
+        return EstadisticasBM25(
+            self.cantidad + otra.cantidad, self.largo_total + otra.largo_total, frecuencias
+        )
+
+    @property
+    def largo_medio(self) -> float:
+        return self.largo_total / self.cantidad if self.cantidad else 0.0
+
+    def idf(self, termino: str) -> float:
+        df = self.frecuencias.get(termino, 0)
+        return math.log(1 + (self.cantidad - df + 0.5) / (df + 0.5))
+
+
+def aporte(tf: float, largo: float, idf: float, largo_medio: float) -> float:
+    """Aporte BM25 de un término con frecuencia `tf` en un contenido de `largo` términos."""
+    normalizado = largo / largo_medio if largo_medio else 0.0
+    return idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * normalizado))
+
+
+def puntuar_registro(
+    data: dict, consulta: dict[str, int], etiquetas, estadisticas: EstadisticasBM25
+) -> float:
+    """Puntaje de un registro crudo (0 si no coincide; solo cuentan los positivos)."""
+    puntaje = 0.0
+    if consulta:
+        frecuencias = terminos_registro(data)
+        largo = sum(frecuencias.values())
+        for termino, repeticiones in consulta.items():
+            tf = frecuencias.get(termino)
+            if tf:
+                puntaje += repeticiones * aporte(tf, largo, estadisticas.idf(termino), estadisticas.largo_medio)
+        if not puntaje:
+            return 0.0
+
+    bonus = 0.0
+    niveles = data.get("etiquetas") or {}
+    for etiqueta in dict.fromkeys(etiquetas or ()):
+        nivel = _nivel(niveles.get(etiqueta))
+        if nivel is not None:
+            bonus += nivel
+    return puntaje * (1.0 + bonus) if consulta else bonus
+
+
+class TopK:
+    """
+    Los `k` mejores (puntaje, orden, valor) vistos, con un montículo de tamaño k.
+    A igual puntaje gana el de menor `orden` (el dado de alta antes).
+    """
+
+    def __init__(self, k: int):
+        if k < 0:
+            raise ValueError("k no puede ser negativo.")
+        self.k = k
+        self._monticulo = []
+
+    def agregar(self, puntaje: float, orden: int, valor):
+        if self.k == 0:
+            return
+        entrada = (puntaje, -orden, valor)
+        if len(self._monticulo) < self.k:
+            heapq.heappush(self._monticulo, entrada)
+        elif entrada[:2] > self._monticulo[0][:2]:
+            heapq.heapreplace(self._monticulo, entrada)
+
+    def resultados(self) -> list[tuple[float, int, object]]:
+        """(puntaje, orden, valor) de mayor a menor puntaje."""
+        return [
+            (puntaje, -orden, valor)
+            for puntaje, orden, valor in sorted(self._monticulo, key=lambda e: e[:2], reverse=True)
+        ]
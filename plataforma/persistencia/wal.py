@@ -0,0 +1,226 @@
+import itertools
+import json
+import os
+import threading
+
+
+# Tamaño del log (en bytes) a partir del cual conviene compactarlo en el snapshot.
+UMBRAL_COMPACTACION = 4 * 1024 * 1024
+
+# Sufijo de los archivos temporales: único por proceso y escritura.
+_temporales = itertools.count()
+
+
+def _reemplazar_atomico(ruta: str, escribir, binario: bool = False):
+    """
+    Escribe con `escribir(f)` en un temporal propio junto a `ruta` y lo renombra
+    sobre ella: dos escrituras simultáneas nunca comparten el temporal.
+    """
+    temporal = f"{ruta}.{os.getpid()}.{next(_temporales)}.tmp"
+    archivo = open(temporal, "xb") if binario else open(temporal, "x", encoding="utf-8")
+    try:
+        with archivo as f:
+            escribir(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+def escribir_json_atomico(ruta: str, data, indent=2):
+    """
+    Escribe `data` como JSON en un archivo temporal y lo renombra sobre `ruta`.
+    Un corte a mitad de escritura deja intacto el archivo anterior.
+    """
+    _reemplazar_atomico(ruta, lambda f: json.dump(data, f, indent=indent, ensure_ascii=False))
+
+
+class RegistroWAL:
+    """
+    Write-Ahead Log de solo-anexado que acompaña a un snapshot JSON (`db/*.json`).
+
+    Cada mutación se agrega como UNA línea JSON en `<snapshot>.log`, así que
+    escribir cuesta O(1) y un corte solo puede romper la última línea (que se
+    ignora al reproducir). Al cargar, el repositorio lee el snapshot y luego
+    aplica `operaciones()` en orden. Cuando el log supera `umbral_bytes`, el
+    repositorio llama a `compactar()`, que escribe un snapshot nuevo en segundo
+    plano y recorta del log lo que ese snapshot ya incluye.
+
+    Las operaciones son idempotentes ("guardar"/"eliminar" por id), por eso un
+    corte entre que se escribe el snapshot y se recorta el log no pierde datos:
+    reproducir de más da el mismo resultado.
+
+    Las compactaciones no se superponen: cada una espera a que termine la
+    anterior antes de medir su corte, así los snapshots se escriben en orden
+    y ningún corte se toma sobre un log que después se reescribe.
+
+    Args:
+        ruta_snapshot (str): ruta del archivo JSON principal.
+        umbral_bytes (int): tamaño del log que dispara la compactación.
+        sincronizar (bool): si es True hace `fsync` en cada escritura
+            (sobrevive a cortes de energía, a costa de latencia).
+    """
+
+    def __init__(self, ruta_snapshot: str, umbral_bytes: int = UMBRAL_COMPACTACION, sincronizar: bool = False):
+        self.ruta_snapshot = ruta_snapshot
+        self.ruta_log = f"{ruta_snapshot}.log"
+        self.umbral_bytes = umbral_bytes
+        self.sincronizar = sincronizar
+
+        self._archivo = None
+        self._lock = threading.Lock()
+        # Serializa las compactaciones (ver `compactar`).
+        self._lock_compactacion = threading.Lock()
+        self._hilos = []
+
+    # --- Lectura ---
+
+    def operaciones(self):
+        """
+        Genera las operaciones del log en orden. Si la última línea quedó
+        incompleta (escritura cortada), se descarta y se recorta el archivo
+        para que las próximas escrituras no queden pegadas a ella.
+        """
+        if not os.path.exists(self.ruta_log):
+            return
+
+        valido = 0
+        cortado = False
+        with open(self.ruta_log, "rb") as f:
+            for numero, linea in enumerate(f, start=1):
+                try:
+                    if not linea.endswith(b"\n"):
+                        raise ValueError("línea sin terminar")
+                    if linea.strip():
+                        operacion = json.loads(linea.decode("utf-8"))
+                    else:
+                        operacion = None
+                except ValueError:
+                    # Escritura cortada: lo que sigue no es confiable.
+                    print(f"Aviso: línea {numero} incompleta en '{self.ruta_log}', se descarta el resto.")
+                    cortado = True
+                    break
+                valido += len(linea)
+                if operacion is not None:
+                    yield operacion
+
+        if cortado:
+            with self._lock:
+                os.truncate(self.ruta_log, valido)
+
+    # --- Escritura ---
+
+    def _abrir(self):
+        if self._archivo is None:
+            directorio = os.path.dirname(self.ruta_log)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            self._archivo = open(self.ruta_log, "a", encoding="utf-8")
+        return self._archivo
+
+    def agregar(self, operacion: dict):
+        """Anexa una operación al log (una línea JSON)."""
+        linea = json.dumps(operacion, ensure_ascii=False)
+        with self._lock:
+            f = self._abrir()
+            f.write(linea + "\n")
+            f.flush()
+            if self.sincronizar:
+                os.fsync(f.fileno())
+
+    def agregar_muchas(self, operaciones: list[dict]):
+        """Anexa varias operaciones con una sola escritura (p. ej. al confirmar una transacción)."""
+        if not operaciones:
+            return
+        bloque = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in operaciones)
+        with self._lock:
+            f = self._abrir()
+            f.write(bloque)
+            f.flush()
+            if self.sincronizar:
+                os.fsync(f.fileno())
+
+    def tamanio(self) -> int:
+        """Tamaño actual del log en bytes."""
+        with self._lock:
+            if self._archivo is not None:
+                return self._archivo.tell()
+        return os.path.getsize(self.ruta_log) if os.path.exists(self.ruta_log) else 0
+
+    # --- Compactación ---
+
+    def compactando(self) -> bool:
+        return any(hilo.is_alive() for hilo in self._hilos)
+
+    def necesita_compactar(self) -> bool:
+        return not self.compactando() and self.tamanio() >= self.umbral_bytes
+
+    def compactar(self, datos, en_segundo_plano: bool = True):
+        """
+        Escribe `datos` como snapshot y quita del log las operaciones que ya incluye.
+
+        `datos` es el estado actual o una función que lo devuelve. Con una
+        función, la copia se toma recién cuando le toca el turno a esta
+        compactación (después del corte), así no puede ser más vieja que el
+        corte. Con un dict, debe ser una copia tomada por el repositorio en el
+        mismo momento de la llamada (las escrituras posteriores quedan en el log).
+
+        Si hay otra compactación en curso, primero se espera a que termine.
+        """
+        with self._lock_compactacion:
+            self.esperar()
+            with self._lock:
+                if self._archivo is not None:
+                    self._archivo.flush()
+                corte = os.path.getsize(self.ruta_log) if os.path.exists(self.ruta_log) else 0
+            # Reproducir desde el corte sobre un estado posterior es inocuo
+            # (operaciones idempotentes), así que el estado se toma después.
+            if callable(datos):
+                datos = datos()
+
+            if en_segundo_plano:
+                hilo = threading.Thread(
+                    target=self._compactar, args=(datos, corte), name="compactacion-wal", daemon=True
+                )
+                self._hilos = [h for h in self._hilos if h.is_alive()] + [hilo]
+                hilo.start()
+            else:
+                self._compactar(datos, corte)
+
+    def _compactar(self, datos: dict, corte: int):
+        try:
+            escribir_json_atomico(self.ruta_snapshot, datos)
+        except Exception as e:
+            # El log sigue intacto: no se pierde nada, se reintenta en la próxima.
+            print(f"Error al compactar '{self.ruta_log}' en '{self.ruta_snapshot}': {e}")
+            return
+
+        with self._lock:
+            # Conservamos solo lo escrito después del corte.
+            resto = b""
+            if os.path.exists(self.ruta_log):
+                with open(self.ruta_log, "rb") as f:
+                    f.seek(corte)
+                    resto = f.read()
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
+
+            _reemplazar_atomico(self.ruta_log, lambda f: f.write(resto), binario=True)
+
+    def esperar(self):
+        """Espera a que terminen las compactaciones en curso (si las hay)."""
+        for hilo in list(self._hilos):
+            if hilo is not threading.current_thread():
+                hilo.join()
+
+    def cerrar(self):
+        """Espera todas las compactaciones pendientes y cierra el archivo del log."""
+        with self._lock_compactacion:
+            self.esperar()
+        with self._lock:
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
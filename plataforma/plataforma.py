@@ -1,4 +1,5 @@
 import os
+from itertools import islice
 from time import sleep
 from typing import Optional, Dict, List
 from enum import Enum
@@ -56,10 +57,24 @@ def animacion_carga(mensaje: str = "Cargando", duracion: float = 1.25):
 class Plataforma:
     """Gestiona el catálogo, clientes y estado de la sesión"""
 
-    def __init__(self, nombre: str = NOMBRE):
+    def __init__(self, nombre: str = NOMBRE, precargar: bool = False, carga_paralela: str | None = None):
+        """
+        Args:
+            nombre (str): nombre de la plataforma.
+            precargar (bool): si es True, carga el catálogo y los clientes en
+                segundo plano desde ya; si no, cada base se abre en su primer uso.
+            carga_paralela (str, opcional): "hilos" o "procesos" para cargar e
+                indexar todas las bases a la vez antes de seguir (ver `cargar_en_paralelo`).
+        """
         self.nombre = nombre
         self.catalogo = NuevoCatalogo()
         self.clientes = Clientes()
+        self.informe_carga = None
+        if carga_paralela:
+            self.cargar_en_paralelo(carga_paralela)
+        elif precargar:
+            self.catalogo.precargar()
+            self.clientes.precargar()
 
         # Estado de la sesión
         self._sesion_iniciada: bool = False
@@ -67,6 +82,18 @@ class Plataforma:
         self._contenido_actual = None
         self._tipo_contenido_actual: TipoContenido | None = None
 
+    def cargar_en_paralelo(self, modo: str = "hilos", max_trabajadores: int | None = None, indexar: bool = True):
+        """
+        Carga (y por defecto indexa) el catálogo y los clientes a la vez y espera
+        a que terminen. Devuelve el `InformeCarga` con el tiempo y los errores de
+        cada base (también queda en `informe_carga`).
+        """
+        from .carga_paralela import cargar_en_paralelo
+
+        bases = {**self.obtener_catalogo(), "clientes": self.clientes.db}
+        self.informe_carga = cargar_en_paralelo(bases, modo, max_trabajadores, indexar)
+        return self.informe_carga
+
     @property
     def sesion_iniciada(self) -> bool:
         return self._sesion_iniciada
@@ -90,6 +117,10 @@ class Plataforma:
             "documentales": self.catalogo.db_documentales,
         }
 
+    def obtener_grafo(self, tipo: TipoContenido) -> GrafoContenido:
+        """Obtiene el grafo de recomendaciones (cacheado) de un tipo de contenido"""
+        return self.catalogo.obtener_grafo(tipo.value)
+
     def buscar_contenido(self, tipo: TipoContenido, id_contenido: str):
         """Busca un contenido específico por ID"""
         try:
@@ -127,11 +158,16 @@ class Plataforma:
         self, nro_cliente: str = None, nombre_cliente: str = None
     ) -> bool:
         """Inicia sesión con el numero o nombre del cliente"""
-        cliente = (
-            self.clientes.obtener_cliente(nro_cliente=nro_cliente)
-            if nro_cliente
-            else self.clientes.obtener_cliente(nombre_cliente=nombre_cliente)
-        )
+        try:
+            cliente = (
+                self.clientes.obtener_cliente(nro_cliente=nro_cliente)
+                if nro_cliente
+                else self.clientes.obtener_cliente(nombre_cliente=nombre_cliente)
+            )
+        except ValueError as e:
+            # Nombre ambiguo (homónimos): no se elige un cliente al azar.
+            print(f"⚠️ {e}")
+            return False
 
         if cliente:
             self._sesion_iniciada = True
@@ -331,22 +367,16 @@ class Streaming:
 
     def _generar_recomendaciones(self, tipo: TipoContenido, contenido_actual: Dict):
         """Genera recomendaciones basadas en el contenido actual"""
-        gc = GrafoContenido()
-
-        # Agregar todos los contenidos al grafo
-        contenidos = self.plataforma.obtener_catalogo(tipo)
-        # `contenidos` habitualmente es una lista de objetos TDA; si fuera
-        # una lista de dicts, `construir_desde_contenidos` los convertirá.
-        gc.construir_desde_contenidos(contenidos, tipo=tipo.value)
-
-        gc.generar_similitud(tipo=tipo.value)
-        gc.generar_orden()
+        # El grafo se construye una vez por versión del catálogo y se
+        # reutiliza entre reproducciones (ver `NuevoCatalogo.obtener_grafo`).
+        gc = self.plataforma.obtener_grafo(tipo)
 
         print("\n🎬 RECOMENDACIONES BASADAS EN LO QUE ESTÁS VIENDO:")
         print("-" * 50)
 
         # `contenido_actual` es un objeto TDA; usar su atributo `id`.
-        autoplay = gc.bfs_ver_similar(contenido_actual.id)
+        # 💡 Generador: cada recomendación se muestra apenas el BFS la encuentra.
+        autoplay = islice(gc.iter_bfs_ver_similar(contenido_actual.id), gc.RESULTADOS_RECORRIDO)
         for item_id in autoplay:
             item = gc.vertices_contenido.get(item_id)
             if item:
@@ -0,0 +1,86 @@
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from plataforma.persistencia.almacen import AlmacenBase
+from plataforma.persistencia.almacen_sqlite import AlmacenSQLiteContenidos
+from plataforma.persistencia.ranking import consulta_bm25
+
+
+PALABRAS = ["anillo", "señor", "magia", "dragón", "noche", "rey", "mar", "fuego", "Éxodo", "luz"]
+BUSQUEDAS = [
+    ("señor de los anillos", [], 10),
+    ("magia fuego", ["Magia"], 25),
+    (None, ["Magia", "Drama"], 30),
+    ("exodo luz rey", ["Drama", "Drama"], 5000),
+    ("rey", ["Nada"], 7),
+    ("zzz", [], 5),
+]
+
+
+def registro(i: int, azar: random.Random) -> dict:
+    return {
+        "id": f"c{i}",
+        "titulo": " ".join(azar.sample(PALABRAS, azar.randint(1, 4))),
+        "palabras_claves": azar.sample(PALABRAS, azar.randint(0, 3)),
+        "etiquetas": {
+            tag: azar.choice([0.35, 0.5, 1, True, float("nan"), "alto"])
+            for tag in azar.sample(["Magia", "Acción", "Drama"], azar.randint(0, 3))
+        },
+    }
+
+
+class TestBM25SQLite(unittest.TestCase):
+    """Las tablas `terminos`/`largos` deben puntuar igual que recorrer los registros."""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "contenidos.db")
+        self.almacen = AlmacenSQLiteContenidos(self.ruta)
+        azar = random.Random(3)
+        self.almacen.iniciar_transaccion()
+        for i in range(600):
+            self.almacen.guardar(registro(i, azar))
+        self.almacen.persistir([])
+        for i in range(0, 600, 7):
+            self.almacen.eliminar(f"c{i}")
+        for i in range(1, 600, 11):
+            self.almacen.guardar(registro(i, azar))
+
+    def tearDown(self):
+        self.almacen.cerrar()
+        self.directorio.cleanup()
+
+    def assertComoRecorrido(self, almacen):
+        for texto, etiquetas, k in BUSQUEDAS:
+            with self.subTest(texto=texto, etiquetas=etiquetas):
+                consulta = consulta_bm25(texto)
+                esperadas = AlmacenBase.estadisticas_bm25(almacen, consulta)
+                obtenidas = almacen.estadisticas_bm25(consulta)
+                self.assertEqual(vars(obtenidas), vars(esperadas))
+
+                esperado = AlmacenBase.rankear(almacen, consulta, etiquetas, k)
+                obtenido = almacen.rankear(consulta, etiquetas, k)
+                self.assertEqual(
+                    [(puntaje, i) for puntaje, _, i in obtenido],
+                    [(puntaje, i) for puntaje, _, i in esperado],
+                )
+
+    def test_rankear_como_recorrido(self):
+        self.assertComoRecorrido(self.almacen)
+
+    def test_base_sin_tablas_de_terminos(self):
+        self.almacen.cerrar()
+        conexion = sqlite3.connect(self.ruta)
+        conexion.execute("DROP TABLE terminos")
+        conexion.execute("DROP TABLE largos")
+        conexion.commit()
+        conexion.close()
+        self.almacen = AlmacenSQLiteContenidos(self.ruta)
+        self.assertComoRecorrido(self.almacen)
+
+
+if __name__ == "__main__":
+    unittest.main()
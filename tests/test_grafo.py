@@ -0,0 +1,68 @@
+import unittest
+
+from plataforma.contenidos import Pelicula
+from plataforma.grafo_contenido import GrafoContenido
+from tests.test_similitud import catalogo_sintetico
+
+
+class TestGrafoIncremental(unittest.TestCase):
+    """`actualizar_vertice` y `eliminar_vertice` deben dejar el grafo de una reconstrucción."""
+
+    def setUp(self):
+        self.contenidos = catalogo_sintetico(300, semilla=7)
+
+    def construir(self, contenidos, **kwargs):
+        grafo = GrafoContenido()
+        grafo.construir_desde_contenidos(contenidos)
+        grafo.generar_similitud(umbral=4, tipo="peliculas", motor="indice", **kwargs)
+        grafo.generar_orden()
+        return grafo
+
+    def assertComoReconstruido(self, grafo, contenidos, **kwargs):
+        esperado = self.construir(contenidos, **kwargs)
+        self.assertEqual(list(grafo.vertices_contenido), list(esperado.vertices_contenido))
+        for nombre in ("adyacencia_similitud", "adyacencia_maraton"):
+            self.assertEqual(getattr(grafo, nombre), getattr(esperado, nombre), nombre)
+        for inicio in list(esperado.vertices_contenido)[::25]:
+            self.assertEqual(grafo.bfs_ver_similar(inicio), esperado.bfs_ver_similar(inicio))
+            self.assertEqual(grafo.dfs_autoplay(inicio), esperado.dfs_autoplay(inicio))
+
+    def copia_con(self, original, **cambios):
+        datos = original.to_dict()
+        datos.update(cambios)
+        return Pelicula.from_dict(datos)
+
+    def test_actualizar_existente(self):
+        grafo = self.construir(self.contenidos)
+        posicion = 120
+        modificado = self.copia_con(
+            self.contenidos[posicion], etiquetas=dict(self.contenidos[3].etiquetas)
+        )
+        grafo.actualizar_vertice(modificado)
+        self.contenidos[posicion] = modificado
+        self.assertComoReconstruido(grafo, self.contenidos)
+
+    def test_agregar_nuevo(self):
+        for kwargs in ({}, {"k_similares": 3, "k_maraton": 5}):
+            with self.subTest(**kwargs):
+                contenidos = list(self.contenidos)
+                grafo = self.construir(contenidos, **kwargs)
+                # Un id menor que todos: el orden por id no es el del catálogo.
+                nuevo = self.copia_con(contenidos[10], id="A00000", ids_secuelas=[])
+                grafo.actualizar_vertice(nuevo)
+                contenidos.append(nuevo)
+                self.assertComoReconstruido(grafo, contenidos, **kwargs)
+
+    def test_eliminar_y_volver_a_agregar(self):
+        grafo = self.construir(self.contenidos)
+        quitado = self.contenidos.pop(50)
+        grafo.eliminar_vertice(quitado.id)
+        self.assertComoReconstruido(grafo, self.contenidos)
+
+        grafo.actualizar_vertice(quitado)
+        self.contenidos.append(quitado)
+        self.assertComoReconstruido(grafo, self.contenidos)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+from unittest import mock
+
+from plataforma.contenidos import Pelicula, _helpers
+from plataforma.contenidos._motor_similitud import NUMPY_DISPONIBLE
+from plataforma.grafo_contenido import GrafoContenido
+
+
+ETIQUETAS = [
+    "Acción", "Drama", "Aventura", "Comedia", "Familia", "Magia",
+    "Tecnología", "Distopía", "Dinosaurios", "Cyberpunk", "Mar", "Histórica",
+]
+PALABRAS = [f"palabra{i}" for i in range(40)]
+
+
+def catalogo_sintetico(n, semilla=0):
+    """Películas al azar con valores de etiqueta de 2 decimales (sumas flotantes inexactas)."""
+    azar = random.Random(semilla)
+    return [
+        Pelicula.from_dict({
+            "id": f"P{i:05d}",
+            "titulo": f"Película {i}",
+            "director": f"Director {i % 30}",
+            "actores": ["Actor"],
+            "duracion": 100,
+            "produccion": "Estudio",
+            "anio": 2000,
+            "etiquetas": {tag: azar.choice([0.35, 0.55, 0.85, 1.0]) for tag in azar.sample(ETIQUETAS, 4)},
+            "palabras_claves": azar.sample(PALABRAS, 3),
+            "ids_secuelas": [f"P{i + 1:05d}"] if i % 17 == 0 else [],
+        })
+        for i in range(n)
+    ]
+
+
+class TestMotoresSimilitud(unittest.TestCase):
+    """Todos los motores de `generar_similitud` deben construir el mismo grafo."""
+
+    CONTENIDOS = catalogo_sintetico(300)
+
+    def grafo(self, motor, **kwargs):
+        grafo = GrafoContenido()
+        grafo.construir_desde_contenidos(self.CONTENIDOS)
+        grafo.generar_similitud(umbral=4, tipo="peliculas", motor=motor, **kwargs)
+        return grafo
+
+    def assertMismoGrafo(self, esperado, obtenido, motor):
+        for nombre in ("adyacencia_similitud", "adyacencia_maraton"):
+            self.assertEqual(getattr(esperado, nombre), getattr(obtenido, nombre), f"{motor}: {nombre}")
+
+    def comparar(self, **kwargs):
+        motores = ["indice"] + (["numpy"] if NUMPY_DISPONIBLE else [])
+        referencia = self.grafo("pares", **kwargs)
+        self.assertTrue(any(referencia.adyacencia_similitud.values()))
+        for motor in motores:
+            self.assertMismoGrafo(referencia, self.grafo(motor, **kwargs), motor)
+
+    def test_sin_limite(self):
+        self.comparar()
+
+    def test_con_limite_k(self):
+        self.comparar(k_similares=3, k_maraton=5)
+        self.comparar(k_similares=1)
+
+    def test_pesos_modificados(self):
+        # Los motores y la cota de candidatos leen los pesos de `_helpers`:
+        # cambiarlos allí no puede hacer que "indice" pierda aristas válidas.
+        niveles = {"similares": (("alto", 5.0), ("medio", 2.5), ("bajo", 9.0))}
+        with mock.patch.dict(_helpers._MULTIPLICADORES_NIVEL, niveles), \
+                mock.patch.dict(_helpers._PESO_DIRECTOR, {"maraton": 3.0}), \
+                mock.patch.dict(_helpers._multiplicadores, clear=True):
+            self.comparar()
+
+
+if __name__ == "__main__":
+    unittest.main()
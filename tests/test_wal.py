@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from plataforma.persistencia import wal
+from plataforma.persistencia.almacen import MODO_WAL
+from plataforma.persistencia.almacen_json import AlmacenJSON
+
+
+def registro(i):
+    return {"id": f"C{i:03d}", "nombre": f"Cliente {i}"}
+
+
+class TestRegistroWAL(unittest.TestCase):
+    def setUp(self):
+        self._directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directorio.cleanup)
+        self.ruta = os.path.join(self._directorio.name, "clientes.json")
+
+    def abrir(self) -> AlmacenJSON:
+        almacen = AlmacenJSON(self.ruta, "clientes", MODO_WAL)
+        self.addCleanup(almacen.cerrar)
+        return almacen
+
+    def escribir(self, almacen, desde, hasta):
+        for i in range(desde, hasta):
+            almacen.guardar(registro(i))
+            almacen.persistir([{"op": "guardar", "registro": registro(i)}])
+
+    def ids_al_reabrir(self) -> set[str]:
+        return set(self.abrir().ids())
+
+    def test_reproduce_el_log_al_abrir(self):
+        almacen = self.abrir()
+        self.escribir(almacen, 0, 5)
+        almacen.eliminar("C002")
+        almacen.persistir([{"op": "eliminar", "id": "C002"}])
+        almacen.cerrar()
+
+        self.assertFalse(os.path.exists(self.ruta))
+        self.assertEqual(self.ids_al_reabrir(), {"C000", "C001", "C003", "C004"})
+
+    def test_descarta_la_ultima_linea_incompleta(self):
+        almacen = self.abrir()
+        self.escribir(almacen, 0, 3)
+        almacen.cerrar()
+        with open(f"{self.ruta}.log", "a", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "guardar", "registro": registro(3)})[:20])
+
+        with mock.patch("builtins.print"):
+            reabierto = self.abrir()
+            self.assertEqual(set(reabierto.ids()), {"C000", "C001", "C002"})
+        # El resto cortado se recorta: lo que se escribe después no queda pegado a él.
+        self.escribir(reabierto, 4, 5)
+        reabierto.cerrar()
+        self.assertEqual(self.ids_al_reabrir(), {"C000", "C001", "C002", "C004"})
+
+    def test_compactaciones_superpuestas_no_pierden_datos(self):
+        escribir_json_atomico = wal.escribir_json_atomico
+        en_curso = threading.Event()
+
+        def escritura_lenta(ruta, datos, indent=2):
+            # La compactación en segundo plano termina después que la explícita.
+            if threading.current_thread().name == "compactacion-wal":
+                en_curso.set()
+                time.sleep(0.2)
+            escribir_json_atomico(ruta, datos, indent)
+
+        almacen = self.abrir()
+        with mock.patch.object(wal, "escribir_json_atomico", escritura_lenta):
+            self.escribir(almacen, 0, 5)
+            almacen.compactar(en_segundo_plano=True)
+            en_curso.wait(1)
+            self.escribir(almacen, 5, 10)
+            almacen.compactar(en_segundo_plano=False)
+            self.escribir(almacen, 10, 12)
+            almacen.cerrar()
+
+        self.assertEqual(self.ids_al_reabrir(), {registro(i)["id"] for i in range(12)})
+        directorio = os.path.dirname(self.ruta)
+        self.assertEqual([n for n in os.listdir(directorio) if n.endswith(".tmp")], [])
+
+
+if __name__ == "__main__":
+    unittest.main()